@@ -4,6 +4,7 @@ from firebase_admin import credentials, firestore, initialize_app
 
 from cumplo_common.utils.constants import PROJECT_ID
 
+from .cursors import CursorCollection
 from .users import DisabledCollection, UserCollection
 
 
@@ -13,6 +14,7 @@ class Client:
 
     users: UserCollection
     disabled: DisabledCollection
+    cursors: CursorCollection
     client: firestore.Client
 
     def __new__(cls) -> Self:
@@ -27,6 +29,7 @@ class Client:
             self.client = firestore.client()
             self.users = UserCollection(self.client)
             self.disabled = DisabledCollection(self.client)
+            self.cursors = CursorCollection(self.client)
             self._initialized = True
 
 
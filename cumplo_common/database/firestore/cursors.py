@@ -0,0 +1,46 @@
+from logging import getLogger
+
+from google.cloud.firestore_v1 import Client as FirestoreClient
+from google.cloud.firestore_v1 import CollectionReference
+
+from cumplo_common.utils.constants import CURSORS_COLLECTION
+
+logger = getLogger(__name__)
+
+
+class CursorCollection:
+    collection: CollectionReference
+
+    def __init__(self, client: FirestoreClient) -> None:
+        self.collection = client.collection(CURSORS_COLLECTION)
+
+    def get(self, name: str) -> str | None:
+        """
+        Get the value of a cursor.
+
+        Args:
+            name (str): The cursor name
+
+        Returns:
+            str | None: The cursor value or None if it has never been stored
+
+        """
+        logger.info(f"Getting cursor {name} from Firestore")
+        cursor = self.collection.document(name).get()
+
+        if not cursor.exists or not (data := cursor.to_dict()):
+            return None
+
+        return data.get("value")
+
+    def put(self, name: str, value: str) -> None:
+        """
+        Create or update a cursor.
+
+        Args:
+            name (str): The cursor name
+            value (str): The new cursor value
+
+        """
+        logger.info(f"Upserting cursor {name} with value {value} into Firestore")
+        self.collection.document(name).set({"value": value})
@@ -1,36 +1,78 @@
+import hmac
 from collections.abc import Generator
 from logging import getLogger
+from threading import Lock
 from typing import Any
 
+from cachetools import TTLCache
 from google.cloud.firestore_v1 import Client as FirestoreClient
-from google.cloud.firestore_v1 import CollectionReference
+from google.cloud.firestore_v1 import CollectionReference, Increment
 
 from cumplo_common.models import User
-from cumplo_common.utils.constants import DISABLED_COLLECTION, EMAILS_COLLECTION, KEYS_COLLECTION, USERS_COLLECTION
-from cumplo_common.utils.text import secure_key
+from cumplo_common.utils.cache import NegativeCache
+from cumplo_common.utils.constants import (
+    API_KEYS_LEGACY_LOOKUP,
+    API_KEYS_PEPPER,
+    DISABLED_COLLECTION,
+    EMAILS_COLLECTION,
+    KEY_VERSIONS_CACHE_MAXSIZE,
+    KEY_VERSIONS_CACHE_TTL,
+    KEYS_COLLECTION,
+    KEYS_MIGRATION_BATCH_SIZE,
+    USERS_COLLECTION,
+)
+from cumplo_common.utils.text import hash_key, validate_pepper
+
+# NOTE: Tokens carry these attributes, so they are revoked once they change
+TOKEN_ATTRIBUTES = frozenset({"api_key", "is_admin"})
+# NOTE: Enough of the hash of an API key to tell it apart in the logs
+LOGGED_HASH_LENGTH = 12
 
 logger = getLogger(__name__)
 
+# NOTE: Checked on load, so services fail to start instead of storing API keys hashed without a secret
+validate_pepper(API_KEYS_PEPPER)
+
 
 class UserCollection:
     collection: CollectionReference
     keys: CollectionReference
     emails: CollectionReference
     client: FirestoreClient
+    invalid_keys: NegativeCache
+    key_versions: TTLCache
 
     def __init__(self, client: FirestoreClient) -> None:
         self.collection = client.collection(USERS_COLLECTION)
         self.emails = client.collection(EMAILS_COLLECTION)
         self.keys = client.collection(KEYS_COLLECTION)
         self.client = client
+        # NOTE: Keys created by other instances are only picked up once their cached entries expire
+        self.invalid_keys = NegativeCache()
+        # NOTE: Tokens revoked by other instances are only rejected once their cached key versions expire
+        self.key_versions = TTLCache(maxsize=KEY_VERSIONS_CACHE_MAXSIZE, ttl=KEY_VERSIONS_CACHE_TTL)
+        self.key_versions_lock = Lock()
 
     def _get_by_api_key(self, api_key: str) -> str:
-        """Get a user ID by his API key."""
-        logger.info(f"Getting user with API key {secure_key(api_key)} from Firestore")
-        key = self.keys.document(api_key).get()
+        """
+        Get a user ID by his API key, whose document is named after its hash.
+
+        Keys that haven't been migrated yet are looked up as is, and invalid API keys are remembered for a while to
+        avoid reading them again.
+
+        """
+        digest = hash_key(api_key)
+        if self.invalid_keys.contains_hash(digest):
+            raise KeyError(f"User with API key {digest[:LOGGED_HASH_LENGTH]} does not exist")
+
+        logger.info(f"Getting user with API key {digest[:LOGGED_HASH_LENGTH]} from Firestore")
+        key = self.keys.document(digest).get()
+        if not key.exists and API_KEYS_LEGACY_LOOKUP:
+            key = self.keys.document(api_key).get()
 
         if not key.exists or not (data := key.to_dict()):
-            raise KeyError(f"User with API key {secure_key(api_key)} does not exist")
+            self.invalid_keys.add(api_key, digest)
+            raise KeyError(f"User with API key {digest[:LOGGED_HASH_LENGTH]} does not exist")
 
         return data["id_user"]
 
@@ -63,8 +105,9 @@ class UserCollection:
         if not (id_user or api_key or email):
             raise ValueError("Either ID, API key or email must be provided")
 
+        looked_up_key = None
         if not id_user and api_key:
-            id_user = self._get_by_api_key(api_key)
+            id_user = self._get_by_api_key(looked_up_key := api_key)
 
         if not id_user and email:
             id_user = self._get_by_email(email)
@@ -73,8 +116,59 @@ class UserCollection:
         if not user.exists or not (data := user.to_dict()):
             raise KeyError(f"User with ID {id_user} does not exist")
 
+        # NOTE: Documents left behind when a key changes must not authenticate, so keys are compared in constant time
+        if looked_up_key and not hmac.compare_digest(str(data.get("api_key", "")).encode(), looked_up_key.encode()):
+            raise KeyError(f"User with API key {hash_key(looked_up_key)[:LOGGED_HASH_LENGTH]} does not exist")
+
         return User(id=user.id, **data)
 
+    def get_key_version(self, id_user: str) -> int:
+        """
+        Get the version of a user's keys, which tokens are compared with to tell whether they were revoked.
+
+        Versions are cached for a while, so only the first token of a user in that time reads it from Firestore.
+
+        Args:
+            id_user (str): The user ID
+
+        Raises:
+            KeyError: When the user does not exist
+
+        Returns:
+            int: The version of the user's keys
+
+        """
+        with self.key_versions_lock:
+            if (key_version := self.key_versions.get(id_user)) is not None:
+                return key_version
+
+        logger.info(f"Getting user {id_user} key version from Firestore")
+        user = self.collection.document(id_user).get()
+        if not user.exists or (data := user.to_dict()) is None:
+            raise KeyError(f"User with ID {id_user} does not exist")
+
+        key_version = int(data.get("key_version", 0))
+        with self.key_versions_lock:
+            self.key_versions[id_user] = key_version
+        return key_version
+
+    def revoke(self, id_user: str) -> None:
+        """
+        Revoke the tokens of a user by bumping the version of its keys, so they don't match the stored one anymore.
+
+        Args:
+            id_user (str): The user ID
+
+        """
+        logger.info(f"Revoking user {id_user} tokens in Firestore")
+        self.collection.document(id_user).update({"key_version": Increment(1)})
+        self._forget_key_version(id_user)
+
+    def _forget_key_version(self, id_user: str) -> None:
+        """Drop the cached key version of a user, after it changed or the user was deleted."""
+        with self.key_versions_lock:
+            self.key_versions.pop(id_user, None)
+
     def list(self) -> Generator[User, None, None]:
         """
         List all users.
@@ -98,8 +192,10 @@ class UserCollection:
         """
         logger.info(f"Creating user {user.id} into Firestore")
         self.collection.document(str(user.id)).set(user.json(exclude={"id"}))
-        self.keys.document(user.api_key).set({"id_user": str(user.id)})
+        digest = hash_key(user.api_key)
+        self.keys.document(digest).set({"id_user": str(user.id), "hashed": True})
         self.emails.document(user.email).set({"id_user": str(user.id)})
+        self.invalid_keys.discard(user.api_key, digest)
 
     def update(self, user: User, attribute: str) -> None:
         """
@@ -113,7 +209,11 @@ class UserCollection:
         logger.info(f"Updating user {user.id} {attribute} into Firestore")
         data = user.json(exclude={"id"})
         update = {attribute: data[attribute]}
+        if attribute in TOKEN_ATTRIBUTES:
+            update["key_version"] = Increment(1)
         self.collection.document(str(user.id)).update(update)
+        if attribute in TOKEN_ATTRIBUTES:
+            self._forget_key_version(str(user.id))
 
     def update_notification(self, user: User, id_notification: str) -> None:
         """
@@ -133,13 +233,22 @@ class UserCollection:
         """
         Create or updates a user.
 
+        The key version is kept from the stored user, and it's bumped to revoke the user's tokens when its API key
+        or whether it's an admin change.
+
         Args:
             user (User): The new user data to be upserted
 
         """
         logger.info(f"Upserting user {user.id} into Firestore")
         document = self.collection.document(str(user.id))
-        document.set(user.json(exclude={"id"}))
+        data = user.json(exclude={"id"})
+        stored = document.get().to_dict() or {}
+        data["key_version"] = int(stored.get("key_version", 0))
+        if stored and any(stored.get(attribute) != data.get(attribute) for attribute in TOKEN_ATTRIBUTES):
+            data["key_version"] += 1
+        document.set(data)
+        self._forget_key_version(str(user.id))
 
     def delete(self, user: User) -> None:
         """
@@ -150,9 +259,51 @@ class UserCollection:
 
         """
         logger.info(f"Deleting user {user.id} from Firestore")
-        self.keys.document(user.api_key).delete()
+        self.keys.document(hash_key(user.api_key)).delete()
+        if API_KEYS_LEGACY_LOOKUP:
+            self.keys.document(user.api_key).delete()
         self.emails.document(user.email).delete()
         self.collection.document(str(user.id)).delete()
+        self._forget_key_version(str(user.id))
+
+    def migrate_keys(self, batch_size: int = KEYS_MIGRATION_BATCH_SIZE) -> Generator[int, None, None]:
+        """
+        Rename the documents of the API keys stored as is after the hash of their keys, in batched writes.
+
+        Each key is written under its hash and deleted in the same batch, and keys already stored by their hash are
+        skipped, so the migration can be stopped at any point and resumed by running it again.
+
+        Args:
+            batch_size (int, optional): Keys migrated by each batch, which writes twice as many documents.
+                Defaults to KEYS_MIGRATION_BATCH_SIZE.
+
+        Yields:
+            Generator[int, None, None]: The number of keys migrated so far, after each batch is committed
+
+        """
+        logger.info("Migrating the API keys in Firestore to be stored by their hash")
+        batch, pending, migrated = self.client.batch(), 0, 0
+
+        for key in self.keys.stream():
+            if not (data := key.to_dict()) or data.get("hashed"):
+                continue
+
+            batch.set(self.keys.document(hash_key(key.id)), {**data, "hashed": True})
+            batch.delete(key.reference)
+            pending += 1
+
+            if pending == batch_size:
+                batch.commit()
+                migrated += pending
+                logger.info(f"Migrated {migrated} API keys")
+                yield migrated
+                batch, pending = self.client.batch(), 0
+
+        if pending:
+            batch.commit()
+            migrated += pending
+            yield migrated
+        logger.info(f"Finished migrating {migrated} API keys")
 
 
 class DisabledCollection(UserCollection):
@@ -1,4 +1,5 @@
 from cumplo_common.dependencies.authentication import authenticate
 from cumplo_common.dependencies.authorization import is_admin
+from cumplo_common.dependencies.rate_limit import rate_limit
 
-__all__ = ["authenticate", "is_admin"]
+__all__ = ["authenticate", "is_admin", "rate_limit"]
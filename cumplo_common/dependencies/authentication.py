@@ -1,29 +1,111 @@
 from http import HTTPStatus
 from logging import getLogger
-from typing import Annotated
+from typing import Annotated, Any
 
+import ulid
 from fastapi import Header
 from fastapi.exceptions import HTTPException
 from fastapi.requests import Request
 
 from cumplo_common.database import firestore
+from cumplo_common.models import User
+from cumplo_common.utils.tokens import TOKEN_SIGNER, InvalidTokenError, StaleTokenError, TokenClaims, is_token
 
 logger = getLogger(__name__)
 
 
+class LazyUser:
+    """
+    The user of a token, which is only read from Firestore once something other than the claims of the token is used.
+
+    It stands in for the `User` of the request, so dependencies that only need the ID of the user or whether it's an
+    admin don't read the database.
+    """
+
+    def __init__(self, claims: TokenClaims) -> None:
+        self.claims = claims
+        self._user: User | None = None
+
+    @property
+    def id(self) -> ulid.ULID:
+        """The ID of the user."""
+        return self.claims.id
+
+    @property
+    def is_admin(self) -> bool:
+        """Whether the user is an admin."""
+        return self.claims.is_admin
+
+    @property
+    def user(self) -> User:
+        """The user of the token, read from Firestore the first time it's needed."""
+        if self._user is None:
+            self._user = firestore.client.users.get(id_user=str(self.claims.id))
+        return self._user
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.user, name)
+
+
+def _authenticate_token(request: Request, token: str) -> User | LazyUser:
+    """
+    Authenticate a signed token, only reading its user from Firestore when the token can't be trusted on its own.
+
+    The version of the user's keys is compared with the one of the token, so tokens stop working once revoked.
+
+    Raises:
+        HTTPException: When the token is invalid, it has been revoked or its user doesn't exist anymore
+
+    """
+    try:
+        claims = TOKEN_SIGNER.verify(token)
+        user: User | LazyUser = LazyUser(claims)
+        key_version = firestore.client.users.get_key_version(str(claims.id))
+    except StaleTokenError as exception:
+        logger.debug(f"Falling back to Firestore: {exception}")
+        claims = exception.claims
+        try:
+            user = firestore.client.users.get(id_user=str(claims.id))
+        except (KeyError, ValueError):
+            logger.debug("Received token of an invalid user")
+            raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED) from None
+        key_version = user.key_version
+    except InvalidTokenError as exception:
+        logger.debug(f"Authentication error: {exception}")
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED) from None
+    except (KeyError, ValueError):
+        logger.debug("Received token of an invalid user")
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED) from None
+
+    if key_version != claims.key_version:
+        logger.debug(f"Received revoked token of user {claims.id}")
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED)
+
+    request.state.claims = claims
+    return user
+
+
 def authenticate(request: Request, x_api_key: Annotated[str | None, Header()] = None) -> None:
     """
     Authenticate a request using either the X-API-KEY header or the user's ID in the event attributes.
 
+    The X-API-KEY header may also hold a signed token, which is verified without reading the user from Firestore.
+    Its claims are stored in `request.state.claims`, and the user is only read once something other than its ID or
+    whether it's an admin is used.
+
     Args:
         request (Request): The request to authenticate
-        x_api_key (Annotated[str  |  None, Header], optional): API key header. Defaults to None.
+        x_api_key (Annotated[str  |  None, Header], optional): API key or token header. Defaults to None.
 
     Raises:
         HTTPException: When the API key is not present or invalid
 
     """
-    if x_api_key:
+    user: User | LazyUser
+    if x_api_key and TOKEN_SIGNER.enabled and is_token(x_api_key):
+        user = _authenticate_token(request, x_api_key)
+
+    elif x_api_key:
         try:
             user = firestore.client.users.get(api_key=x_api_key)
         except (KeyError, ValueError) as exception:
@@ -0,0 +1,84 @@
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from logging import getLogger
+
+from fastapi.exceptions import HTTPException
+from fastapi.requests import Request
+from fastapi.responses import Response
+
+from cumplo_common.utils.rate_limit import RateLimiter
+from cumplo_common.utils.text import hash_key
+from cumplo_common.utils.tokens import TOKEN_SIGNER, InvalidTokenError, StaleTokenError, TokenClaims, is_token
+
+logger = getLogger(__name__)
+
+
+def _get_token_claims(token: str) -> TokenClaims | None:
+    """Get the claims of a well signed token, even a stale one, without reading the database."""
+    if not TOKEN_SIGNER.enabled or not is_token(token):
+        return None
+    try:
+        return TOKEN_SIGNER.verify(token)
+    except StaleTokenError as exception:
+        return exception.claims
+    except InvalidTokenError:
+        return None
+
+
+def get_rate_limit_key(request: Request) -> str:
+    """
+    Get the key whose requests are limited together, without reading the database.
+
+    Requests with a signed token or a Pub/Sub event are limited by their user, requests with an API key by the hash
+    of the key, and any other request by its client address.
+
+    Args:
+        request (Request): The request being limited
+
+    Returns:
+        str: The rate limit key of the request
+
+    """
+    if api_key := request.headers.get("x-api-key"):
+        if claims := _get_token_claims(api_key):
+            return f"user:{claims.id}"
+        # NOTE: The API key is hashed so it's never stored as is in the rate limit store
+        return f"api_key:{hash_key(api_key)}"
+    if (event := getattr(request.state, "event", None)) and event.id_user:
+        return f"user:{event.id_user}"
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit(limiter: RateLimiter | None = None) -> Callable[[Request, Response], Awaitable[None]]:
+    """
+    Build a dependency that limits the requests of each user with a token bucket.
+
+    It must run before `authenticate`, so requests over the limit are rejected before their user is read from
+    Firestore. FastAPI resolves the dependencies of a route in order, so it goes first in them.
+
+    Args:
+        limiter (RateLimiter | None, optional): The rate limiter to use. Defaults to an in-process limiter with the
+            default limits.
+
+    Returns:
+        Callable[[Request, Response], Awaitable[None]]: The dependency
+
+    """
+    limiter = limiter or RateLimiter()
+
+    async def dependency(request: Request, response: Response) -> None:
+        """
+        Check the rate limit of the request and add the rate limit headers to its response.
+
+        Raises:
+            HTTPException: When the rate limit of the request is exceeded
+
+        """
+        key = get_rate_limit_key(request)
+        result = await limiter.check(key)
+        if not result.allowed:
+            logger.debug(f"Rate limit exceeded by {key}")
+            raise HTTPException(status_code=HTTPStatus.TOO_MANY_REQUESTS, headers=result.headers)
+        response.headers.update(result.headers)
+
+    return dependency
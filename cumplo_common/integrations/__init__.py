@@ -1,5 +1,16 @@
 from .cloud_pubsub import CloudPubSub
 from .cloud_tasks import CloudTasks
-from .gmail import Gmail
+from .gmail import Attachment, Email, Gmail
+from .notifications import Delivery, DeliveryRequest, DeliveryResponse, NotificationDispatcher
 
-__all__ = ["CloudPubSub", "CloudTasks", "Gmail"]
+__all__ = [
+    "Attachment",
+    "CloudPubSub",
+    "CloudTasks",
+    "Delivery",
+    "DeliveryRequest",
+    "DeliveryResponse",
+    "Email",
+    "Gmail",
+    "NotificationDispatcher",
+]
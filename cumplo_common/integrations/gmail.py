@@ -1,18 +1,38 @@
 import base64
 import re
 from collections import UserDict
+from collections.abc import Generator
+from email.generator import BytesGenerator
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
+from http import HTTPStatus
+from io import BytesIO
 from logging import getLogger
 from operator import itemgetter
 from pathlib import Path
+from typing import Protocol
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from pydantic import BaseModel
-
-from cumplo_common.utils.constants import GMAIL_CREDENTIALS, GMAIL_FROM_EMAIL, GMAIL_LABEL, GMAIL_TOPIC, GMAIL_USER_ID
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, MediaIoBaseUpload
+from pydantic import BaseModel, Field
+
+from cumplo_common.utils.cache import Cache
+from cumplo_common.utils.constants import (
+    CACHE_MAXSIZE,
+    GMAIL_BATCH_SIZE,
+    GMAIL_CREDENTIALS,
+    GMAIL_CURSOR,
+    GMAIL_FROM_EMAIL,
+    GMAIL_HISTORY_CACHE_TTL,
+    GMAIL_LABEL,
+    GMAIL_TOPIC,
+    GMAIL_UPLOAD_THRESHOLD,
+    GMAIL_USER_ID,
+)
 
 logger = getLogger(__name__)
 
@@ -23,6 +43,29 @@ class Attachment(BaseModel):
     path: str
     content_id: str
 
+    def to_mime(self) -> MIMEImage:
+        """Build the inline MIME part of the attachment, reusing it while the file is not modified."""
+        return _build_attachment(self.path, self.content_id, Path(self.path).stat().st_mtime_ns)
+
+
+class Email(BaseModel):
+    """An HTML email to be sent."""
+
+    to: str
+    subject: str
+    content: str
+    attachments: list[Attachment] = Field(default_factory=list)
+
+
+@lru_cache(maxsize=CACHE_MAXSIZE)
+def _build_attachment(path: str, content_id: str, modified_at: int) -> MIMEImage:  # noqa: ARG001
+    """Read and encode an inline image. The modification time is part of the cache key to pick up file changes."""
+    with Path(path).open("rb") as file:
+        attachment = MIMEImage(file.read())
+    attachment.add_header("Content-ID", f"<{content_id}>")
+    attachment.add_header("Content-Disposition", "inline", filename=path)
+    return attachment
+
 
 class Message(UserDict):
     """A Gmail message."""
@@ -44,9 +87,37 @@ class Message(UserDict):
         return result.group(1)
 
 
+class HistoryCursorStore(Protocol):
+    """Persists the last synced Gmail history ID."""
+
+    def get(self) -> str | None: ...
+
+    def put(self, history_id: str) -> None: ...
+
+
+class FirestoreHistoryCursorStore:
+    """Stores the Gmail history cursor in the Firestore cursors collection."""
+
+    def __init__(self, name: str = GMAIL_CURSOR) -> None:
+        self.name = name
+
+    def get(self) -> str | None:
+        from cumplo_common.database import firestore  # noqa: PLC0415
+
+        return firestore.client.cursors.get(self.name)
+
+    def put(self, history_id: str) -> None:
+        from cumplo_common.database import firestore  # noqa: PLC0415
+
+        firestore.client.cursors.put(self.name, history_id)
+
+
 class Gmail:
     """Integration with Gmail API."""
 
+    # NOTE: Remembers the recently synced messages so overlapping syncs don't yield them twice
+    _synced_messages: Cache = Cache(maxsize=CACHE_MAXSIZE, ttl=GMAIL_HISTORY_CACHE_TTL)
+
     @classmethod
     def _authenticate(cls) -> build:
         """Authenticate with Gmail API."""
@@ -63,6 +134,41 @@ class Gmail:
         message = service.users().messages().get(userId=GMAIL_USER_ID, id=message_id).execute()
         return Message(message)
 
+    @classmethod
+    def _list_history(cls, service: build, history_id: str) -> tuple[list[str], str | None]:
+        """
+        List the IDs of the messages added to the label after a history ID, following every result page.
+
+        Args:
+            service: The authenticated Gmail service
+            history_id: The history ID to start listing from
+
+        Returns:
+            The unique message IDs in the order they were added and the latest history ID of the mailbox
+
+        """
+        history = service.users().history()
+        message_ids: dict[str, None] = {}
+        latest_history_id, page_token = None, None
+
+        while True:
+            response = history.list(
+                userId=GMAIL_USER_ID,
+                startHistoryId=history_id,
+                labelId=GMAIL_LABEL,
+                historyTypes=["messageAdded"],
+                pageToken=page_token,
+            ).execute()
+            latest_history_id = response.get("historyId", latest_history_id)
+
+            for record in response.get("history", []):
+                for message_added in record.get("messagesAdded", []):
+                    if message_id := message_added.get("message", {}).get("id"):
+                        message_ids[message_id] = None
+
+            if not (page_token := response.get("nextPageToken")):
+                return list(message_ids), latest_history_id
+
     @classmethod
     def subscribe(cls) -> dict:
         """Subscribe a PubSub topic to a Gmail label."""
@@ -109,18 +215,101 @@ class Gmail:
 
         """
         service = cls._authenticate()
-        history = service.users().history()
-        response = history.list(userId=GMAIL_USER_ID, startHistoryId=history_id, labelId=GMAIL_LABEL).execute()
+        message_ids, _ = cls._list_history(service=service, history_id=history_id)
 
-        # NOTE: The history is reversed to get the last message
-        for history in reversed(response.get("history", [])):
-            for message_added in history.get("messagesAdded", []):
-                if message_id := message_added.get("message", {}).get("id"):
-                    return cls._get_message(service=service, message_id=message_id)
+        if message_ids:
+            return cls._get_message(service=service, message_id=message_ids[-1])
 
         logger.warning(f"No messages found in Gmail for label {GMAIL_LABEL} starting from history ID {history_id}")
         return None
 
+    @classmethod
+    def sync(
+        cls, history_id: str | None = None, store: HistoryCursorStore | None = None
+    ) -> Generator[Message, None, None]:
+        """
+        Yield the messages added to the label since the last synced history ID, oldest first.
+
+        The cursor is only advanced once every message has been yielded, so an interrupted sync is resumed
+        by the next one. Messages yielded recently are skipped, which makes overlapping syncs idempotent.
+
+        Args:
+            history_id: The history ID received in the push notification, used as the starting point
+                when no cursor has been stored yet
+            store: Where the history cursor is persisted. Defaults to Firestore.
+
+        Yields:
+            Message: The newly added messages
+
+        """
+        store = store or FirestoreHistoryCursorStore()
+
+        if not (cursor := store.get() or history_id):
+            raise ValueError("A history ID is required when there is no stored cursor")
+
+        if history_id and cursor != history_id and int(history_id) <= int(cursor):
+            logger.info(f"Skipping Gmail sync: history ID {history_id} was already synced up to {cursor}")
+            return
+
+        service = cls._authenticate()
+        try:
+            message_ids, latest_history_id = cls._list_history(service=service, history_id=cursor)
+        except HttpError as error:
+            if error.resp.status != HTTPStatus.NOT_FOUND:
+                raise
+            # NOTE: Gmail only keeps about a week of history, so an expired cursor is reset to the current one
+            latest_history_id = service.users().getProfile(userId=GMAIL_USER_ID).execute()["historyId"]
+            logger.warning(f"Gmail history ID {cursor} has expired. Resetting cursor to {latest_history_id}")
+            store.put(str(latest_history_id))
+            return
+
+        for message_id in message_ids:
+            if message_id in cls._synced_messages:
+                continue
+            yield cls._get_message(service=service, message_id=message_id)
+            cls._synced_messages[message_id] = True
+
+        if latest_history_id and latest_history_id != cursor:
+            store.put(str(latest_history_id))
+
+    @classmethod
+    def _build_message(cls, email: Email) -> MIMEMultipart:
+        """Build the MIME message of an email."""
+        message = MIMEMultipart("related")
+        message["Subject"] = email.subject
+        message["From"] = GMAIL_FROM_EMAIL
+        message["To"] = email.to
+
+        message.attach(MIMEText(email.content, "html"))
+        for attachment in email.attachments:
+            message.attach(attachment.to_mime())
+
+        return message
+
+    @classmethod
+    def _send_request(cls, service: build, message: MIMEMultipart) -> tuple[HttpRequest, bool]:
+        """
+        Build the request that sends a message.
+
+        Messages over the upload threshold are sent through the media upload endpoint instead of as an inline
+        base64 payload, as the raw encoding inflates them by a third and the inline payload size is limited.
+
+        Returns:
+            The send request and whether it is a media upload, which can't be batched
+
+        """
+        buffer = BytesIO()
+        BytesGenerator(buffer, mangle_from_=False, policy=message.policy).flatten(message)
+        messages = service.users().messages()
+
+        if buffer.tell() > GMAIL_UPLOAD_THRESHOLD:
+            buffer.seek(0)
+            media = MediaIoBaseUpload(buffer, mimetype="message/rfc822", resumable=True)
+            return messages.send(userId=GMAIL_USER_ID, body={}, media_body=media), True
+
+        raw_message = base64.urlsafe_b64encode(buffer.getbuffer()).decode()
+        return messages.send(userId=GMAIL_USER_ID, body={"raw": raw_message}), False
+
     @classmethod
     def send_email(cls, to: str, subject: str, content: str, *attachments: Attachment) -> dict:
         """
@@ -136,24 +325,52 @@ class Gmail:
             The response from the Gmail API
 
         """
-        message = MIMEMultipart("related")
-        message["Subject"] = subject
-        message["From"] = GMAIL_FROM_EMAIL
-        message["To"] = to
+        message = cls._build_message(Email(to=to, subject=subject, content=content, attachments=list(attachments)))
+        request, _ = cls._send_request(cls._authenticate(), message)
+        return request.execute()
+
+    @classmethod
+    def send_emails(cls, *emails: Email, batch_size: int = GMAIL_BATCH_SIZE) -> list[dict | None]:
+        """
+        Send many HTML emails reusing a single authenticated service and batching the API calls.
 
-        message.attach(MIMEText(content, "html"))
+        Args:
+            *emails: The emails to send
+            batch_size: The maximum amount of emails sent in a single batch request
 
-        for attachment in attachments:
-            with Path(attachment.path).open("rb") as file:
-                attachment_image = MIMEImage(file.read())
-                attachment_image.add_header("Content-ID", f"<{attachment.content_id}>")
-                attachment_image.add_header("Content-Disposition", "inline", filename=attachment.path)
-                message.attach(attachment_image)
+        Returns:
+            The response from the Gmail API for each email, in the same order. None when an email failed to be sent.
 
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        """
         service = cls._authenticate()
-
-        return service.users().messages().send(userId=GMAIL_USER_ID, body={"raw": raw_message}).execute()
+        responses: list[dict | None] = [None] * len(emails)
+
+        def callback(request_id: str, response: dict, exception: HttpError | None) -> None:
+            if exception is not None:
+                logger.error(f"Failed to send email to {emails[int(request_id)].to}: {exception}")
+                return
+            responses[int(request_id)] = response
+
+        batch, pending = service.new_batch_http_request(callback=callback), 0
+        for index, email in enumerate(emails):
+            request, is_upload = cls._send_request(service, cls._build_message(email))
+
+            if is_upload:
+                try:
+                    responses[index] = request.execute()
+                except HttpError as exception:
+                    callback(str(index), {}, exception)
+                continue
+
+            batch.add(request, request_id=str(index))
+            if (pending := pending + 1) == batch_size:
+                batch.execute()
+                batch, pending = service.new_batch_http_request(callback=callback), 0
+
+        if pending:
+            batch.execute()
+
+        return responses
 
     @classmethod
     def get_last_message_from(cls, sender: str) -> Message | None:
@@ -0,0 +1,351 @@
+import asyncio
+import ipaddress
+import json
+import random
+import ssl
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from logging import getLogger
+from time import perf_counter
+from types import TracebackType
+from typing import Any, Protocol, Self
+from urllib.parse import urlsplit
+
+import ulid
+
+from cumplo_common.models.channel import ChannelConfigurationType, ChannelType, IFTTTConfiguration, WebhookConfiguration
+from cumplo_common.utils.constants import (
+    NOTIFICATIONS_BACKOFF,
+    NOTIFICATIONS_BACKOFF_CAP,
+    NOTIFICATIONS_HOST_CONCURRENCY,
+    NOTIFICATIONS_HOST_RATE,
+    NOTIFICATIONS_RETRIES,
+    NOTIFICATIONS_TIMEOUT,
+)
+from cumplo_common.utils.dns import HOST_RESOLVER, HostResolver, PrivateAddressError
+from cumplo_common.utils.rate_limit import TokenBucket
+
+logger = getLogger(__name__)
+
+IFTTT_URL = "https://maker.ifttt.com/trigger/{event}/json/with/key/{key}"
+RETRYABLE_STATUSES = frozenset({
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+})
+
+Job = tuple[ChannelConfigurationType, dict]
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryRequest:
+    """An HTTP request that delivers a notification."""
+
+    url: str
+    body: bytes
+    method: str = "POST"
+    headers: dict[str, str] = field(default_factory=lambda: {"Content-Type": "application/json"})
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryResponse:
+    """The response to a delivery request."""
+
+    status: int
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def retry_after(self) -> float | None:
+        """The seconds to wait before retrying, from the Retry-After header in seconds or as an HTTP date."""
+        if (value := self.headers.get("retry-after")) is None:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (date - datetime.now(UTC)).total_seconds()) if date.tzinfo else None
+
+
+@dataclass(frozen=True, slots=True)
+class Delivery:
+    """The outcome of delivering a notification to a channel."""
+
+    id_channel: ulid.ULID
+    type_: ChannelType
+    status: int | None
+    attempts: int
+    latency: float
+    error: str | None = None
+
+    @property
+    def delivered(self) -> bool:
+        """Whether the channel accepted the notification."""
+        return self.status is not None and self.status < HTTPStatus.BAD_REQUEST
+
+
+RequestBuilder = Callable[[Any, bytes], DeliveryRequest]
+
+
+def build_webhook_request(channel: WebhookConfiguration, body: bytes) -> DeliveryRequest:
+    """Post the payload to the URL of the webhook."""
+    return DeliveryRequest(url=channel.url, body=body)
+
+
+def build_ifttt_request(channel: IFTTTConfiguration, body: bytes) -> DeliveryRequest:
+    """Trigger the IFTTT event of the channel with the payload as its JSON body."""
+    return DeliveryRequest(url=IFTTT_URL.format(event=channel.event, key=channel.key), body=body)
+
+
+# NOTE: WhatsApp depends on the messaging provider, so its builder must be given to the dispatcher
+REQUEST_BUILDERS: dict[ChannelType, RequestBuilder] = {
+    ChannelType.WEBHOOK: build_webhook_request,
+    ChannelType.IFTTT: build_ifttt_request,
+}
+
+
+class Transport(Protocol):
+    """Sends delivery requests over HTTP."""
+
+    async def send(self, request: DeliveryRequest) -> DeliveryResponse:
+        """Send a request and return its response, whose header names are lowercase."""
+        ...
+
+    async def close(self) -> None:
+        """Release the open connections."""
+        ...
+
+
+class HTTPConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections grouped by host.
+
+    Requests run in worker threads, and each connection goes back to the idle connections of its host once its
+    response is read, so consecutive deliveries to the same host skip the TCP and TLS handshakes.
+
+    Unless private addresses are allowed, the address each new connection actually reached is checked before
+    sending anything through it, as the host may resolve differently than when it was checked by the resolver.
+    """
+
+    def __init__(self, timeout: float = NOTIFICATIONS_TIMEOUT, *, allow_private: bool = False) -> None:
+        self.timeout = timeout
+        self.allow_private = allow_private
+        self.context = ssl.create_default_context()
+        self.idle: defaultdict[tuple[str, str], list[HTTPConnection]] = defaultdict(list)
+
+    async def send(self, request: DeliveryRequest) -> DeliveryResponse:
+        """
+        Send a request through an idle connection of its host, or a new one if there are none.
+
+        A `PrivateAddressError` is propagated when a new connection reached a private address that isn't allowed.
+
+        Args:
+            request (DeliveryRequest): The request to send
+
+        Returns:
+            DeliveryResponse: The status code and headers of the response
+
+        """
+        url = urlsplit(request.url)
+        path = f"{url.path or '/'}?{url.query}" if url.query else url.path or "/"
+        idle = self.idle[url.scheme, url.netloc]
+
+        while True:
+            reused = bool(idle)
+            connection = idle.pop() if reused else self._connect(url.scheme, url.netloc)
+            try:
+                response = await asyncio.to_thread(self._request, connection, request, path)
+            except (ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused:
+                    continue  # NOTE: The server closed the idle connection, so the request is sent on another one
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            idle.append(connection)
+            return response
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        for connections in self.idle.values():
+            for connection in connections:
+                connection.close()
+        self.idle.clear()
+
+    def _connect(self, scheme: str, host: str) -> HTTPConnection:
+        """Open a connection to a host."""
+        if scheme == "https":
+            return HTTPSConnection(host, timeout=self.timeout, context=self.context)
+        return HTTPConnection(host, timeout=self.timeout)
+
+    def _request(self, connection: HTTPConnection, request: DeliveryRequest, path: str) -> DeliveryResponse:
+        """Send a request and read its whole response, connecting first if the connection isn't open."""
+        if connection.sock is None:
+            connection.connect()
+            if not self.allow_private:
+                self._check_peer(connection)
+
+        connection.request(request.method, path, body=request.body, headers=request.headers)
+        response = connection.getresponse()
+        response.read()  # NOTE: The response must be consumed before the connection can be reused
+        return DeliveryResponse(response.status, {name.lower(): value for name, value in response.getheaders()})
+
+    @staticmethod
+    def _check_peer(connection: HTTPConnection) -> None:
+        """Check that a connection didn't reach a private address, such as when a host is rebound after its check."""
+        address = str(connection.sock.getpeername()[0]).split("%", 1)[0]
+        if ipaddress.ip_address(address).is_private:
+            raise PrivateAddressError(f"Host {connection.host} connected to the private address {address}")
+
+
+class NotificationDispatcher:
+    """
+    Concurrent delivery of notifications to the channels of the users.
+
+    Every delivery runs concurrently, but the requests to each host are limited to a number of concurrent requests
+    and a rate of requests per second. Failed requests are retried with exponential backoff and full jitter, waiting
+    at least what the Retry-After header of a 429 response asks for. When that's longer than the backoff cap, the
+    delivery isn't retried.
+
+    Unless the resolver is None, the host of every request is checked not to resolve to a private address before
+    sending anything to it, and the default transport refuses connections that reach a private address anyway.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        transport: Transport | None = None,
+        builders: Mapping[ChannelType, RequestBuilder] | None = None,
+        resolver: HostResolver | None = HOST_RESOLVER,
+        *,
+        concurrency: int = NOTIFICATIONS_HOST_CONCURRENCY,
+        rate: float | None = NOTIFICATIONS_HOST_RATE,
+        retries: int = NOTIFICATIONS_RETRIES,
+        backoff: float = NOTIFICATIONS_BACKOFF,
+        backoff_cap: float = NOTIFICATIONS_BACKOFF_CAP,
+    ) -> None:
+        self.transport = transport or HTTPConnectionPool(allow_private=resolver is None)
+        self.builders = {**REQUEST_BUILDERS, **(builders or {})}
+        self.resolver = resolver
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.buckets: dict[str, TokenBucket] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self, type_: type[BaseException] | None, exception: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connections of the transport."""
+        await self.transport.close()
+
+    async def dispatch(self, jobs: Iterable[Job]) -> list[Delivery]:
+        """
+        Deliver each payload to its channel.
+
+        Args:
+            jobs (Iterable[Job]): The channels and the payload to deliver to each of them. Payloads shared by many
+                channels are only serialized once.
+
+        Returns:
+            list[Delivery]: The outcome of each job, in the same order
+
+        """
+        # NOTE: The payloads are kept along their bodies so their IDs can't be reused while dispatching
+        bodies: dict[int, tuple[dict, bytes]] = {}
+        deliveries = []
+        for channel, payload in jobs:
+            if (cached := bodies.get(id(payload))) is None:
+                cached = bodies[id(payload)] = (payload, json.dumps(payload).encode())
+            deliveries.append(self._deliver(channel, cached[1]))
+        return await asyncio.gather(*deliveries)
+
+    async def _deliver(self, channel: ChannelConfigurationType, body: bytes) -> Delivery:
+        """Deliver a body to a channel, retrying it while it fails."""
+        start = perf_counter()
+        if (builder := self.builders.get(channel.type_)) is None:
+            return Delivery(channel.id, channel.type_, None, 0, 0.0, f"There is no request builder for {channel.type_}")
+
+        request = builder(channel, body)
+        try:
+            if self.resolver is not None:
+                await self.resolver.check_url(request.url)
+            status, attempt, error = await self._send(request)
+        except (OSError, ValueError) as exception:
+            logger.warning(f"Won't deliver to {channel.type_} channel {channel.id}: {exception}")
+            return Delivery(channel.id, channel.type_, None, 0, perf_counter() - start, str(exception))
+
+        delivery = Delivery(channel.id, channel.type_, status, attempt, perf_counter() - start, error)
+        if not delivery.delivered:
+            logger.warning(f"Couldn't deliver to {channel.type_} channel {channel.id}: {error or status}")
+        return delivery
+
+    async def _send(self, request: DeliveryRequest) -> tuple[int | None, int, str | None]:
+        """Send a request, retrying it while it fails, and return its last status, attempts and error."""
+        host = urlsplit(request.url).netloc
+        semaphore = self.semaphores.get(host) or self.semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        bucket = self._bucket(host)
+
+        for attempt in range(1, self.retries + 2):
+            response, error = await self._attempt(request, semaphore, bucket)
+            status = response.status if response is not None else None
+            if (status is not None and status not in RETRYABLE_STATUSES) or attempt > self.retries:
+                break
+            if (delay := self._retry_delay(attempt, response)) is None:
+                break
+            await asyncio.sleep(delay)
+
+        return status, attempt, error
+
+    def _bucket(self, host: str) -> TokenBucket | None:
+        """Get the rate limiter of a host, if requests are rate limited."""
+        if not self.rate:
+            return None
+        if (bucket := self.buckets.get(host)) is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate)
+        return bucket
+
+    async def _attempt(
+        self, request: DeliveryRequest, semaphore: asyncio.Semaphore, bucket: TokenBucket | None
+    ) -> tuple[DeliveryResponse | None, str | None]:
+        """Send a request within the limits of its host, returning its response or the error that prevented it."""
+        async with semaphore:
+            if bucket is not None:
+                await bucket.acquire()
+            try:
+                return await self.transport.send(request), None
+            except (OSError, HTTPException) as exception:
+                return None, str(exception) or type(exception).__name__
+
+    def _retry_delay(self, attempt: int, response: DeliveryResponse | None) -> float | None:
+        """Compute the seconds to wait before retrying, or None when the server asks to wait too long."""
+        delay = self._backoff(attempt)
+        if response is None or response.status != HTTPStatus.TOO_MANY_REQUESTS:
+            return delay
+        if (retry_after := response.retry_after) is None:
+            return delay
+        if retry_after > self.backoff_cap:
+            logger.debug(f"Won't retry a request to wait {retry_after} seconds, as asked by its Retry-After header")
+            return None
+        return max(delay, retry_after)
+
+    def _backoff(self, attempt: int) -> float:
+        """Compute the seconds to wait before retrying a failed attempt."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff * 2 ** (attempt - 1)))  # noqa: S311
@@ -1,3 +1,4 @@
+from cumplo_common.middlewares.consumer import PubSubBatchResult, PubSubConsumer
 from cumplo_common.middlewares.pubsub import PubSubMiddleware
 
-__all__ = ["PubSubMiddleware"]
+__all__ = ["PubSubBatchResult", "PubSubConsumer", "PubSubMiddleware"]
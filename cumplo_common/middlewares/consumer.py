@@ -0,0 +1,152 @@
+import asyncio
+import random
+from base64 import b64encode
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from inspect import iscoroutinefunction
+from logging import getLogger
+
+from google.api_core.exceptions import GoogleAPICallError, RetryError
+from google.cloud.pubsub import SubscriberClient
+from google.pubsub_v1 import ReceivedMessage
+from pydantic import BaseModel, Field
+
+from cumplo_common.utils.constants import (
+    PROJECT_ID,
+    PUBSUB_BACKOFF,
+    PUBSUB_BACKOFF_CAP,
+    PUBSUB_BATCH_SIZE,
+    PUBSUB_CONCURRENCY,
+)
+
+from .pubsub import PubSubEvent, PubSubMessage
+
+logger = getLogger(__name__)
+
+Handler = Callable[[PubSubEvent], Awaitable[None]] | Callable[[PubSubEvent], None]
+
+
+class PubSubBatchResult(BaseModel):
+    """The outcome of handling a batch of pulled messages."""
+
+    acknowledged: list[str] = Field(default_factory=list)
+    rejected: list[str] = Field(default_factory=list)
+
+
+class PubSubConsumer:
+    """
+    Pull-based Pub/Sub consumer that handles batches of messages concurrently.
+
+    Each pulled message is wrapped in the same `PubSubEvent` model used for push requests and handed to the
+    handler. Messages are acknowledged individually when the handler succeeds, and negatively acknowledged when
+    it raises so Pub/Sub redelivers them. The client honors `PUBSUB_EMULATOR_HOST` to run against the emulator.
+
+    Errors calling Pub/Sub don't stop the consumer: it waits with exponential backoff and full jitter before pulling
+    again, and any message that wasn't acknowledged is redelivered.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        subscription: str,
+        handler: Handler,
+        *,
+        batch_size: int = PUBSUB_BATCH_SIZE,
+        concurrency: int = PUBSUB_CONCURRENCY,
+        client: SubscriberClient | None = None,
+        backoff: float = PUBSUB_BACKOFF,
+        backoff_cap: float = PUBSUB_BACKOFF_CAP,
+    ) -> None:
+        if "/" not in subscription:
+            subscription = f"projects/{PROJECT_ID}/subscriptions/{subscription}"
+
+        self.subscription = subscription
+        self.handler = handler
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.client = client or SubscriberClient()
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+
+    def _build_event(self, received: ReceivedMessage) -> PubSubEvent:
+        """Wrap a pulled message as a push event, trusting the fields that come from the client."""
+        message = received.message
+        wrapped = PubSubMessage.model_construct(
+            message_id=message.message_id,
+            data=b64encode(message.data).decode(),
+            attributes=dict(message.attributes),
+            # NOTE: proto-plus exposes timestamps as datetimes at runtime
+            publish_time=message.publish_time.isoformat() if message.publish_time else None,  # type: ignore[attr-defined]
+        )
+        # NOTE: The data is already raw, so it's cached as decoded instead of being decoded back from base64
+        wrapped.__dict__["decoded_data"] = message.data
+        return PubSubEvent.model_construct(message=wrapped, subscription=self.subscription)
+
+    async def _handle(self, received: ReceivedMessage, semaphore: asyncio.Semaphore) -> bool:
+        """Handle a single message and return whether it succeeded."""
+        async with semaphore:
+            try:
+                event = self._build_event(received)
+                if iscoroutinefunction(self.handler):
+                    await self.handler(event)
+                else:
+                    await asyncio.to_thread(self.handler, event)
+            except Exception:
+                logger.exception(f"Failed to handle Pub/Sub message {received.message.message_id}")
+                return False
+            return True
+
+    async def pull(self) -> PubSubBatchResult:
+        """
+        Pull a batch of messages, handle them concurrently and acknowledge them individually.
+
+        Returns:
+            PubSubBatchResult: The IDs of the acknowledged and rejected messages
+
+        """
+        request = {"subscription": self.subscription, "max_messages": self.batch_size}
+        response = await asyncio.to_thread(self.client.pull, request=request)
+        if not (messages := list(response.received_messages)):
+            return PubSubBatchResult()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(*(self._handle(message, semaphore) for message in messages))
+
+        result = PubSubBatchResult()
+        acks: list[str] = []
+        nacks: list[str] = []
+        for message, succeeded in zip(messages, outcomes, strict=True):
+            (acks if succeeded else nacks).append(message.ack_id)
+            (result.acknowledged if succeeded else result.rejected).append(message.message.message_id)
+
+        if acks:
+            request = {"subscription": self.subscription, "ack_ids": acks}
+            await asyncio.to_thread(self.client.acknowledge, request=request)
+
+        if nacks:
+            request = {"subscription": self.subscription, "ack_ids": nacks, "ack_deadline_seconds": 0}
+            await asyncio.to_thread(self.client.modify_ack_deadline, request=request)
+
+        logger.info(f"Handled {len(messages)} Pub/Sub messages: {len(acks)} acknowledged, {len(nacks)} rejected")
+        return result
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """
+        Pull and handle batches until stopped.
+
+        Args:
+            stop (asyncio.Event | None, optional): Event that stops the consumer once set. Defaults to None.
+
+        """
+        stop = stop or asyncio.Event()
+        failures = 0
+        while not stop.is_set():
+            try:
+                await self.pull()
+            except (GoogleAPICallError, RetryError):
+                failures += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff * 2 ** (failures - 1)))  # noqa: S311
+                logger.exception(f"Failed to pull from {self.subscription}, retrying in {delay:.2f} seconds")
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+            else:
+                failures = 0
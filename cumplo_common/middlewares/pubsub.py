@@ -1,14 +1,18 @@
-import json
-from base64 import b64decode
-from collections.abc import Awaitable, Callable
+from binascii import a2b_base64
+from collections.abc import Callable, Iterable
+from functools import cached_property
 from logging import getLogger
 
-from fastapi import Request, Response
 from pydantic import BaseModel, Field
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cumplo_common.models.utils import Event
 
 logger = getLogger(__name__)
 
+JSON_CONTENT_TYPE = b"application/json"
+EVENT_ATTRIBUTE = "event"
+
 
 class PubSubMessage(BaseModel):
     """A wrapped Pub/Sub message."""
@@ -18,6 +22,11 @@ class PubSubMessage(BaseModel):
     message_id: str = Field(alias="messageId")
     data: str = Field(...)
 
+    @cached_property
+    def decoded_data(self) -> bytes:
+        """The base64 decoded message data."""
+        return a2b_base64(self.data)
+
 
 class PubSubEvent(BaseModel):
     """A Pub/Sub event."""
@@ -30,31 +39,87 @@ class PubSubEvent(BaseModel):
         """Returns the ID of the user who triggered the event."""
         return self.message.attributes.get("id_user")
 
+    @property
+    def event(self) -> str | None:
+        """Returns the name of the event carried by the message."""
+        return self.message.attributes.get(EVENT_ATTRIBUTE)
 
-class PubSubMiddleware(BaseHTTPMiddleware):
-    @staticmethod
-    async def dispatch(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-        """
-        Middleware to handle PubSub messages.
 
-        Args:
-            request (Request): The request object.
-            call_next (Callable[[Request], Awaitable[Response]]): The next middleware or endpoint to call.
+class PubSubMiddleware:
+    """
+    Middleware to handle PubSub push messages.
 
-        Returns:
-            Response: A response object.
+    Implemented as a pure ASGI middleware so requests don't pay the extra task and streaming overhead of
+    `BaseHTTPMiddleware`. Only JSON POST requests are parsed, every other request is passed through untouched.
 
-        """
-        try:
-            body = await request.body()
-            content = json.loads(body.decode("utf-8"))
-            event = PubSubEvent.model_validate(content)
-            request.state.event = event
+    When event types are given, messages whose `event` attribute matches one of their members get their data
+    decoded once into the member's model, which is exposed as `request.state.content`.
+    """
+
+    def __init__(self, app: ASGIApp, events: Iterable[type[Event]] = ()) -> None:
+        self.app = app
+        self.validators: dict[str, Callable[[bytes], BaseModel]] = {
+            value: model.model_validate_json for event in events for value, model in event.models().items()
+        }
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not self._is_json(scope):
+            await self.app(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        try:
+            event = PubSubEvent.model_validate_json(body)
         except ValueError:
             logger.debug("Received a non-PubSub request")
+            await self.app(scope, self._replay(body, receive), send)
+            return
 
-        else:
-            request._body = b64decode(event.message.data)  # noqa: SLF001
+        data = event.message.decoded_data
+        headers = [(name, value) for name, value in scope["headers"] if name != b"content-length"]
+        headers.append((b"content-length", str(len(data)).encode()))
 
-        return await call_next(request)
+        scope = {**scope, "headers": headers}
+        state = scope.setdefault("state", {})
+        state["event"] = event
+
+        if event.event and (validator := self.validators.get(event.event)):
+            try:
+                state["content"] = validator(data)
+            except ValueError as exception:
+                logger.warning(f"Couldn't decode the content of event {event.event}: {exception}")
+
+        await self.app(scope, self._replay(data, receive), send)
+
+    @staticmethod
+    def _is_json(scope: Scope) -> bool:
+        """Whether the request declares a JSON body."""
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                return value.startswith(JSON_CONTENT_TYPE)
+        return False
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        """Read the whole request body."""
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                # NOTE: Joining a single chunk returns the same bytes object without copying it
+                return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        """Build a receive callable that yields the given body once and then defers to the original one."""
+        consumed = False
+
+        async def replay() -> Message:
+            nonlocal consumed
+            if consumed:
+                return await receive()
+            consumed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay
@@ -15,35 +15,47 @@ from .debtor import Debtor
 from .event_private import PrivateEvent
 from .event_public import PublicEvent
 from .filter_configuration import FilterConfiguration
-from .funding_request import DurationUnit, FundingRequest
+from .funding_request import DurationUnit, FundingRequest, FundingRequestDelta
+from .funding_request_batch import FundingRequestBatch
 from .investment import Investment
+from .investment_aggregator import InvestmentAggregator, InvestmentDimension, InvestmentSummary
 from .movement import Movement
 from .notification import Notification
 from .portfolio import Portfolio, PortfolioCategory
+from .portfolio_batch import PortfolioBatch
+from .routing import ChannelRoutingIndex
 from .session import Session
 from .simulation import Simulation
 from .user import Balance, InvestmentPortfolio, User
-from .utils import StrEnum
+from .utils import EventDispatcher, StrEnum
 
 __all__ = [
     "Balance",
     "BaseModel",
     "Borrower",
     "ChannelConfiguration",
+    "ChannelRoutingIndex",
     "ChannelType",
     "Credentials",
     "CreditType",
     "Currency",
     "Debtor",
     "DurationUnit",
+    "EventDispatcher",
     "FilterConfiguration",
     "FundingRequest",
+    "FundingRequestBatch",
+    "FundingRequestDelta",
     "IFTTTConfiguration",
     "Investment",
+    "InvestmentAggregator",
+    "InvestmentDimension",
     "InvestmentPortfolio",
+    "InvestmentSummary",
     "Movement",
     "Notification",
     "Portfolio",
+    "PortfolioBatch",
     "PortfolioCategory",
     "PrivateEvent",
     "PublicEvent",
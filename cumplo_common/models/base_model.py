@@ -39,3 +39,9 @@ class BaseModel(pydantic.BaseModel, ABC):
 
         """
         return loads(self.model_dump_json(*args, **kwargs, exclude_none=True))
+
+
+class FrozenBaseModel(BaseModel):
+    """Immutable base class for the read-only snapshots that are instantiated in large amounts."""
+
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
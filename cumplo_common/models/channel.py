@@ -1,12 +1,13 @@
 import ipaddress
 from abc import ABC
-from typing import Any, Literal, Self
+from functools import lru_cache
+from typing import Annotated, Any, Literal, Self
 from urllib.parse import urlparse
 
 import ulid
-from pydantic import Field, field_validator, model_validator
+from pydantic import Discriminator, Field, Tag, field_validator, model_validator
 
-from cumplo_common.utils.constants import PHONE_NUMBER_REGEX
+from cumplo_common.utils.constants import CACHE_MAXSIZE, PHONE_NUMBER_REGEX
 
 from .base_model import BaseModel
 from .event_public import PublicEvent
@@ -14,6 +15,7 @@ from .utils import StrEnum
 
 ALL_EVENTS = "all"
 ALL_EVENTS_TYPE = Literal["all"]
+UNKNOWN_CHANNEL_TYPE = "unknown"
 
 
 class ChannelType(StrEnum):
@@ -37,6 +39,15 @@ class ChannelConfiguration(BaseModel, ABC):
         """Format the ID field as an ULID object."""
         return ulid.parse(value)
 
+    @field_validator("type_", mode="before")
+    @classmethod
+    def _format_type(cls, value: Any) -> Any:
+        """Format the type field as a ChannelType member case insensitively."""
+        try:
+            return ChannelType(value)
+        except ValueError:
+            return value  # NOTE: Left for the field to reject
+
     @field_validator("enabled_events", mode="before")
     @classmethod
     def _format_enabled_all_events(cls, value: Any) -> Any:
@@ -94,27 +105,58 @@ class WebhookConfiguration(ChannelConfiguration):
     @classmethod
     def _validate_url(cls, value: str) -> str:
         """Validate the URL scheme and hostname."""
-        url = urlparse(value)
+        return _validate_webhook_url(value)
 
-        if url.scheme != "https":
-            raise ValueError("Only HTTPS URLs are allowed")
 
-        if not url.hostname:
-            raise ValueError("URL must have a hostname")
+@lru_cache(maxsize=CACHE_MAXSIZE)
+def _validate_webhook_url(value: str) -> str:
+    """
+    Validate the scheme and hostname of a webhook URL.
 
-        try:
-            ip = ipaddress.ip_address(url.hostname)
-        except ValueError:
-            pass  # NOTE: Hostname is not an IP address, which is fine
-        else:
-            if ip.is_private:
-                raise ValueError("Private IP addresses are not allowed")
+    The result only depends on the URL, so it's cached to keep loading users cheap. Hostnames that resolve to private
+    addresses can only be caught when delivering, see `cumplo_common.utils.dns.HostResolver`.
+    """
+    url = urlparse(value)
 
-        return value
+    if url.scheme != "https":
+        raise ValueError("Only HTTPS URLs are allowed")
+
+    if not url.hostname:
+        raise ValueError("URL must have a hostname")
+
+    try:
+        ip = ipaddress.ip_address(url.hostname)
+    except ValueError:
+        pass  # NOTE: Hostname is not an IP address, which is fine
+    else:
+        if ip.is_private:
+            raise ValueError("Private IP addresses are not allowed")
+
+    return value
 
 
 ChannelConfigurationType = IFTTTConfiguration | WhatsappConfiguration | WebhookConfiguration
 
+
+def _get_channel_type(value: Any) -> str:
+    """Get the union tag of a channel configuration, which is its type found case insensitively."""
+    type_: Any = value.get("type_") if isinstance(value, dict) else getattr(value, "type_", None)
+    try:
+        return ChannelType(type_).value
+    except ValueError:
+        return UNKNOWN_CHANNEL_TYPE
+
+
+# NOTE: Validates each channel with the model of its type instead of trying every model of the union in turn.
+#       Channels without a known type fall back to the whole union, so the same inputs are accepted.
+TaggedChannelConfigurationType = Annotated[
+    Annotated[IFTTTConfiguration, Tag(ChannelType.IFTTT.value)]
+    | Annotated[WhatsappConfiguration, Tag(ChannelType.WHATSAPP.value)]
+    | Annotated[WebhookConfiguration, Tag(ChannelType.WEBHOOK.value)]
+    | Annotated[ChannelConfigurationType, Tag(UNKNOWN_CHANNEL_TYPE)],
+    Discriminator(_get_channel_type),
+]
+
 CHANNEL_CONFIGURATION_BY_TYPE: dict[ChannelType, type[ChannelConfigurationType]] = {
     ChannelType.WHATSAPP: WhatsappConfiguration,
     ChannelType.WEBHOOK: WebhookConfiguration,
@@ -1,4 +1,4 @@
-from cumplo_common.models.funding_request import FundingRequest
+from cumplo_common.models.funding_request import FundingRequest, FundingRequestDelta
 from cumplo_common.models.investment import Investment
 from cumplo_common.models.movement import Movement
 from cumplo_common.models.user import User
@@ -12,6 +12,7 @@ class PrivateEvent(Event):
     # Events
     FUNDING_REQUEST_AVAILABLE = "funding_request.available", FundingRequest
     FUNDING_REQUEST_PROMISING = "funding_request.promising", FundingRequest, True
+    FUNDING_REQUEST_UPDATED = "funding_request.updated", FundingRequestDelta
 
     USER_NOTIFICATIONS_UPDATED = "user.notifications.updated", User
     USER_CREDENTIALS_UPDATED = "user.credentials.updated", User
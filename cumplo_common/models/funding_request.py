@@ -1,18 +1,20 @@
 from decimal import Decimal
 from functools import cached_property
 from math import ceil
+from typing import ClassVar, Self
 
-from pydantic import Field, computed_field
+from pydantic import Field, TypeAdapter, computed_field
 
 from cumplo_common.utils.constants import CUMPLO_BASE_URL, SIMULATION_AMOUNT
+from cumplo_common.utils.rates import DAYS_PER_YEAR, MONTHS_PER_YEAR, compound_rate, round_rate
 
-from .base_model import BaseModel
+from .base_model import BaseModel, FrozenBaseModel
 from .borrower import Borrower
 from .credit import CreditType
 from .currency import Currency
 from .debtor import Debtor
 from .simulation import Simulation
-from .utils import StrEnum
+from .utils import EventModel, StrEnum
 
 
 class DurationUnit(StrEnum):
@@ -28,7 +30,15 @@ class Duration(BaseModel):
         return f"{self.value} {self.unit.lower()}s"
 
 
-class FundingRequest(BaseModel):
+class FundingRequestDelta(BaseModel, EventModel):
+    """Changes of the fields of a funding request that are updated while it's being funded."""
+
+    raised_amount: int | None = Field(None)
+    raised_percentage: Decimal | None = Field(None)
+    investors: int | None = Field(None)
+
+
+class FundingRequest(FrozenBaseModel):
     id: int = Field(...)
     amount: int = Field(...)
     irr: Decimal = Field(...)
@@ -47,6 +57,13 @@ class FundingRequest(BaseModel):
     borrower: Borrower = Field(...)
     currency: Currency = Field(...)
 
+    # NOTE: The cached computed fields that depend on each of the fields a delta can change
+    DELTA_DEPENDENCIES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "raised_amount": (),
+        "raised_percentage": ("is_completed",),
+        "investors": (),
+    }
+
     @computed_field  # type: ignore[misc]
     @cached_property
     def installments(self) -> int:
@@ -58,17 +75,14 @@ class FundingRequest(BaseModel):
     def profit_rate(self) -> Decimal:
         """Calculates the profit rate for the funding request."""
         if self.installments > 1:
-            value = self.simulation.profit_rate
-        else:
-            value = (1 + self.irr / 100) ** Decimal(self.duration.value / 365) - 1
-        return round(Decimal(value), ndigits=4)
+            return self.simulation.profit_rate
+        return compound_rate(self.irr, self.duration.value, DAYS_PER_YEAR)
 
     @computed_field  # type: ignore[misc]
     @cached_property
     def monthly_profit_rate(self) -> Decimal:
         """Calculates the monthly profit rate for the funding request."""
-        value = (1 + self.irr / 100) ** Decimal(1 / 12) - 1
-        return round(Decimal(value), ndigits=4)
+        return compound_rate(self.irr, 1, MONTHS_PER_YEAR)
 
     @computed_field  # type: ignore[misc]
     @cached_property
@@ -99,10 +113,81 @@ class FundingRequest(BaseModel):
     @cached_property
     def upfront_fee(self) -> Decimal:
         """Calculates the upfront fee for the funding request."""
-        return round(Decimal(self.simulation.upfront_fee / SIMULATION_AMOUNT), 4)
+        return round_rate(self.simulation.upfront_fee / SIMULATION_AMOUNT)
 
     @computed_field  # type: ignore[misc]
     @cached_property
     def exit_fee(self) -> Decimal:
         """Calculates the exit fee for the funding request."""
-        return round(Decimal(self.simulation.exit_fee / SIMULATION_AMOUNT), 4)
+        return round_rate(self.simulation.exit_fee / SIMULATION_AMOUNT)
+
+    def diff(self, other: "FundingRequest") -> FundingRequestDelta | None:
+        """
+        Compute the changes of the funding fields between this snapshot and a newer one.
+
+        Only the fields a delta can carry are compared, the rest are expected to be unchanged.
+
+        Args:
+            other (FundingRequest): The newer snapshot of the same funding request
+
+        Raises:
+            ValueError: When the snapshots belong to different funding requests
+
+        Returns:
+            FundingRequestDelta | None: The changed fields or None if none of them changed
+
+        """
+        if other.id != self.id:
+            raise ValueError(f"Can't diff funding request {self.id} against funding request {other.id}")
+
+        changes = {
+            name: value for name in self.DELTA_DEPENDENCIES if (value := getattr(other, name)) != getattr(self, name)
+        }
+        if not changes:
+            return None
+
+        return FundingRequestDelta.model_construct(id=self.id, **changes)
+
+    def apply(self, delta: FundingRequestDelta) -> Self:
+        """
+        Build a copy of the funding request with the changes of a delta, without validating the whole model again.
+
+        Only the cached computed fields that depend on the changed fields are dropped, the rest are kept.
+
+        Args:
+            delta (FundingRequestDelta): The changes to apply
+
+        Raises:
+            ValueError: When the delta belongs to another funding request
+
+        Returns:
+            Self: The updated funding request
+
+        """
+        if delta.id != self.id:
+            raise ValueError(f"Can't apply a delta of funding request {delta.id} to funding request {self.id}")
+
+        changes = delta.model_dump(exclude={"id"}, exclude_none=True)
+        funding_request = self.model_copy(update=changes)
+        for name in changes:
+            for dependency in self.DELTA_DEPENDENCIES[name]:
+                funding_request.__dict__.pop(dependency, None)
+
+        return funding_request
+
+    @classmethod
+    def validate_many(cls, data: bytes | str) -> list["FundingRequest"]:
+        """
+        Validate a JSON list of funding requests straight from its raw bytes.
+
+        Args:
+            data (bytes | str): The JSON list of funding requests
+
+        Returns:
+            list[FundingRequest]: The validated funding requests
+
+        """
+        return _FUNDING_REQUESTS_ADAPTER.validate_json(data)
+
+
+_FUNDING_REQUESTS_ADAPTER = TypeAdapter(list[FundingRequest])
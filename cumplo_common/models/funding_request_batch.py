@@ -0,0 +1,204 @@
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, ClassVar, Self, overload
+
+from .credit import CreditType
+from .currency import Currency
+from .funding_request import DurationUnit, FundingRequest
+from .utils import StrEnum
+
+Selection = range | memoryview
+
+
+class FundingRequestView:
+    """
+    Lazy row of a funding request batch.
+
+    The scalar fields are read straight from the batch columns, and the full model is only validated when accessed.
+    """
+
+    __slots__ = ("_batch", "_model", "_row")
+
+    def __init__(self, batch: "FundingRequestBatch", row: int) -> None:
+        self._batch = batch
+        self._row = row
+        self._model: FundingRequest | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in FundingRequestBatch.COLUMNS:
+            raise AttributeError(name)
+        return self._batch.value(name, self._row)
+
+    def __repr__(self) -> str:
+        return f"FundingRequestView(id={self.id})"
+
+    @property
+    def model(self) -> FundingRequest:
+        """The full funding request model."""
+        if self._model is None:
+            self._model = FundingRequest.model_validate_json(self._batch.rows[self._row])
+        return self._model
+
+
+class FundingRequestBatch:
+    """
+    Columnar container of funding requests.
+
+    The scalar fields are stored in compact typed arrays while each full funding request is kept as its JSON
+    serialization, which takes a fraction of the memory of the validated model tree. Slicing, filtering and sorting
+    return new batches that share the same columns and rows, only holding the selected row positions.
+    """
+
+    COLUMNS: ClassVar[dict[str, str]] = {
+        "id": "q",
+        "amount": "q",
+        "irr": "d",
+        "score": "d",
+        "raised_amount": "q",
+        "duration": "l",
+        "duration_unit": "B",
+        "credit_type": "B",
+        "currency": "B",
+        "profit_rate": "d",
+        "monthly_profit_rate": "d",
+    }
+    CATEGORIES: ClassVar[dict[str, list[StrEnum]]] = {
+        "duration_unit": list(DurationUnit),
+        "credit_type": list(CreditType),
+        "currency": list(Currency),
+    }
+
+    __slots__ = ("columns", "rows", "selection")
+
+    def __init__(self, columns: dict[str, array[Any]], rows: list[bytes], selection: Selection | None = None) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.selection = range(len(rows)) if selection is None else selection
+
+    @classmethod
+    def from_models(cls, funding_requests: Iterable[FundingRequest]) -> Self:
+        """
+        Build a batch from funding request models.
+
+        Args:
+            funding_requests (Iterable[FundingRequest]): The funding requests to store
+
+        Returns:
+            Self: A batch containing every funding request
+
+        """
+        columns: dict[str, array[Any]] = {name: array(typecode) for name, typecode in cls.COLUMNS.items()}
+        codes = {
+            name: {member: code for code, member in enumerate(members)} for name, members in cls.CATEGORIES.items()
+        }
+        rows = []
+
+        for funding_request in funding_requests:
+            columns["id"].append(funding_request.id)
+            columns["amount"].append(funding_request.amount)
+            columns["irr"].append(float(funding_request.irr))
+            columns["score"].append(float(funding_request.score))
+            columns["raised_amount"].append(funding_request.raised_amount)
+            columns["duration"].append(funding_request.duration.value)
+            columns["duration_unit"].append(codes["duration_unit"][funding_request.duration.unit])
+            columns["credit_type"].append(codes["credit_type"][funding_request.credit_type])
+            columns["currency"].append(codes["currency"][funding_request.currency])
+            columns["profit_rate"].append(float(funding_request.profit_rate))
+            columns["monthly_profit_rate"].append(float(funding_request.monthly_profit_rate))
+            rows.append(funding_request.model_dump_json().encode())
+
+        return cls(columns, rows)
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> Self:
+        """Build a batch from a JSON list of funding requests, validated with `FundingRequest.validate_many`."""
+        return cls.from_models(FundingRequest.validate_many(data))
+
+    def __len__(self) -> int:
+        return len(self.selection)
+
+    def __iter__(self) -> Iterator[FundingRequestView]:
+        for row in self.selection:
+            yield FundingRequestView(self, row)
+
+    @overload
+    def __getitem__(self, key: int) -> FundingRequestView: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> Self: ...
+
+    def __getitem__(self, key: int | slice) -> FundingRequestView | Self:
+        if isinstance(key, slice):
+            return self._select(self.selection[key])
+        return FundingRequestView(self, self.selection[key])
+
+    def _select(self, selection: Selection | Sequence[int]) -> Self:
+        """Build a batch over the same data with other row positions."""
+        if not isinstance(selection, range | memoryview):
+            selection = memoryview(array("q", selection))
+        return type(self)(self.columns, self.rows, selection)
+
+    def value(self, name: str, row: int) -> Any:
+        """
+        Get the value of a column for a row position, decoding the categorical columns into their enum members.
+
+        Args:
+            name (str): The column name
+            row (int): The row position in the underlying columns
+
+        Returns:
+            Any: The stored value
+
+        """
+        value = self.columns[name][row]
+        if categories := self.CATEGORIES.get(name):
+            return categories[value]
+        return value
+
+    def column(self, name: str) -> array[Any]:
+        """
+        Get the stored values of a column for the selected rows. Categorical columns hold the position of their member.
+
+        When every row is selected the underlying array is returned without copying it.
+
+        Args:
+            name (str): The column name
+
+        Returns:
+            array: The column values
+
+        """
+        column = self.columns[name]
+        if self.selection == range(len(column)):
+            return column
+        return array(column.typecode, map(column.__getitem__, self.selection))
+
+    def values(self, name: str) -> list[Any]:
+        """Get the decoded values of a column for the selected rows."""
+        return [self.value(name, row) for row in self.selection]
+
+    def filter(self, mask: Iterable[bool]) -> Self:
+        """
+        Select the rows whose mask value is true.
+
+        Args:
+            mask (Iterable[bool]): A boolean for each selected row, usually computed from the batch columns
+
+        Returns:
+            Self: A batch with the matching rows
+
+        """
+        return self._select([row for row, keep in zip(self.selection, mask, strict=True) if keep])
+
+    def where(self, name: str, predicate: Callable[[Any], bool]) -> Self:
+        """Select the rows whose decoded column value satisfies the predicate."""
+        return self.filter(map(predicate, self.values(name)))
+
+    def sort(self, name: str, *, reverse: bool = False) -> Self:
+        """Order the selected rows by a column."""
+        column = self.columns[name]
+        return self._select(sorted(self.selection, key=column.__getitem__, reverse=reverse))
+
+    def models(self) -> list[FundingRequest]:
+        """Validate the full funding request models of the selected rows."""
+        return [FundingRequest.model_validate_json(self.rows[row]) for row in self.selection]
@@ -2,12 +2,12 @@ from datetime import datetime
 
 from pydantic import Field
 
-from .base_model import BaseModel
+from .base_model import FrozenBaseModel
 from .credit import CreditType
 from .funding_request import Duration
 
 
-class Investment(BaseModel):
+class Investment(FrozenBaseModel):
     id: int = Field(...)
     id_funding_request: int = Field(...)
     credit_type: CreditType = Field(...)
@@ -0,0 +1,233 @@
+from array import array
+from collections.abc import Iterable
+from typing import ClassVar, Self
+
+from pydantic import Field, computed_field
+
+from .base_model import BaseModel
+from .event_private import PrivateEvent
+from .investment import Investment
+from .user import InvestmentPortfolio
+from .utils import StrEnum
+
+INVESTMENT_EVENTS = frozenset(event for event in PrivateEvent if event.model is Investment)
+
+
+class InvestmentDimension(StrEnum):
+    """Fields by which the investments of a portfolio can be grouped."""
+
+    CREDIT_TYPE = "credit_type"
+    STATUS = "status"
+    BORROWER = "borrower"
+    DEBTOR = "debtor"
+    CURRENCY = "currency"
+
+
+class InvestmentSummary(BaseModel):
+    """Totals of a group of investments."""
+
+    count: int = Field(0)
+    amount: int = Field(0)
+    paid_capital: int = Field(0)
+    insolvent_capital: int = Field(0)
+    interest: int = Field(0)
+    upfront_fee: int = Field(0)
+    exit_fee: int = Field(0)
+    delinquent: int = Field(0)
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def exposure(self) -> int:
+        """Capital that hasn't been paid back yet."""
+        return self.amount - self.paid_capital
+
+
+class InvestmentAggregator:
+    """
+    Columnar aggregation of the investments of a portfolio.
+
+    The metrics of every investment are stored in typed arrays, and the totals of every group of every dimension are
+    kept up to date as investments are added, changed or removed, so summaries never loop over the investments again.
+    """
+
+    # NOTE: The order of the totals of a group, which is the order of the InvestmentSummary fields
+    METRICS: ClassVar[tuple[str, ...]] = (
+        "count",
+        "amount",
+        "paid_capital",
+        "insolvent_capital",
+        "interest",
+        "upfront_fee",
+        "exit_fee",
+        "delinquent",
+    )
+
+    __slots__ = ("free", "keys", "metrics", "rows", "totals")
+
+    def __init__(self) -> None:
+        self.rows: dict[int, int] = {}
+        self.free: list[int] = []
+        self.metrics: dict[str, array[int]] = {metric: array("q") for metric in self.METRICS}
+        self.keys: dict[InvestmentDimension, list[str]] = {dimension: [] for dimension in InvestmentDimension}
+        self.totals: dict[InvestmentDimension, dict[str, list[int]]] = {
+            dimension: {} for dimension in InvestmentDimension
+        }
+
+    @classmethod
+    def from_portfolio(cls, portfolio: InvestmentPortfolio) -> Self:
+        """
+        Build an aggregator with the investments of a portfolio.
+
+        Args:
+            portfolio (InvestmentPortfolio): The investment portfolio
+
+        Returns:
+            Self: The aggregator of the portfolio
+
+        """
+        return cls.from_investments(portfolio.investments.values())
+
+    @classmethod
+    def from_investments(cls, investments: Iterable[Investment]) -> Self:
+        """Build an aggregator with the given investments, computing the totals of each group in bulk."""
+        aggregator = cls()
+        investments = list({investment.id: investment for investment in investments}.values())
+        aggregator.rows = {investment.id: row for row, investment in enumerate(investments)}
+        aggregator.metrics = {
+            "count": array("q", [1]) * len(investments),
+            "amount": array("q", [investment.amount for investment in investments]),
+            "paid_capital": array("q", [investment.paid_capital for investment in investments]),
+            "insolvent_capital": array("q", [investment.insolvent_capital for investment in investments]),
+            "interest": array("q", [investment.interest for investment in investments]),
+            "upfront_fee": array("q", [investment.upfront_fee for investment in investments]),
+            "exit_fee": array("q", [investment.exit_fee for investment in investments]),
+            "delinquent": array("q", [investment.days_delinquent > 0 for investment in investments]),
+        }
+        columns = [aggregator.metrics[metric] for metric in cls.METRICS]
+
+        for dimension in InvestmentDimension:
+            keys = aggregator.keys[dimension] = [
+                str(getattr(investment, dimension.value)) for investment in investments
+            ]
+            groups: dict[str, list[int]] = {}
+            for row, key in enumerate(keys):
+                groups.setdefault(key, []).append(row)
+            aggregator.totals[dimension] = {
+                key: [sum(map(column.__getitem__, rows)) for column in columns] for key, rows in groups.items()
+            }
+
+        return aggregator
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, id_investment: object) -> bool:
+        return id_investment in self.rows
+
+    def upsert(self, investment: Investment) -> None:
+        """
+        Add an investment or replace the stored one with the same ID, updating the totals of its groups.
+
+        Args:
+            investment (Investment): The new state of the investment
+
+        """
+        if (row := self.rows.get(investment.id)) is not None:
+            self._accumulate(row, -1)
+        elif self.free:
+            row = self.rows[investment.id] = self.free.pop()
+        else:
+            row = self.rows[investment.id] = len(self.metrics["count"])
+            for column in self.metrics.values():
+                column.append(0)
+            for keys in self.keys.values():
+                keys.append("")
+
+        values = (
+            1,
+            investment.amount,
+            investment.paid_capital,
+            investment.insolvent_capital,
+            investment.interest,
+            investment.upfront_fee,
+            investment.exit_fee,
+            int(investment.days_delinquent > 0),
+        )
+        for metric, value in zip(self.METRICS, values, strict=True):
+            self.metrics[metric][row] = value
+        for dimension, keys in self.keys.items():
+            keys[row] = str(getattr(investment, dimension.value))
+
+        self._accumulate(row, 1)
+
+    def remove(self, id_investment: int) -> bool:
+        """
+        Remove an investment, updating the totals of its groups.
+
+        Args:
+            id_investment (int): The ID of the investment
+
+        Returns:
+            bool: Whether the investment was stored
+
+        """
+        if (row := self.rows.pop(id_investment, None)) is None:
+            return False
+
+        self._accumulate(row, -1)
+        for column in self.metrics.values():
+            column[row] = 0
+        self.free.append(row)
+        return True
+
+    def apply(self, event: PrivateEvent, investment: Investment) -> None:
+        """
+        Update the aggregation with the investment carried by an investment event.
+
+        Every investment event carries the whole investment, whose status reflects the event, so it always replaces
+        the stored investment.
+
+        Args:
+            event (PrivateEvent): One of the INVESTMENT_* events
+            investment (Investment): The content of the event
+
+        Raises:
+            ValueError: When the event doesn't carry an investment
+
+        """
+        if event not in INVESTMENT_EVENTS:
+            raise ValueError(f"Event {event} doesn't carry an investment")
+        self.upsert(investment)
+
+    def summarize(self, dimension: InvestmentDimension) -> dict[str, InvestmentSummary]:
+        """
+        Get the totals of every group of investments of a dimension.
+
+        Args:
+            dimension (InvestmentDimension): The dimension to group by
+
+        Returns:
+            dict[str, InvestmentSummary]: The totals of each group that has investments, by the group value
+
+        """
+        return {key: self._summary(totals) for key, totals in self.totals[dimension].items() if totals[0]}
+
+    def total(self) -> InvestmentSummary:
+        """Get the totals of every investment of the portfolio."""
+        groups = self.totals[InvestmentDimension.CURRENCY].values()
+        return self._summary([sum(totals) for totals in zip(*groups, strict=True)] or [0] * len(self.METRICS))
+
+    def _summary(self, totals: list[int]) -> InvestmentSummary:
+        """Build the summary of some totals."""
+        return InvestmentSummary.model_validate(dict(zip(self.METRICS, totals, strict=True)))
+
+    def _accumulate(self, row: int, sign: int) -> None:
+        """Add or subtract the metrics of a row to the totals of each of its groups."""
+        values = [self.metrics[metric][row] * sign for metric in self.METRICS]
+        for dimension, keys in self.keys.items():
+            groups = self.totals[dimension]
+            if (totals := groups.get(keys[row])) is None:
+                groups[keys[row]] = values.copy()
+                continue
+            for index, value in enumerate(values):
+                totals[index] += value
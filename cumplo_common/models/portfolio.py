@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from decimal import Decimal
 from functools import cached_property
 
@@ -39,6 +40,23 @@ class PortfolioGroup(BaseModel):
         return getattr(self, unit.value)
 
 
+@dataclass(frozen=True, slots=True)
+class DerivedPortfolioGroup:
+    """
+    Group of a portfolio derived from its other groups.
+
+    Built from already validated values, so it's a plain immutable value instead of a model. It serializes just
+    like a `PortfolioGroup`.
+    """
+
+    amount: Decimal
+    count: int
+
+    def get(self, unit: PortfolioCategoryUnit) -> Decimal:
+        """Get the value of the group in the given unit."""
+        return getattr(self, unit.value)
+
+
 class Portfolio(BaseModel):
     cured: PortfolioGroup = Field(...)
     active: PortfolioGroup = Field(...)
@@ -48,27 +66,27 @@ class Portfolio(BaseModel):
 
     @computed_field  # type: ignore[misc]
     @cached_property
-    def total(self) -> PortfolioGroup:
+    def total(self) -> DerivedPortfolioGroup:
         """Total is the sum of outstanding and paid."""
-        return PortfolioGroup(
+        return DerivedPortfolioGroup(
             amount=self.outstanding.amount + self.paid.amount,
             count=self.outstanding.count + self.paid.count,
         )
 
     @computed_field  # type: ignore[misc]
     @cached_property
-    def outstanding(self) -> PortfolioGroup:
+    def outstanding(self) -> DerivedPortfolioGroup:
         """Outstanding is the sum of active, overdue and delinquent."""
-        return PortfolioGroup(
+        return DerivedPortfolioGroup(
             amount=self.active.amount + self.overdue.amount + self.delinquent.amount,
             count=self.active.count + self.overdue.count + self.delinquent.count,
         )
 
     @computed_field  # type: ignore[misc]
     @cached_property
-    def paid(self) -> PortfolioGroup:
+    def paid(self) -> DerivedPortfolioGroup:
         """Paid is the sum of credits paid on time and cured."""
-        return PortfolioGroup(
+        return DerivedPortfolioGroup(
             amount=self.on_time.amount + self.cured.amount,
             count=self.on_time.count + self.cured.count,
         )
@@ -0,0 +1,143 @@
+from array import array
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Any, ClassVar, Self
+
+from cumplo_common.utils.rates import round_rate
+
+from .portfolio import Portfolio, PortfolioCategory, PortfolioCategoryUnit
+
+PERCENTAGE_DIGITS = 3
+
+
+class PortfolioBatch:
+    """
+    Columnar container of many portfolios, such as the ones of the borrowers and debtors of a batch of funding requests.
+
+    Every category is stored as an amount column and a count column, with the derived categories computed once when
+    the batch is built. Any category, unit or percentage is then computed for the whole batch at once, with the same
+    results as calling `Portfolio.get` on each portfolio.
+    """
+
+    GROUPS: ClassVar[dict[PortfolioCategory, tuple[PortfolioCategory, ...]]] = {
+        PortfolioCategory.OUTSTANDING: (
+            PortfolioCategory.ACTIVE,
+            PortfolioCategory.OVERDUE,
+            PortfolioCategory.DELINQUENT,
+        ),
+        PortfolioCategory.PAID: (PortfolioCategory.ON_TIME, PortfolioCategory.CURED),
+        PortfolioCategory.TOTAL: (PortfolioCategory.OUTSTANDING, PortfolioCategory.PAID),
+    }
+
+    __slots__ = ("amounts", "counts")
+
+    def __init__(
+        self,
+        amounts: dict[PortfolioCategory, list[Decimal]],
+        counts: dict[PortfolioCategory, array[int]],
+    ) -> None:
+        self.amounts = amounts
+        self.counts = counts
+
+    @classmethod
+    def from_portfolios(cls, portfolios: Iterable[Portfolio]) -> Self:
+        """
+        Build a batch from portfolio models. Only their stored groups are read, the derived ones are never computed.
+
+        Args:
+            portfolios (Iterable[Portfolio]): The portfolios to store
+
+        Returns:
+            Self: A batch containing every portfolio
+
+        """
+        groups = [category for category in PortfolioCategory if category not in cls.GROUPS]
+        amounts: dict[PortfolioCategory, list[Decimal]] = {category: [] for category in groups}
+        counts = {category: array("q") for category in groups}
+
+        for portfolio in portfolios:
+            for category in groups:
+                group = getattr(portfolio, category.value)
+                amounts[category].append(group.amount)
+                counts[category].append(group.count)
+
+        # NOTE: The derived categories are summed in the same order as the Portfolio computed fields
+        for category, parts in cls.GROUPS.items():
+            first, *rest = parts
+            amounts[category] = list(amounts[first])
+            counts[category] = array("q", counts[first])
+            for part in rest:
+                amounts[category] = [
+                    total + amount for total, amount in zip(amounts[category], amounts[part], strict=True)
+                ]
+                counts[category] = array("q", map(int.__add__, counts[category], counts[part]))
+
+        return cls(amounts, counts)
+
+    def __len__(self) -> int:
+        return len(self.counts[PortfolioCategory.TOTAL])
+
+    def column(self, unit: PortfolioCategoryUnit, category: PortfolioCategory) -> list[Decimal] | array[int]:
+        """
+        Get the stored amounts or counts of a category, without copying them.
+
+        Args:
+            unit (PortfolioCategoryUnit): Either the amount or the count unit
+            category (PortfolioCategory): The category of the column
+
+        Raises:
+            ValueError: When asked for the percentage unit, which isn't stored
+
+        Returns:
+            list[Decimal] | array[int]: The values of every portfolio
+
+        """
+        if unit == PortfolioCategoryUnit.AMOUNT:
+            return self.amounts[category]
+        if unit == PortfolioCategoryUnit.COUNT:
+            return self.counts[category]
+        raise ValueError(f"Portfolios don't store the {unit} unit")
+
+    def get(
+        self,
+        *,
+        unit: PortfolioCategoryUnit,
+        category: PortfolioCategory,
+        percentage_base: PortfolioCategory = PortfolioCategory.TOTAL,
+        percentage_unit: PortfolioCategoryUnit = PortfolioCategoryUnit.COUNT,
+    ) -> list[Any]:
+        """
+        Get the value of every portfolio in the given category and unit. Equivalent to `Portfolio.get` on each one.
+
+        Args:
+            unit (PortfolioCategoryUnit): The unit of the values
+            category (PortfolioCategory): The category of the values
+            percentage_base (PortfolioCategory, optional): The base of percentages. Defaults to TOTAL.
+            percentage_unit (PortfolioCategoryUnit, optional): The unit of percentages. Defaults to COUNT.
+
+        Raises:
+            ValueError: When the percentage unit is also a percentage
+
+        Returns:
+            list[Any]: The value of each portfolio, as a Decimal or as an integer for counts
+
+        """
+        if unit != PortfolioCategoryUnit.PERCENTAGE:
+            return list(self.column(unit, category))
+
+        # NOTE: Counts are divided as floats and amounts as Decimals, just like `Portfolio.get` does
+        if percentage_unit == PortfolioCategoryUnit.COUNT:
+            counts = zip(self.counts[category], self.counts[percentage_base], strict=True)
+            return [
+                round_rate(numerator / denominator, PERCENTAGE_DIGITS) if denominator else Decimal(0)
+                for numerator, denominator in counts
+            ]
+
+        if percentage_unit == PortfolioCategoryUnit.AMOUNT:
+            amounts = zip(self.amounts[category], self.amounts[percentage_base], strict=True)
+            return [
+                round(numerator / denominator, PERCENTAGE_DIGITS) if denominator else Decimal(0)
+                for numerator, denominator in amounts
+            ]
+
+        raise ValueError("Percentages can't be computed over percentages")
@@ -0,0 +1,129 @@
+from collections.abc import Iterable
+from typing import Self
+
+import ulid
+
+from .channel import ChannelConfigurationType
+from .event_private import PrivateEvent
+from .event_public import PublicEvent
+from .user import User
+
+Route = tuple[User, ChannelConfigurationType]
+RouteKey = tuple[ulid.ULID, str]
+
+
+class ChannelRoutingIndex:
+    """
+    Index of the channels that should be notified of each public event.
+
+    The routes of every user are indexed by event once, and then kept up to date as users change their channels or
+    are deleted, so getting the targets of an event is a lookup instead of a scan over every user's channels.
+    """
+
+    __slots__ = ("_cache", "_keys", "_routes")
+
+    def __init__(self) -> None:
+        self._routes: dict[PublicEvent, dict[RouteKey, Route]] = {event: {} for event in PublicEvent}
+        self._keys: dict[ulid.ULID, list[tuple[PublicEvent, RouteKey]]] = {}
+        self._cache: dict[PublicEvent, list[Route]] = {}
+
+    @classmethod
+    def from_users(cls, users: Iterable[User]) -> Self:
+        """
+        Build an index with the channels of the given users.
+
+        Args:
+            users (Iterable[User]): The users to index
+
+        Returns:
+            Self: The routing index of the users
+
+        """
+        index = cls()
+        for user in users:
+            index.upsert(user)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, id_user: object) -> bool:
+        return id_user in self._keys
+
+    def targets(self, event: PublicEvent) -> list[Route]:
+        """
+        Get the users and channels that should be notified of an event.
+
+        Args:
+            event (PublicEvent): The event being dispatched
+
+        Returns:
+            list[Route]: The user and channel of each enabled route, which must not be modified
+
+        """
+        if (routes := self._cache.get(event)) is None:
+            routes = self._cache[event] = list(self._routes[event].values())
+        return routes
+
+    def upsert(self, user: User) -> None:
+        """
+        Index the channels of a user, replacing its previous routes.
+
+        Args:
+            user (User): The current state of the user
+
+        """
+        self.remove(user.id)
+        keys = self._keys[user.id] = []
+
+        for id_channel, channel in user.channels.items():
+            if not channel.enabled:
+                continue
+            for event in PublicEvent:
+                if channel.event_enabled(event):
+                    key = (user.id, id_channel)
+                    self._routes[event][key] = (user, channel)
+                    self._cache.pop(event, None)
+                    keys.append((event, key))
+
+    def remove(self, id_user: ulid.ULID) -> bool:
+        """
+        Remove every route of a user.
+
+        Args:
+            id_user (ULID): The ID of the user
+
+        Returns:
+            bool: Whether the user was indexed
+
+        """
+        if (keys := self._keys.pop(id_user, None)) is None:
+            return False
+
+        for event, key in keys:
+            del self._routes[event][key]
+            self._cache.pop(event, None)
+        return True
+
+    def apply(self, event: PrivateEvent, user: User) -> None:
+        """
+        Update the index with the user carried by a user event.
+
+        Deleted users lose their routes, while any other user event replaces the indexed user so routes always hold
+        its latest state, such as the notifications used to avoid repeating them.
+
+        Args:
+            event (PrivateEvent): One of the USER_* events
+            user (User): The content of the event
+
+        Raises:
+            ValueError: When the event doesn't carry a user
+
+        """
+        if event.model is not User:
+            raise ValueError(f"Event {event} doesn't carry a user")
+
+        if event == PrivateEvent.USER_DELETED:
+            self.remove(user.id)
+        else:
+            self.upsert(user)
@@ -1,23 +1,37 @@
+from collections.abc import Iterable
 from datetime import datetime
 from decimal import Decimal
 from functools import cached_property
+from typing import Self
 
 from pydantic import Field, computed_field
 
 from cumplo_common.utils.constants import SIMULATION_AMOUNT
+from cumplo_common.utils.rates import DAYS_PER_YEAR, round_rate, xirr, xirrs
 
-from .base_model import BaseModel
+from .base_model import FrozenBaseModel
 
+SECONDS_PER_DAY = 86400
 
-class SimulationInstallment(BaseModel):
+
+class SimulationInstallment(FrozenBaseModel):
     amount: int = Field(...)
     capital: int = Field(...)
     exit_fee: int = Field(...)
     interest: int = Field(...)
     date: datetime = Field(...)
 
+    @property
+    def received(self) -> int:
+        """Returns the amount received by the investor, net of the exit fee."""
+        return self.capital + self.interest - self.exit_fee
+
+    def days_since(self, start: datetime) -> float:
+        """Compute the days elapsed from the given start until the installment is paid."""
+        return (self.date - start).total_seconds() / SECONDS_PER_DAY
+
 
-class Simulation(BaseModel):
+class Simulation(FrozenBaseModel):
     exit_fee: int = Field(...)
     upfront_fee: int = Field(...)
     net_returns: int = Field(...)
@@ -33,4 +47,104 @@ class Simulation(BaseModel):
     @cached_property
     def profit_rate(self) -> Decimal:
         """Returns the profit rate of the simulation."""
-        return round(Decimal((self.capital + self.net_returns) / self.investment - 1), 4)
+        return round_rate((self.capital + self.net_returns) / self.investment - 1)
+
+    def scale(self, amount: int) -> Self:
+        """
+        Scale the simulation to another invested capital. Every scaled value is rounded to the nearest integer.
+
+        Args:
+            amount (int): The capital to invest
+
+        Returns:
+            Self: The simulation of investing the given capital
+
+        """
+        factor = amount / self.capital
+        installments = [
+            installment.model_copy(
+                update={
+                    "amount": round(installment.amount * factor),
+                    "capital": round(installment.capital * factor),
+                    "exit_fee": round(installment.exit_fee * factor),
+                    "interest": round(installment.interest * factor),
+                }
+            )
+            for installment in self.installments
+        ]
+        return type(self).model_validate({
+            "capital": amount,
+            "exit_fee": round(self.exit_fee * factor),
+            "upfront_fee": round(self.upfront_fee * factor),
+            "net_returns": round(self.net_returns * factor),
+            "installments": installments,
+        })
+
+    def cash_flows(self, start: datetime, amount: int | None = None) -> tuple[list[float], list[float]]:
+        """
+        Build the cash flows of the simulation: the investment at the start and then each installment received.
+
+        Args:
+            start (datetime): When the investment is made, with the same timezone awareness as the installment dates
+            amount (int | None, optional): The capital to invest. Defaults to the capital of the simulation.
+
+        Returns:
+            tuple[list[float], list[float]]: The amount of each cash flow and the days elapsed until it happens
+
+        """
+        factor = 1 if amount is None else amount / self.capital
+        amounts = [-self.investment * factor]
+        days = [0.0]
+        for installment in self.installments:
+            amounts.append(installment.received * factor)
+            days.append(installment.days_since(start))
+        return amounts, days
+
+    def xirr(self, start: datetime) -> Decimal | None:
+        """
+        Compute the annualized return of investing at the given start, accounting for when each installment is paid.
+
+        Args:
+            start (datetime): When the investment is made
+
+        Returns:
+            Decimal | None: The annual rate as a fraction, or None if the cash flows have no rate of return
+
+        """
+        return xirr(*self.cash_flows(start))
+
+    @classmethod
+    def xirrs(cls, simulations: Iterable[Self], start: datetime) -> list[Decimal | None]:
+        """Compute the XIRR of many simulations invested at the same start, in the same order."""
+        return xirrs(simulation.cash_flows(start) for simulation in simulations)
+
+    def weighted_duration(self, start: datetime) -> float:
+        """
+        Compute the average days until the capital is paid back, weighted by the capital of each installment.
+
+        Args:
+            start (datetime): When the investment is made
+
+        Returns:
+            float: The weighted duration in days, or zero if the simulation has no capital to pay back
+
+        """
+        if not (capital := sum(installment.capital for installment in self.installments)):
+            return 0.0
+        return sum(installment.capital * installment.days_since(start) for installment in self.installments) / capital
+
+    def duration_weighted_return(self, start: datetime) -> Decimal | None:
+        """
+        Compute the return of the simulation annualized over its weighted duration.
+
+        Args:
+            start (datetime): When the investment is made
+
+        Returns:
+            Decimal | None: The annual rate as a fraction, or None if the capital isn't paid back after the start
+
+        """
+        if (duration := self.weighted_duration(start)) <= 0:
+            return None
+        profit_rate = (self.capital + self.net_returns) / self.investment - 1
+        return round_rate(profit_rate * DAYS_PER_YEAR / duration)
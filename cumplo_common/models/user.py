@@ -14,7 +14,7 @@ from cumplo_common.utils.constants import (
 )
 
 from .base_model import BaseModel
-from .channel import ChannelConfigurationType
+from .channel import TaggedChannelConfigurationType
 from .credentials import Credentials
 from .event_public import PublicEvent
 from .filter_configuration import FilterConfiguration
@@ -49,13 +49,14 @@ class User(BaseModel):
     api_key: str = Field(...)
     email: str = Field(...)
     is_admin: bool = Field(False)
+    key_version: int = Field(0)
     name: str = Field(..., max_length=30)
     credentials: Credentials | None = Field(None)
     expiration_minutes: PositiveInt = Field(DEFAULT_EXPIRATION_MINUTES)
 
     notifications: dict[str, Notification] = Field(default_factory=dict)
     filters: dict[str, FilterConfiguration] = Field(default_factory=dict)
-    channels: dict[str, ChannelConfigurationType] = Field(default_factory=dict)
+    channels: dict[str, TaggedChannelConfigurationType] = Field(default_factory=dict)
 
     balance: Balance | None = Field(None)
     portfolio: InvestmentPortfolio | None = Field(None)
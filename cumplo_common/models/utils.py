@@ -1,24 +1,51 @@
+import asyncio
 import enum
-from collections.abc import Generator
-from typing import Self
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Generator, Iterable, Mapping
+from inspect import iscoroutinefunction
+from logging import getLogger
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any, ClassVar, Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
+logger = getLogger(__name__)
+
+
+class StrEnumType(enum.EnumType):
+    """Metaclass that builds the lookup tables of each StrEnum once its members are created."""
+
+    def __new__(metacls, cls: str, bases: tuple[type, ...], classdict: Any, **kwargs: Any) -> Any:  # noqa: N804
+        enum_class: Any = super().__new__(metacls, cls, bases, classdict, **kwargs)
+        enum_class._build_lookups()  # noqa: SLF001
+        return enum_class
+
+
+class StrEnum(enum.StrEnum, metaclass=StrEnumType):
+    _members_by_casefold: ClassVar[dict[str, Any]]
+    _names_by_casefold: ClassVar[frozenset[str]]
+
+    @classmethod
+    def _build_lookups(cls) -> None:
+        """Index the members by their casefolded values and names."""
+        members: dict[str, StrEnum] = {}
+        for member in cls:
+            members.setdefault(member.casefold(), member)
+        cls._members_by_casefold = members
+        cls._names_by_casefold = frozenset(member.name.casefold() for member in cls)
 
-class StrEnum(enum.StrEnum):
     @classmethod
     def _missing_(cls, value: object) -> Self | None:
         """Return the enum member case insensitively."""
         if isinstance(value, str):
-            for member in cls:
-                if member.casefold() == value.casefold():
-                    return member
+            return cls._members_by_casefold.get(value.casefold())
         return None
 
     @classmethod
     def has_member(cls, value: str) -> bool:
         """Whether the enum has a member case insensitively."""
-        return any(value.casefold() == item.name.casefold() for item in cls)
+        return value.casefold() in cls._names_by_casefold
 
     @classmethod
     def members(cls) -> Generator[Self, None, None]:
@@ -38,6 +65,7 @@ class EventModel(BaseModel):
 
 class Event(StrEnum):
     _name_: str
+    _models: ClassVar[Mapping[str, type[EventModel]]]
     model: type[EventModel]
     is_recurring: bool
 
@@ -48,3 +76,209 @@ class Event(StrEnum):
         obj._value_ = value
         obj.model = model
         return obj
+
+    @classmethod
+    def _build_lookups(cls) -> None:
+        """Index the members and the model carried by each of them."""
+        super()._build_lookups()
+        cls._models = MappingProxyType({member.value: member.model for member in cls})
+
+    @classmethod
+    def models(cls) -> Mapping[str, type[EventModel]]:
+        """Get the model carried by each event, by the event value."""
+        return cls._models
+
+
+EventContent = bytes | str | dict | EventModel
+EventHandler = Callable[[Any], Awaitable[None]] | Callable[[Any], None]
+
+
+class EventStats:
+    """Processing latency of an event."""
+
+    __slots__ = ("count", "failures", "max", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """The average seconds it takes to process the event."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, latency: float, *, failed: bool = False) -> None:
+        """Record the seconds it took to process the event once."""
+        self.count += 1
+        self.failures += failed
+        self.total += latency
+        self.max = max(self.max, latency)
+
+
+class EventDispatcher:
+    """
+    Dispatch table of the handlers of each event.
+
+    The content of each event is validated with a type adapter of its model, which is built once when the first
+    handler of the event is registered. Synchronous handlers run in worker threads so they don't block the event loop.
+
+    Events are identified by their value, so events of different types with the same value share their handlers.
+    """
+
+    def __init__(self) -> None:
+        self.events: dict[str, Event] = {}
+        self.handlers: dict[str, list[tuple[EventHandler, bool]]] = {}
+        self.adapters: dict[type[EventModel], TypeAdapter] = {}
+        self.stats: defaultdict[str, EventStats] = defaultdict(EventStats)
+
+    def register(self, event: Event, handler: EventHandler) -> None:
+        """
+        Register a handler of an event, which will be called with the validated content of the event.
+
+        Args:
+            event (Event): The event to handle
+            handler (EventHandler): A function or coroutine function that receives the event content
+
+        """
+        self.events.setdefault(event.value, event)
+        self.handlers.setdefault(event.value, []).append((handler, iscoroutinefunction(handler)))
+        if event.model not in self.adapters:
+            self.adapters[event.model] = TypeAdapter(event.model)
+
+    def on[T: EventHandler](self, *events: Event) -> Callable[[T], T]:
+        """Decorate a function to register it as a handler of the given events."""
+
+        def decorator(handler: T) -> T:
+            for event in events:
+                self.register(event, handler)
+            return handler
+
+        return decorator
+
+    def validate(self, event: str, content: EventContent) -> EventModel:
+        """
+        Validate the content of an event with its model.
+
+        Args:
+            event (str): The event value
+            content (EventContent): The JSON, data or model of the content
+
+        Returns:
+            EventModel: The validated content
+
+        Raises:
+            ValueError: When the event has no handlers or its content is invalid
+
+        """
+        if (member := self.events.get(event)) is None:
+            raise ValueError(f"Event {event} has no handlers")
+        return self._validate(member.model, content)
+
+    async def dispatch(self, event: str, content: EventContent) -> EventModel:
+        """
+        Validate the content of an event and call every handler of the event with it.
+
+        Args:
+            event (str): The event value
+            content (EventContent): The JSON, data or model of the content
+
+        Returns:
+            EventModel: The validated content
+
+        Raises:
+            ValueError: When the event has no handlers or its content is invalid
+
+        """
+        start = perf_counter()
+        if event not in self.events:
+            raise ValueError(f"Event {event} has no handlers")
+
+        try:
+            model = self.validate(event, content)
+            await self._handle(event, model)
+        except Exception:
+            self.stats[event].record(perf_counter() - start, failed=True)
+            raise
+
+        self.stats[event].record(perf_counter() - start)
+        return model
+
+    async def dispatch_many(self, messages: Iterable[tuple[str, EventContent]]) -> list[Exception | None]:
+        """
+        Dispatch a batch of events, handling every message concurrently.
+
+        Args:
+            messages (Iterable[tuple[str, EventContent]]): The event value and content of each message
+
+        Returns:
+            list[Exception | None]: The error of each message, or None if it was handled, in the same order
+
+        """
+        messages = list(messages)
+        errors: list[Exception | None] = [None] * len(messages)
+        groups: dict[str, list[int]] = {}
+        for index, (event, _) in enumerate(messages):
+            if event in self.events:
+                groups.setdefault(event, []).append(index)
+            else:
+                errors[index] = ValueError(f"Event {event} has no handlers")
+
+        loop = asyncio.get_running_loop()
+        tasks: list[tuple[int, asyncio.Task[None]]] = []
+        for event, indexes in groups.items():
+            model, stats = self.events[event].model, self.stats[event]
+            for index in indexes:
+                start = perf_counter()
+                try:
+                    content = self._validate(model, messages[index][1])
+                except ValueError as exception:
+                    errors[index] = exception
+                    stats.record(perf_counter() - start, failed=True)
+                    continue
+                # NOTE: Eager tasks run right away until they first wait, so handlers that don't wait skip the loop
+                task = asyncio.Task(self._handle_timed(event, content, start), loop=loop, eager_start=True)
+                tasks.append((index, task))
+
+        outcomes = await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for (index, _), outcome in zip(tasks, outcomes, strict=True):
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+            errors[index] = outcome
+
+        return errors
+
+    def _validate(self, model: type[EventModel], content: EventContent) -> EventModel:
+        """Validate the content of an event with the type adapter of its model."""
+        if isinstance(content, model):
+            return content
+        if isinstance(content, bytes | str):
+            return self.adapters[model].validate_json(content)
+        return self.adapters[model].validate_python(content)
+
+    async def _handle_timed(self, event: str, content: EventModel, start: float) -> None:
+        """Call the handlers of an event and record the processing time since the given start."""
+        try:
+            await self._handle(event, content)
+        except Exception:
+            self.stats[event].record(perf_counter() - start, failed=True)
+            logger.exception(f"Failed to handle event {event}")
+            raise
+        self.stats[event].record(perf_counter() - start)
+
+    async def _handle(self, event: str, content: EventModel) -> None:
+        """Call every handler of an event with its content."""
+        handlers = self.handlers[event]
+        if len(handlers) == 1:
+            await self._call(*handlers[0], content)
+            return
+        await asyncio.gather(*(self._call(handler, is_async, content) for handler, is_async in handlers))
+
+    @staticmethod
+    async def _call(handler: EventHandler, is_async: bool, content: EventModel) -> None:  # noqa: FBT001
+        """Call a handler, in a worker thread if it's synchronous."""
+        if is_async:
+            await handler(content)  # type: ignore[misc]
+        else:
+            await asyncio.to_thread(handler, content)
@@ -1,8 +1,12 @@
 from logging import getLogger
+from threading import Lock
 from typing import Any
 
 from cachetools import TTLCache
 
+from cumplo_common.utils.constants import INVALID_KEYS_CACHE_MAXSIZE, INVALID_KEYS_CACHE_TTL
+from cumplo_common.utils.text import hash_key
+
 logger = getLogger(__name__)
 
 
@@ -15,3 +19,58 @@ class Cache(TTLCache):
             if any(set(argument) <= set(key) for argument in kwargs.items()):
                 logger.debug(f"Removing cache for {key=}")
                 self.pop(key, None)  # noqa: B909
+
+
+class NegativeCache:
+    """
+    A bounded TTL cache of keys known to be invalid, such as API keys that don't belong to any user.
+
+    Only the keyed hash of each key is stored, so the keys themselves never stay in memory. Lookups of a key whose
+    hash is already known can skip hashing it again. It's safe to use from multiple threads.
+    """
+
+    def __init__(self, maxsize: int = INVALID_KEYS_CACHE_MAXSIZE, ttl: float = INVALID_KEYS_CACHE_TTL) -> None:
+        self.cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash(key: str) -> str:
+        """Hash a key to store it, the same way it's stored in the database."""
+        return hash_key(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        return self.contains_hash(self.hash(key))
+
+    def contains_hash(self, digest: str) -> bool:
+        """Check whether the key with the given hash is known to be invalid."""
+        with self.lock:
+            if digest in self.cache:
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.cache)
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """The number of lookups of invalid and unknown keys."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def add(self, key: str, digest: str | None = None) -> None:
+        """Remember a key as invalid until it expires. Its hash may be given when it's already known."""
+        digest = digest or self.hash(key)
+        with self.lock:
+            self.cache[digest] = True
+
+    def discard(self, key: str, digest: str | None = None) -> None:
+        """Forget a key that may have become valid. Its hash may be given when it's already known."""
+        digest = digest or self.hash(key)
+        with self.lock:
+            self.cache.pop(digest, None)
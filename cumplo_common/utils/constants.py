@@ -17,6 +17,7 @@ KEYS_COLLECTION: str = os.getenv("KEYS_COLLECTION", "keys")
 USERS_COLLECTION: str = os.getenv("USERS_COLLECTION", "users")
 EMAILS_COLLECTION: str = os.getenv("EMAILS_COLLECTION", "emails")
 DISABLED_COLLECTION: str = os.getenv("DISABLED_COLLECTION", "disabled")
+CURSORS_COLLECTION: str = os.getenv("CURSORS_COLLECTION", "cursors")
 # Cumplo
 CUMPLO_BASE_URL: str = os.getenv("CUMPLO_BASE_URL", "")
 SIMULATION_AMOUNT = int(os.getenv("SIMULATION_AMOUNT", "1000000"))
@@ -33,13 +34,52 @@ PHONE_NUMBER_REGEX = r"^\+[1-9]\d{1,14}$"
 # Cache
 CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "1000"))
 USERS_CACHE_TTL = int(os.getenv("USERS_CACHE_TTL", "600"))
+INVALID_KEYS_CACHE_TTL = int(os.getenv("INVALID_KEYS_CACHE_TTL", "30"))
+INVALID_KEYS_CACHE_MAXSIZE = int(os.getenv("INVALID_KEYS_CACHE_MAXSIZE", "10000"))
+KEY_VERSIONS_CACHE_TTL = int(os.getenv("KEY_VERSIONS_CACHE_TTL", "30"))
+KEY_VERSIONS_CACHE_MAXSIZE = int(os.getenv("KEY_VERSIONS_CACHE_MAXSIZE", "10000"))
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))
+
+# Pub/Sub
+PUBSUB_BATCH_SIZE = int(os.getenv("PUBSUB_BATCH_SIZE", "100"))
+PUBSUB_CONCURRENCY = int(os.getenv("PUBSUB_CONCURRENCY", "10"))
+PUBSUB_BACKOFF = float(os.getenv("PUBSUB_BACKOFF", "1"))
+PUBSUB_BACKOFF_CAP = float(os.getenv("PUBSUB_BACKOFF_CAP", "60"))
+
+# Notifications
+NOTIFICATIONS_TIMEOUT = float(os.getenv("NOTIFICATIONS_TIMEOUT", "10"))
+NOTIFICATIONS_HOST_CONCURRENCY = int(os.getenv("NOTIFICATIONS_HOST_CONCURRENCY", "10"))
+NOTIFICATIONS_HOST_RATE = float(os.getenv("NOTIFICATIONS_HOST_RATE", "20"))
+NOTIFICATIONS_RETRIES = int(os.getenv("NOTIFICATIONS_RETRIES", "3"))
+NOTIFICATIONS_BACKOFF = float(os.getenv("NOTIFICATIONS_BACKOFF", "0.5"))
+NOTIFICATIONS_BACKOFF_CAP = float(os.getenv("NOTIFICATIONS_BACKOFF_CAP", "10"))
+
+# Rate limiting
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "5"))
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "20"))
+RATE_LIMIT_MAXSIZE = int(os.getenv("RATE_LIMIT_MAXSIZE", "10000"))
+RATE_LIMIT_PREFIX: str = os.getenv("RATE_LIMIT_PREFIX", "rate_limit:")
 
 # Encryption
 PASSWORDS_ENCRYPTION_KEY: str = os.getenv("PASSWORDS_ENCRYPTION_KEY", "")
 
+# API keys
+API_KEYS_PEPPER: str = os.getenv("API_KEYS_PEPPER", "")
+API_KEYS_LEGACY_LOOKUP = os.getenv("API_KEYS_LEGACY_LOOKUP", "true").lower() == "true"
+KEYS_MIGRATION_BATCH_SIZE = int(os.getenv("KEYS_MIGRATION_BATCH_SIZE", "200"))
+
+# API tokens
+API_TOKENS_SECRET: str = os.getenv("API_TOKENS_SECRET", "")
+API_TOKENS_VERSION = int(os.getenv("API_TOKENS_VERSION", "1"))
+API_TOKENS_TTL = int(os.getenv("API_TOKENS_TTL", "3600"))
+
 # Gmail
 GMAIL_CREDENTIALS: dict[str, str] = json.loads(os.getenv("GMAIL_CREDENTIALS", "{}"))
 GMAIL_FROM_EMAIL: str = os.getenv("GMAIL_FROM_EMAIL", "")
 GMAIL_USER_ID: str = os.getenv("GMAIL_USER_ID", "me")
 GMAIL_LABEL: str = os.getenv("GMAIL_LABEL", "")
 GMAIL_TOPIC: str = os.getenv("GMAIL_TOPIC", "")
+GMAIL_CURSOR: str = os.getenv("GMAIL_CURSOR", "gmail_history")
+GMAIL_HISTORY_CACHE_TTL = int(os.getenv("GMAIL_HISTORY_CACHE_TTL", "3600"))
+GMAIL_BATCH_SIZE = int(os.getenv("GMAIL_BATCH_SIZE", "50"))
+GMAIL_UPLOAD_THRESHOLD = int(os.getenv("GMAIL_UPLOAD_THRESHOLD", str(5 * 1024 * 1024)))
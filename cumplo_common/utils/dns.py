@@ -0,0 +1,111 @@
+import asyncio
+import ipaddress
+import socket
+from collections.abc import Awaitable, Callable
+from logging import getLogger
+from urllib.parse import urlsplit
+
+from cachetools import TTLCache
+
+from cumplo_common.utils.constants import CACHE_MAXSIZE, DNS_CACHE_TTL
+
+logger = getLogger(__name__)
+
+Lookup = Callable[[str], Awaitable[list[str]]]
+
+
+class PrivateAddressError(ValueError):
+    """Raised when a host resolves to a private network address."""
+
+
+async def lookup(host: str) -> list[str]:
+    """
+    Resolve the addresses of a host with the resolver of the system, without blocking the event loop.
+
+    Args:
+        host (str): The hostname
+
+    Returns:
+        list[str]: The IPv4 and IPv6 addresses of the host
+
+    """
+    loop = asyncio.get_running_loop()
+    addresses = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(str(address[4][0]).split("%", 1)[0] for address in addresses))
+
+
+class HostResolver:
+    """
+    Checks that hosts don't resolve to private network addresses.
+
+    Resolved addresses are cached for a while, and concurrent checks of the same host share a single lookup.
+    """
+
+    def __init__(self, lookup: Lookup = lookup, ttl: float = DNS_CACHE_TTL, maxsize: int = CACHE_MAXSIZE) -> None:
+        self.lookup = lookup
+        self.cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.pending: dict[str, asyncio.Future[list[str]]] = {}
+
+    async def resolve(self, host: str) -> list[str]:
+        """
+        Get the addresses of a host, from the cache if they were resolved recently.
+
+        Args:
+            host (str): The hostname or IP address
+
+        Returns:
+            list[str]: The addresses of the host
+
+        """
+        if (addresses := self.cache.get(host)) is not None:
+            return addresses
+
+        if (pending := self.pending.get(host)) is not None:
+            return await asyncio.shield(pending)
+
+        future = self.pending[host] = asyncio.ensure_future(self.lookup(host))
+        try:
+            addresses = self.cache[host] = await asyncio.shield(future)
+        finally:
+            self.pending.pop(host, None)
+        return addresses
+
+    async def check_host(self, host: str) -> None:
+        """
+        Check that none of the addresses of a host is private. Errors resolving the host are propagated.
+
+        Args:
+            host (str): The hostname or IP address
+
+        Raises:
+            PrivateAddressError: When the host resolves to a private address
+
+        """
+        try:
+            addresses = [str(ipaddress.ip_address(host))]
+        except ValueError:
+            addresses = await self.resolve(host)
+
+        for address in addresses:
+            if ipaddress.ip_address(address).is_private:
+                logger.warning(f"Host {host} resolves to the private address {address}")
+                raise PrivateAddressError(f"Host {host} resolves to a private address")
+
+    async def check_url(self, url: str) -> None:
+        """
+        Check that the host of a URL doesn't resolve to private addresses, see `check_host`.
+
+        Args:
+            url (str): The URL to check
+
+        Raises:
+            ValueError: When the URL doesn't have a host
+
+        """
+        if not (host := urlsplit(url).hostname):
+            raise ValueError(f"URL {url} doesn't have a host")
+        await self.check_host(host)
+
+
+# NOTE: Shared by default so every dispatcher benefits from the same cache
+HOST_RESOLVER = HostResolver()
@@ -0,0 +1,197 @@
+import asyncio
+import math
+from dataclasses import dataclass
+from logging import getLogger
+from time import monotonic
+from typing import Any, Protocol
+
+from cachetools import LRUCache
+
+from cumplo_common.utils.constants import RATE_LIMIT_CAPACITY, RATE_LIMIT_MAXSIZE, RATE_LIMIT_PREFIX, RATE_LIMIT_RATE
+
+logger = getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    The bucket holds up to `capacity` tokens, which allows bursts of that many requests, and is refilled with `rate`
+    tokens per second.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated_at = monotonic()
+
+    def consume(self, tokens: float = 1, now: float | None = None) -> float:
+        """
+        Take tokens from the bucket if there are enough of them.
+
+        Args:
+            tokens (float, optional): The tokens to take. Defaults to 1.
+            now (float | None, optional): The current monotonic time. Defaults to the clock.
+
+        Returns:
+            float: Zero if the tokens were taken, otherwise the seconds until there would be enough of them
+
+        """
+        now = monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until the tokens can be taken from the bucket and take them."""
+        while wait := self.consume(tokens):  # noqa: ASYNC110
+            await asyncio.sleep(wait)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    """The outcome of checking the rate limit of a key."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """The rate limit headers of the response."""
+        headers = {"X-RateLimit-Limit": str(self.limit), "X-RateLimit-Remaining": str(self.remaining)}
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+class RateLimitStore(Protocol):
+    """Keeps the token bucket of each key."""
+
+    async def consume(self, key: str, rate: float, capacity: float, tokens: float = 1) -> tuple[float, float]:
+        """Take tokens from the bucket of a key and return its remaining tokens and the seconds to wait, if any."""
+        ...
+
+
+class MemoryRateLimitStore:
+    """Token buckets kept in the process, evicting the least recently used keys."""
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAXSIZE) -> None:
+        self.buckets: LRUCache = LRUCache(maxsize=maxsize)
+
+    async def consume(self, key: str, rate: float, capacity: float, tokens: float = 1) -> tuple[float, float]:
+        """Take tokens from the bucket of a key, see `RateLimitStore.consume`."""
+        if (bucket := self.buckets.get(key)) is None:
+            bucket = self.buckets[key] = TokenBucket(rate, capacity)
+        wait = bucket.consume(tokens)
+        return bucket.tokens, wait
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets shared through Redis, so every instance of a service enforces the same limits.
+
+    Each bucket is a hash updated atomically by a Lua script with the clock of the Redis server, and it expires once
+    it would be full again. Any client with the `eval` coroutine of `redis.asyncio.Redis` can be used.
+    """
+
+    SCRIPT = """
+        local rate = tonumber(ARGV[1])
+        local capacity = tonumber(ARGV[2])
+        local requested = tonumber(ARGV[3])
+        local time = redis.call("TIME")
+        local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+        local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated_at = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+        local wait = 0
+        if tokens >= requested then
+            tokens = tokens - requested
+        else
+            wait = (requested - tokens) / rate
+        end
+
+        redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+        redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+        return {tostring(tokens), tostring(wait)}
+    """
+
+    def __init__(self, client: Any, prefix: str = RATE_LIMIT_PREFIX) -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def consume(self, key: str, rate: float, capacity: float, tokens: float = 1) -> tuple[float, float]:
+        """Take tokens from the bucket of a key, see `RateLimitStore.consume`."""
+        remaining, wait = await self.client.eval(self.SCRIPT, 1, f"{self.prefix}{key}", rate, capacity, tokens)
+        return float(remaining), float(wait)
+
+
+class RateLimiter:
+    """
+    Token bucket rate limits per key, such as the ID of a user.
+
+    Every key can make bursts of up to `capacity` requests, refilled at `rate` requests per second. If the store
+    fails the requests are allowed, so an outage of a shared store doesn't take the services down with it.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RATE,
+        capacity: float = RATE_LIMIT_CAPACITY,
+        store: RateLimitStore | None = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.store = store or MemoryRateLimitStore()
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """The number of allowed and limited requests, and of failed checks."""
+        return {"allowed": self.allowed, "limited": self.limited, "errors": self.errors}
+
+    async def check(self, key: str, tokens: float = 1) -> RateLimitResult:
+        """
+        Take tokens from the bucket of a key.
+
+        Args:
+            key (str): The key being limited
+            tokens (float, optional): The cost of the request. Defaults to 1.
+
+        Returns:
+            RateLimitResult: Whether the request is allowed, and the state of the limit
+
+        """
+        limit = int(self.capacity)
+        try:
+            remaining, wait = await self.store.consume(key, self.rate, self.capacity, tokens)
+        except Exception:
+            logger.exception(f"Couldn't check the rate limit of {key}")
+            self.errors += 1
+            return RateLimitResult(allowed=True, limit=limit, remaining=limit)
+
+        if wait:
+            self.limited += 1
+            return RateLimitResult(allowed=False, limit=limit, remaining=int(remaining), retry_after=wait)
+
+        self.allowed += 1
+        return RateLimitResult(allowed=True, limit=limit, remaining=int(remaining))
@@ -0,0 +1,207 @@
+import math
+from collections.abc import Generator, Iterable, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, localcontext
+from itertools import starmap
+
+DAYS_PER_YEAR = 365
+MONTHS_PER_YEAR = 12
+RATE_DIGITS = 4
+
+# NOTE: Enough digits for the exact path to be correctly rounded to RATE_DIGITS
+EXACT_PRECISION = 28
+
+XIRR_GUESS = 0.1
+XIRR_TOLERANCE = 1e-10
+XIRR_ITERATIONS = 50
+XIRR_BOUNDS = (-0.9999, 100.0)
+
+_exact_rates: ContextVar[bool] = ContextVar("exact_rates", default=False)
+
+
+@contextmanager
+def exact_rates(*, enabled: bool = True) -> Generator[None, None, None]:
+    """
+    Select the exact Decimal path for the rate computations made within the context.
+
+    The float path is used by default. Its result differs from the exact one by at most one unit
+    in the last rounded digit, which only happens when the exact value lies right at a rounding boundary.
+
+    Args:
+        enabled (bool, optional): Whether to use the exact path. Defaults to True.
+
+    """
+    token = _exact_rates.set(enabled)
+    try:
+        yield
+    finally:
+        _exact_rates.reset(token)
+
+
+def round_rate(value: float, digits: int = RATE_DIGITS) -> Decimal:
+    """
+    Round a float into a Decimal with a fixed number of decimal places.
+
+    Equivalent to `round(Decimal(value), digits)`, as both round the exact binary value of the float half to even,
+    but formatting the float skips building its full decimal expansion.
+
+    Args:
+        value (float): The value to round
+        digits (int, optional): The number of decimal places. Defaults to RATE_DIGITS.
+
+    Returns:
+        Decimal: The rounded value
+
+    """
+    return Decimal(f"{value:.{digits}f}")
+
+
+def compound_rate(irr: Decimal, periods: int, periods_per_year: int) -> Decimal:
+    """
+    Compound an annual IRR over a number of periods: (1 + irr / 100) ** (periods / periods_per_year) - 1.
+
+    Args:
+        irr (Decimal): The annual internal rate of return, as a percentage
+        periods (int): The number of periods to compound
+        periods_per_year (int): The number of periods in a year
+
+    Returns:
+        Decimal: The compounded rate rounded to RATE_DIGITS decimal places
+
+    """
+    if _exact_rates.get():
+        return _exact_compound_rate(irr, periods, periods_per_year)
+    return round_rate(math.pow(1 + float(irr) / 100, periods / periods_per_year) - 1)
+
+
+def compound_rates(irrs: Iterable[Decimal], periods: Iterable[int], periods_per_year: int) -> list[Decimal]:
+    """
+    Compound many annual IRRs at once. Equivalent to calling `compound_rate` for each pair.
+
+    Args:
+        irrs (Iterable[Decimal]): The annual internal rates of return, as percentages
+        periods (Iterable[int]): The number of periods to compound for each IRR
+        periods_per_year (int): The number of periods in a year
+
+    Returns:
+        list[Decimal]: The compounded rates rounded to RATE_DIGITS decimal places
+
+    """
+    pairs = zip(irrs, periods, strict=True)
+    if _exact_rates.get():
+        return [_exact_compound_rate(irr, period, periods_per_year) for irr, period in pairs]
+
+    return [round_rate(math.pow(1 + float(irr) / 100, period / periods_per_year) - 1) for irr, period in pairs]
+
+
+def _exact_compound_rate(irr: Decimal, periods: int, periods_per_year: int) -> Decimal:
+    """Compound an annual IRR using Decimal arithmetic only, including the exponent."""
+    with localcontext(prec=EXACT_PRECISION):
+        value = (1 + irr / 100) ** (Decimal(periods) / periods_per_year) - 1
+    return round(value, RATE_DIGITS)
+
+
+def xirr(amounts: Sequence[float], days: Sequence[float], *, guess: float | None = None) -> Decimal | None:
+    """
+    Compute the annual rate that makes the present value of some dated cash flows zero.
+
+    Newton's method is used, falling back to bisection when it doesn't converge within the bounds.
+
+    Args:
+        amounts (Sequence[float]): The cash flows, negative for payments and positive for receipts
+        days (Sequence[float]): The days elapsed from the start until each cash flow
+        guess (float | None, optional): The starting rate of Newton's method. Defaults to the rate that compounds
+            the payments into the receipts over their average time.
+
+    Returns:
+        Decimal | None: The annual rate as a fraction rounded to RATE_DIGITS decimal places, or None if there's none
+
+    """
+    years = [day / DAYS_PER_YEAR for day in days]
+    rate = _newton_xirr(amounts, years, _guess_xirr(amounts, years) if guess is None else guess)
+    if rate is None:
+        rate = _bisect_xirr(amounts, years)
+    return None if rate is None else round_rate(rate)
+
+
+def xirrs(schedules: Iterable[tuple[Sequence[float], Sequence[float]]]) -> list[Decimal | None]:
+    """
+    Compute the XIRR of many cash flow schedules. Equivalent to calling `xirr` for each one.
+
+    Args:
+        schedules (Iterable[tuple[Sequence[float], Sequence[float]]]): The amounts and days of each schedule
+
+    Returns:
+        list[Decimal | None]: The annual rate of each schedule
+
+    """
+    return list(starmap(xirr, schedules))
+
+
+def _guess_xirr(amounts: Sequence[float], years: Sequence[float]) -> float:
+    """Estimate the XIRR by compounding the payments into the receipts over the average time between them."""
+    paid = received = paid_time = received_time = 0.0
+    for amount, year in zip(amounts, years, strict=True):
+        if amount < 0:
+            paid -= amount
+            paid_time -= amount * year
+        else:
+            received += amount
+            received_time += amount * year
+
+    if not paid or not received or (elapsed := received_time / received - paid_time / paid) <= 0:
+        return XIRR_GUESS
+
+    # NOTE: Rates beyond the bounds would overflow, so the default guess is used instead
+    if (exponent := math.log(received / paid) / elapsed) >= math.log1p(XIRR_BOUNDS[1]):
+        return XIRR_GUESS
+    return math.expm1(exponent)
+
+
+def _net_present_value(amounts: Sequence[float], years: Sequence[float], rate: float) -> float:
+    """Compute the present value of some cash flows at an annual rate."""
+    base = 1 + rate
+    return sum(amount / base**year for amount, year in zip(amounts, years, strict=True))
+
+
+def _newton_xirr(amounts: Sequence[float], years: Sequence[float], rate: float) -> float | None:
+    """Find the XIRR with Newton's method, or None if it doesn't converge within the bounds."""
+    lower, upper = XIRR_BOUNDS
+    for _ in range(XIRR_ITERATIONS):
+        base = 1 + rate
+        value = derivative = 0.0
+        for amount, year in zip(amounts, years, strict=True):
+            discounted = amount / base**year
+            value += discounted
+            derivative -= year * discounted / base
+
+        if not derivative:
+            return None
+
+        step = value / derivative
+        rate -= step
+        if not lower < rate < upper:
+            return None
+        if abs(step) < XIRR_TOLERANCE:
+            return rate
+
+    return None
+
+
+def _bisect_xirr(amounts: Sequence[float], years: Sequence[float]) -> float | None:
+    """Find the XIRR by bisection within the bounds, or None if the present value doesn't change its sign."""
+    lower, upper = XIRR_BOUNDS
+    lower_value = _net_present_value(amounts, years, lower)
+    if lower_value * _net_present_value(amounts, years, upper) > 0:
+        return None
+
+    while upper - lower > XIRR_TOLERANCE:
+        middle = (lower + upper) / 2
+        middle_value = _net_present_value(amounts, years, middle)
+        if lower_value * middle_value <= 0:
+            upper = middle
+        else:
+            lower, lower_value = middle, middle_value
+
+    return (lower + upper) / 2
@@ -1,7 +1,12 @@
 import string
 import unicodedata
+from hashlib import blake2b
+
+from cumplo_common.utils.constants import API_KEYS_PEPPER
 
 SEPARATORS = ["_", "-"]
+# NOTE: The longest key BLAKE2b accepts
+PEPPER_MAX_LENGTH = 64
 
 
 def clean_text(error: str) -> str:
@@ -42,3 +47,39 @@ def secure_key(key: str) -> str:
 
     """
     return f"{key[:5]}{'*' * (len(key) - 15)}{key[-10:]}"
+
+
+def validate_pepper(pepper: str) -> str:
+    """
+    Check that a pepper can be the secret key of the hash of API keys.
+
+    Args:
+        pepper (str): The pepper to be checked
+
+    Raises:
+        ValueError: When the pepper is empty or longer than 64 bytes
+
+    Returns:
+        str: The pepper
+
+    """
+    if not pepper:
+        raise ValueError("API_KEYS_PEPPER must be set to hash API keys")
+    if len(pepper.encode()) > PEPPER_MAX_LENGTH:
+        raise ValueError(f"API_KEYS_PEPPER can't be longer than {PEPPER_MAX_LENGTH} bytes")
+    return pepper
+
+
+def hash_key(key: str, pepper: str = API_KEYS_PEPPER) -> str:
+    """
+    Hash a key with keyed BLAKE2b, so it can be stored, cached and logged without exposing it.
+
+    Args:
+        key (str): The key to be hashed
+        pepper (str, optional): The secret key of the hash, of up to 64 bytes. Defaults to API_KEYS_PEPPER.
+
+    Returns:
+        str: The hexadecimal digest of the key
+
+    """
+    return blake2b(key.encode(), key=pepper.encode(), digest_size=32).hexdigest()
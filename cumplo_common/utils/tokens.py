@@ -0,0 +1,143 @@
+import hashlib
+import hmac
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from dataclasses import dataclass
+from time import time
+from typing import TYPE_CHECKING
+
+import ulid
+
+from cumplo_common.utils.constants import API_TOKENS_SECRET, API_TOKENS_TTL, API_TOKENS_VERSION
+
+if TYPE_CHECKING:
+    from cumplo_common.models.user import User
+
+TOKEN_PREFIX = "cpt."  # noqa: S105
+
+
+class InvalidTokenError(ValueError):
+    """Raised when a token is malformed, wrongly signed or expired."""
+
+
+class StaleTokenError(InvalidTokenError):
+    """Raised when a valid token was issued by another version of the signer, so its user must be looked up again."""
+
+    def __init__(self, message: str, claims: "TokenClaims") -> None:
+        super().__init__(message)
+        self.claims = claims
+
+
+@dataclass(frozen=True, slots=True)
+class TokenClaims:
+    """The identity carried by a token, which can stand in for the user it was issued to."""
+
+    id: ulid.ULID
+    is_admin: bool
+    key_version: int
+    expires_at: int
+    version: int
+
+
+def is_token(value: str) -> bool:
+    """Check whether a credential is a token instead of an API key."""
+    return value.startswith(TOKEN_PREFIX)
+
+
+def _encode(data: bytes) -> str:
+    """Encode bytes as unpadded URL safe base64."""
+    return urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode(data: str) -> bytes:
+    """Decode unpadded URL safe base64."""
+    return urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenSigner:
+    """
+    Issues and verifies self-contained API tokens signed with HMAC-SHA256.
+
+    A token carries the ID of its user, whether it's an admin, the version of its keys, its expiration and the
+    version of the signer that issued it, so it can be verified without reading the database. Tokens of another
+    version are still well signed, but they raise `StaleTokenError` so their users are looked up again.
+
+    Revoking tokens is up to the user's key version, which is stored along with the user and must be compared with
+    the claims of the token, see `UserCollection.revoke`.
+    """
+
+    def __init__(
+        self, secret: str = API_TOKENS_SECRET, version: int = API_TOKENS_VERSION, ttl: int = API_TOKENS_TTL
+    ) -> None:
+        self.secret = secret.encode()
+        self.version = version
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        """Whether tokens can be issued and verified, which requires a secret."""
+        return bool(self.secret)
+
+    def issue(self, user: "User", now: float | None = None) -> str:
+        """
+        Issue a token for a user.
+
+        Args:
+            user (User): The user the token is issued to
+            now (float | None, optional): The current UNIX time. Defaults to the time of the system.
+
+        Raises:
+            ValueError: When there is no secret to sign the token with
+
+        Returns:
+            str: The signed token
+
+        """
+        if not self.enabled:
+            raise ValueError("Can't issue tokens without a secret")
+
+        expires_at = int((time() if now is None else now) + self.ttl)
+        payload = _encode(f"{user.id}|{int(user.is_admin)}|{user.key_version}|{expires_at}|{self.version}".encode())
+        return f"{TOKEN_PREFIX}{payload}.{self._sign(payload)}"
+
+    def verify(self, token: str, now: float | None = None) -> TokenClaims:
+        """
+        Verify a token and get its claims.
+
+        Args:
+            token (str): The token to verify
+            now (float | None, optional): The current UNIX time. Defaults to the time of the system.
+
+        Raises:
+            InvalidTokenError: When the token is malformed, its signature doesn't match or it has expired
+            StaleTokenError: When the token was issued by another version
+
+        Returns:
+            TokenClaims: The claims of the token
+
+        """
+        if not self.enabled or not is_token(token):
+            raise InvalidTokenError("Not a token")
+
+        payload, _, signature = token.removeprefix(TOKEN_PREFIX).partition(".")
+        if not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            raise InvalidTokenError("Invalid token signature")
+
+        try:
+            id_user, is_admin, key_version, expires_at, version = _decode(payload).decode().split("|")
+            claims = TokenClaims(ulid.parse(id_user), is_admin == "1", int(key_version), int(expires_at), int(version))
+        except (BinasciiError, UnicodeDecodeError, ValueError) as exception:
+            raise InvalidTokenError("Malformed token") from exception
+
+        if claims.expires_at <= (time() if now is None else now):
+            raise InvalidTokenError(f"Token of user {id_user} has expired")
+        if claims.version != self.version:
+            raise StaleTokenError(f"Token of user {id_user} has version {claims.version}", claims)
+        return claims
+
+    def _sign(self, payload: str) -> str:
+        """Compute the signature of an encoded payload."""
+        return _encode(hmac.digest(self.secret, payload.encode(), hashlib.sha256))
+
+
+TOKEN_SIGNER = TokenSigner()
@@ -0,0 +1,61 @@
+from collections.abc import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Endpoint = Callable[[Scope, bytes], None]
+
+
+async def call(  # noqa: PLR0913
+    app: ASGIApp,
+    body: bytes,
+    method: str = "POST",
+    content_type: str = "application/json",
+    *,
+    headers: dict[str, str] | None = None,
+    client: tuple[str, int] | None = None,
+) -> list[Message]:
+    """
+    Send a single HTTP request to an ASGI application without a server.
+
+    Returns:
+        list[Message]: The messages sent back by the application
+
+    """
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+            *((name.lower().encode(), value.encode()) for name, value in (headers or {}).items()),
+        ],
+        "client": client,
+    }
+    received, sent = False, []
+
+    async def receive() -> Message:  # noqa: RUF029
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:  # noqa: RUF029
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def endpoint(callback: Endpoint) -> ASGIApp:
+    """Build an ASGI application that reads the body and hands it to a callback along with the scope."""
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        message = await receive()
+        callback(scope, message["body"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
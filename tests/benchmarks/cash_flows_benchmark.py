@@ -0,0 +1,31 @@
+from cumplo_common.models import FundingRequest, Simulation
+from cumplo_common.utils.rates import XIRR_GUESS, xirr, xirrs
+from tests.benchmarks.utils import measure
+from tests.factories import START, build_funding_requests
+
+# NOTE: Roughly the amount of funding requests scraped in a day
+DAILY_FUNDING_REQUESTS = 5000
+
+
+def main() -> None:
+    """Measure ranking a day's worth of funding requests by the XIRR of their simulations."""
+    funding_requests = [
+        FundingRequest.model_validate(payload) for payload in build_funding_requests(DAILY_FUNDING_REQUESTS)
+    ]
+    simulations = [funding_request.simulation for funding_request in funding_requests]
+    schedules = [simulation.cash_flows(START) for simulation in simulations]
+
+    def rank() -> list[FundingRequest]:
+        rates = Simulation.xirrs(simulations, START)
+        ranking = sorted(zip(rates, funding_requests, strict=True), key=lambda pair: pair[0] or 0, reverse=True)
+        return [funding_request for _, funding_request in ranking]
+
+    print(f"XIRR: time for {DAILY_FUNDING_REQUESTS} simulations")
+    measure("Cash flows", lambda: [simulation.cash_flows(START) for simulation in simulations], number=3)
+    measure("xirr from a fixed guess", lambda: [xirr(*schedule, guess=XIRR_GUESS) for schedule in schedules], number=3)
+    measure("xirrs from the estimated guesses", lambda: xirrs(schedules), number=3)
+    measure("Rank funding requests by Simulation.xirrs", rank, number=3)
+
+
+if __name__ == "__main__":
+    main()
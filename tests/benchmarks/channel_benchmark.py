@@ -0,0 +1,20 @@
+from cumplo_common.models.channel import WebhookConfiguration, _validate_webhook_url  # noqa: PLC2701
+from tests.benchmarks.utils import measure
+
+URL = "https://hooks.example.com/services/notifications?token=secret"
+
+
+def main() -> None:
+    """Compare validating a webhook URL from scratch against the cached validation."""
+    channel = {"id": "01J00000000000000000000000", "url": URL, "enabled_events": ["all"]}
+
+    print("URL: time to validate the URL of a webhook")
+    measure("Validate the URL", lambda: _validate_webhook_url.__wrapped__(URL), number=10000)
+    measure("Cached validation", lambda: _validate_webhook_url(URL), number=10000)
+
+    print("Channel: time to validate a webhook channel")
+    measure("WebhookConfiguration.model_validate", lambda: WebhookConfiguration.model_validate(channel), number=10000)
+
+
+if __name__ == "__main__":
+    main()
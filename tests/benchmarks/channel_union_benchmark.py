@@ -0,0 +1,40 @@
+import random
+
+from pydantic import Field
+
+from cumplo_common.models import User
+from cumplo_common.models.channel import ChannelConfigurationType
+from tests.benchmarks.utils import measure
+from tests.factories import build_user
+
+# NOTE: Users with many notification channels
+USERS = 100
+CHANNELS = 20
+
+
+class UntaggedUser(User):
+    """User whose channels are validated by trying every model of the union, kept as a baseline."""
+
+    channels: dict[str, ChannelConfigurationType] = Field(default_factory=dict)
+
+
+def main() -> None:
+    """Compare loading users whose channels are validated by the plain union against the tagged union."""
+    generator = random.Random(0)
+    users = [User.model_validate(build_user(generator, channels=CHANNELS)) for _ in range(USERS)]
+    payloads = [user.model_dump(mode="json") for user in users]
+    documents = [user.model_dump_json() for user in users]
+
+    print(f"Python: time to validate a user with {CHANNELS} channels")
+    measure("Untagged union", lambda: [UntaggedUser.model_validate(user) for user in payloads], 20, operations=USERS)
+    measure("Tagged union", lambda: [User.model_validate(user) for user in payloads], 20, operations=USERS)
+
+    print(f"JSON: time to deserialize a user with {CHANNELS} channels")
+    measure(
+        "Untagged union", lambda: [UntaggedUser.model_validate_json(user) for user in documents], 20, operations=USERS
+    )
+    measure("Tagged union", lambda: [User.model_validate_json(user) for user in documents], 20, operations=USERS)
+
+
+if __name__ == "__main__":
+    main()
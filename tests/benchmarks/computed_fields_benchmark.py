@@ -0,0 +1,78 @@
+import gc
+from decimal import Decimal
+from typing import Any
+from zlib import crc32
+
+from pydantic_core import from_json
+
+from cumplo_common.models import FundingRequest
+from cumplo_common.utils.constants import CUMPLO_BASE_URL, SIMULATION_AMOUNT
+from tests.benchmarks.utils import measure
+from tests.factories import build_funding_requests
+
+FUNDING_REQUESTS = 5000
+
+# NOTE: The computed fields of a funding request and how each of them would be restored from its dump
+RESTORERS: dict[str, Any] = {
+    "installments": int,
+    "profit_rate": Decimal,
+    "monthly_profit_rate": Decimal,
+    "is_completed": bool,
+    "url": str,
+    "upfront_fee": Decimal,
+    "exit_fee": Decimal,
+}
+
+
+def checksum(funding_request: FundingRequest) -> int:
+    """Checksum of the inputs of the computed fields of a funding request."""
+    simulation = funding_request.simulation
+    return crc32(
+        f"{funding_request.id}|{funding_request.irr}|{funding_request.duration.value}|"
+        f"{funding_request.raised_percentage}|{simulation.capital}|{simulation.upfront_fee}|{simulation.exit_fee}|"
+        f"{simulation.net_returns}|{len(simulation.installments)}|{SIMULATION_AMOUNT}|{CUMPLO_BASE_URL}".encode()
+    )
+
+
+def validate_trusted(data: str) -> FundingRequest:
+    """Validate a dump and restore its computed fields when the checksum of their inputs matches."""
+    payload = from_json(data)
+    funding_request = FundingRequest.model_validate(payload)
+    if payload["checksum"] == checksum(funding_request):
+        funding_request.__dict__.update({name: restore(payload[name]) for name, restore in RESTORERS.items()})
+    return funding_request
+
+
+def main() -> None:
+    """Measure whether trusting the serialized computed fields of funding requests beats recomputing them."""
+    models = [FundingRequest.model_validate(payload) for payload in build_funding_requests(FUNDING_REQUESTS)]
+    dumps = [model.model_dump_json() for model in models]
+    trusted_dumps = [f'{dump[:-1]},"checksum":{checksum(model)}}}' for model, dump in zip(models, dumps, strict=True)]
+    payloads = [from_json(dump) for dump in trusted_dumps]
+
+    def recompute() -> None:
+        for model in models:
+            for name in RESTORERS:
+                model.__dict__.pop(name, None)
+                getattr(model, name)
+
+    gc.disable()
+    kwargs = {"number": 1, "repeat": 9, "operations": FUNDING_REQUESTS}
+
+    print(f"Computed fields: time per funding request over {FUNDING_REQUESTS} requests")
+    measure("Recompute every computed field", recompute, **kwargs)
+    measure("Checksum of their inputs", lambda: [checksum(model) for model in models], **kwargs)
+    measure(
+        "Restore them from a parsed dump",
+        lambda: [{n: r(p[n]) for n, r in RESTORERS.items()} for p in payloads],
+        **kwargs,
+    )
+    measure("Parse a dump to read them", lambda: [from_json(dump) for dump in trusted_dumps], **kwargs)
+
+    print("Hop: time to validate a funding request and dump it again")
+    measure("Recomputing", lambda: [FundingRequest.model_validate_json(d).model_dump_json() for d in dumps], **kwargs)
+    measure("Trusting", lambda: [validate_trusted(dump).model_dump_json() for dump in trusted_dumps], **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import enum
+from typing import Any, Self
+
+from pydantic import TypeAdapter
+
+from cumplo_common.models import PrivateEvent
+from tests.benchmarks.utils import measure
+
+
+class LegacyStrEnum(enum.StrEnum):
+    """StrEnum that scans every member on each case insensitive lookup, kept as a baseline."""
+
+    @classmethod
+    def _missing_(cls, value: object) -> Self | None:
+        if isinstance(value, str):
+            for member in cls:
+                if member.casefold() == value.casefold():
+                    return member
+        return None
+
+    @classmethod
+    def has_member(cls, value: str) -> bool:
+        return any(value.casefold() == item.name.casefold() for item in cls)
+
+
+LegacyPrivateEvent: Any = LegacyStrEnum("LegacyPrivateEvent", {event.name: event.value for event in PrivateEvent})  # type: ignore[call-arg]
+
+
+def main() -> None:
+    """Compare scanning the members of an enum against the case insensitive lookup tables."""
+    value = PrivateEvent.FUNDING_REQUEST_FILTER.value.upper()
+
+    print(f"Lookup: time to find the last of {len(PrivateEvent)} events case insensitively")
+    measure("Scan the members", lambda: LegacyPrivateEvent(value), number=10000)
+    measure("Lookup table", lambda: PrivateEvent(value), number=10000)  # type: ignore[call-arg]
+
+    print("Membership: time to check a missing name")
+    measure("Scan the members", lambda: LegacyPrivateEvent.has_member("missing"), number=10000)
+    measure("Lookup table", lambda: PrivateEvent.has_member("missing"), number=10000)
+
+    values = [event.value.upper() for event in PrivateEvent]
+    print(f"Validation: time to validate {len(values)} uppercase events")
+    legacy = TypeAdapter(list[LegacyPrivateEvent])
+    tables = TypeAdapter(list[PrivateEvent])
+    measure("Scan the members", lambda: legacy.validate_python(values), number=10000)
+    measure("Lookup table", lambda: tables.validate_python(values), number=10000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import random
+from collections.abc import Callable
+
+from cumplo_common.models import EventDispatcher, Investment, PrivateEvent
+from cumplo_common.models.utils import EventModel
+from tests.benchmarks.utils import measure
+from tests.factories import build_investment
+
+# NOTE: A batch of pulled investment events
+MESSAGES = 1000
+EVENTS = [PrivateEvent.INVESTMENT_CONFIRMED, PrivateEvent.INVESTMENT_REPAID, PrivateEvent.INVESTMENT_DELINQUENT]
+
+
+async def handle(content: EventModel) -> None:  # noqa: RUF029
+    """Handle the content of an event without doing anything."""
+    assert content.id >= 0
+
+
+async def handle_io(content: EventModel) -> None:  # noqa: ARG001
+    """Handle the content of an event waiting for a millisecond, like a handler that writes to a database."""
+    await asyncio.sleep(0.001)
+
+
+async def dispatch_one_by_one(messages: list[tuple[str, bytes]], handler: Callable = handle) -> None:
+    """Look up the model of each event, validate its content and handle it, one message after another."""
+    for event, data in messages:
+        await handler(PrivateEvent(event).model.model_validate_json(data))  # type: ignore[call-arg]
+
+
+def main() -> None:
+    """Compare validating and handling each event on its own against the batched dispatch."""
+    generator = random.Random(0)
+    messages = [
+        (generator.choice(EVENTS).value, json.dumps(build_investment(id_, generator)).encode())
+        for id_ in range(MESSAGES)
+    ]
+    dispatcher = EventDispatcher()
+    for event in EVENTS:
+        dispatcher.register(event, handle)
+    assert isinstance(dispatcher.validate(*messages[0]), Investment)
+
+    async def dispatch() -> None:
+        for event, data in messages:
+            await dispatcher.dispatch(event, data)
+
+    print(f"Dispatch: time to validate and handle a batch of {MESSAGES} investment events")
+    measure("One by one", lambda: asyncio.run(dispatch_one_by_one(messages)), number=5, operations=MESSAGES)
+    measure("EventDispatcher.dispatch", lambda: asyncio.run(dispatch()), number=5, operations=MESSAGES)
+    measure(
+        "EventDispatcher.dispatch_many",
+        lambda: asyncio.run(dispatcher.dispatch_many(messages)),
+        number=5,
+        operations=MESSAGES,
+    )
+
+    batch = messages[:100]
+    io_dispatcher = EventDispatcher()
+    for event in EVENTS:
+        io_dispatcher.register(event, handle_io)
+
+    print(f"I/O: time to handle a batch of {len(batch)} events whose handlers wait for 1ms")
+    measure("One by one", lambda: asyncio.run(dispatch_one_by_one(batch, handle_io)), number=1, operations=len(batch))
+    measure(
+        "EventDispatcher.dispatch_many",
+        lambda: asyncio.run(io_dispatcher.dispatch_many(batch)),
+        number=1,
+        operations=len(batch),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from cumplo_common.models import FundingRequest, FundingRequestBatch
+from tests.benchmarks.utils import measure
+from tests.factories import build_funding_requests
+
+FUNDING_REQUESTS = 5000
+MINIMUM_IRR = 15
+
+
+def allocated(function: Callable[[], Any]) -> tuple[Any, int]:
+    """Call a function and return its result along with the bytes it left allocated."""
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main() -> None:
+    """Compare a batch against a list of models for memory usage, filtering and ranking."""
+    payloads = build_funding_requests(FUNDING_REQUESTS)
+
+    def build_models() -> list[FundingRequest]:
+        models = [FundingRequest.model_validate(payload) for payload in payloads]
+        for model in models:
+            _ = model.profit_rate, model.monthly_profit_rate
+        return models
+
+    models, models_size = allocated(build_models)
+    batch, batch_size = allocated(lambda: FundingRequestBatch.from_models(models))
+
+    print(f"FundingRequestBatch: {FUNDING_REQUESTS} funding requests")
+    print(f"{'Memory of the models':<60} {models_size / FUNDING_REQUESTS:>12.0f} B/request")
+    print(f"{'Memory of the batch':<60} {batch_size / FUNDING_REQUESTS:>12.0f} B/request")
+
+    def rank_models() -> list[int]:
+        selected = [model for model in models if model.irr >= MINIMUM_IRR]
+        return [model.id for model in sorted(selected, key=lambda model: model.profit_rate, reverse=True)[:100]]
+
+    def rank_batch() -> list[int]:
+        selected = batch.filter(irr >= MINIMUM_IRR for irr in batch.column("irr"))
+        return list(selected.sort("profit_rate", reverse=True)[:100].column("id"))
+
+    measure("Filter and rank the models", rank_models, number=20)
+    measure("Filter and rank the batch", rank_batch, number=20)
+
+
+if __name__ == "__main__":
+    main()
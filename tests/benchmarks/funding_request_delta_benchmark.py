@@ -0,0 +1,49 @@
+import json
+
+from cumplo_common.models import FundingRequest, FundingRequestDelta
+from tests.benchmarks.utils import measure
+from tests.factories import build_funding_requests
+
+# NOTE: Roughly the amount of funding requests re-scraped at once
+FUNDING_REQUESTS = 100
+
+
+def main() -> None:
+    """Compare revalidating whole re-scraped funding requests against applying their deltas."""
+    payloads = build_funding_requests(FUNDING_REQUESTS)
+    snapshots = [FundingRequest.model_validate(payload) for payload in payloads]
+    for snapshot in snapshots:
+        snapshot.model_dump_json()
+
+    updates = [
+        payload | {"raised_amount": payload["amount"], "raised_percentage": "1", "investors": payload["investors"] + 1}
+        for payload in payloads
+    ]
+    messages = [json.dumps(update).encode() for update in updates]
+    newer = [FundingRequest.model_validate(update) for update in updates]
+    deltas = [snapshot.diff(update) for snapshot, update in zip(snapshots, newer, strict=True)]
+    delta_messages = [delta.model_dump_json(exclude_none=True).encode() for delta in deltas if delta]
+    pairs = list(zip(snapshots, delta_messages, strict=True))
+
+    print(f"Message size: average bytes for {FUNDING_REQUESTS} funding requests")
+    print(f"{'Full payload':<60}{sum(map(len, messages)) / FUNDING_REQUESTS:>12.0f} B")
+    print(f"{'Delta':<60}{sum(map(len, delta_messages)) / FUNDING_REQUESTS:>12.0f} B")
+
+    print(f"Updates: time to receive, update and serialize {FUNDING_REQUESTS} funding requests")
+    measure(
+        "Validate full payload",
+        lambda: [FundingRequest.model_validate_json(message).model_dump_json() for message in messages],
+        number=20,
+    )
+    measure(
+        "Apply delta",
+        lambda: [
+            snapshot.apply(FundingRequestDelta.model_validate_json(message)).model_dump_json()
+            for snapshot, message in pairs
+        ],
+        number=20,
+    )
+
+
+if __name__ == "__main__":
+    main()
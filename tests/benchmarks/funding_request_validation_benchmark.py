@@ -0,0 +1,25 @@
+import json
+
+from cumplo_common.models import FundingRequest
+from tests.benchmarks.utils import measure
+from tests.factories import build_funding_requests
+
+FUNDING_REQUESTS = 10_000
+
+
+def main() -> None:
+    """Compare bulk validation from raw bytes against validating each parsed funding request."""
+    models = [FundingRequest.model_validate(payload) for payload in build_funding_requests(FUNDING_REQUESTS)]
+    data = json.dumps([model.json() for model in models]).encode()
+
+    def validate_each() -> list[FundingRequest]:
+        return [FundingRequest.model_validate(payload) for payload in json.loads(data)]
+
+    print(f"FundingRequest validation: time per request over {FUNDING_REQUESTS} requests")
+    kwargs = {"number": 1, "repeat": 3, "operations": FUNDING_REQUESTS}
+    measure("json.loads + model_validate", validate_each, **kwargs)
+    measure("validate_many", lambda: FundingRequest.validate_many(data), **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+from collections import defaultdict
+
+from cumplo_common.models import Investment, InvestmentAggregator, InvestmentDimension
+from tests.benchmarks.utils import measure
+from tests.factories import build_investment
+
+# NOTE: A large investment portfolio
+INVESTMENTS = 5000
+METRICS = ("amount", "paid_capital", "insolvent_capital", "interest", "upfront_fee", "exit_fee")
+
+
+def loop_summaries(investments: list[Investment]) -> dict[InvestmentDimension, dict]:
+    """Compute the totals of every group of every dimension by looping over the investments, kept as a baseline."""
+    summaries: dict[InvestmentDimension, dict] = {}
+    for dimension in InvestmentDimension:
+        groups: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for investment in investments:
+            totals = groups[str(getattr(investment, dimension.value))]
+            totals["count"] += 1
+            totals["delinquent"] += investment.days_delinquent > 0
+            for metric in METRICS:
+                totals[metric] += getattr(investment, metric)
+        summaries[dimension] = groups
+    return summaries
+
+
+def main() -> None:
+    """Compare recomputing the portfolio summaries from scratch against keeping them up to date."""
+    generator = random.Random(0)
+    investments = [Investment.model_validate(build_investment(id_, generator)) for id_ in range(INVESTMENTS)]
+    aggregator = InvestmentAggregator.from_investments(investments)
+    changed = investments[42].model_copy(update={"status": "PAID", "paid_capital": investments[42].amount})
+
+    def summarize() -> dict:
+        return {dimension: aggregator.summarize(dimension) for dimension in InvestmentDimension}
+
+    print(f"Summaries: time to summarize every dimension of {INVESTMENTS} investments")
+    measure("Loop over the investments", lambda: loop_summaries(investments), number=5)
+    measure("Build InvestmentAggregator", lambda: InvestmentAggregator.from_investments(investments), number=5)
+    measure("InvestmentAggregator.summarize", summarize, number=100)
+
+    print("Update: time to refresh the summaries after an investment event")
+    measure("Loop over the investments", lambda: loop_summaries(investments), number=5)
+
+    def update() -> dict:
+        aggregator.upsert(changed)
+        return summarize()
+
+    measure("InvestmentAggregator.upsert + summarize", update, number=100)
+
+
+if __name__ == "__main__":
+    main()
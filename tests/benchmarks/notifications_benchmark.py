@@ -0,0 +1,53 @@
+import asyncio
+import json
+from urllib.request import Request, urlopen
+
+import ulid
+
+from cumplo_common.integrations import DeliveryRequest, NotificationDispatcher
+from cumplo_common.models.channel import ChannelType, WebhookConfiguration
+from tests.benchmarks.utils import measure
+from tests.server import LocalServer
+
+# NOTE: The channels to notify of an event, answered by a server that takes a few milliseconds per request
+CHANNELS = 100
+DELAY = 0.01
+
+
+def main() -> None:
+    """Compare posting each notification sequentially against dispatching them concurrently."""
+    payload = {"id": 1, "event": "funding_request.promising"}
+    channels = [
+        WebhookConfiguration.model_validate({"id": ulid.from_int(id_), "url": f"https://example.com/{id_}"})
+        for id_ in range(CHANNELS)
+    ]
+
+    with LocalServer(delay=DELAY) as server:
+
+        def sequential() -> None:
+            for channel in channels:
+                request = Request(f"{server.url}/{channel.id}", data=json.dumps(payload).encode(), method="POST")  # noqa: S310
+                request.add_header("Content-Type", "application/json")
+                with urlopen(request) as response:  # noqa: S310
+                    response.read()
+
+        def build_request(channel: WebhookConfiguration, body: bytes) -> DeliveryRequest:
+            return DeliveryRequest(url=f"{server.url}/{channel.id}", body=body)
+
+        def dispatch() -> None:
+            async def run() -> None:
+                # NOTE: The local server has a private address, so hosts aren't checked
+                async with NotificationDispatcher(
+                    builders={ChannelType.WEBHOOK: build_request}, resolver=None, rate=None
+                ) as dispatcher:
+                    await dispatcher.dispatch((channel, payload) for channel in channels)
+
+            asyncio.run(run())
+
+        print(f"Dispatch: time to notify {CHANNELS} webhooks of a host that takes {DELAY * 1000:.0f}ms per request")
+        measure("Post each notification sequentially", sequential, number=1, repeat=3)
+        measure("NotificationDispatcher.dispatch", dispatch, number=1, repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import random
+
+from cumplo_common.models import Portfolio, PortfolioBatch, PortfolioCategory
+from cumplo_common.models.portfolio import PortfolioCategoryUnit
+from tests.benchmarks.utils import measure
+from tests.factories import build_portfolio
+
+# NOTE: Roughly the amount of borrowers and debtors of a day's worth of funding requests
+PORTFOLIOS = 10_000
+
+FILTERS = [
+    {"unit": PortfolioCategoryUnit.AMOUNT, "category": PortfolioCategory.OUTSTANDING},
+    {
+        "unit": PortfolioCategoryUnit.PERCENTAGE,
+        "category": PortfolioCategory.DELINQUENT,
+        "percentage_unit": PortfolioCategoryUnit.COUNT,
+    },
+    {
+        "unit": PortfolioCategoryUnit.PERCENTAGE,
+        "category": PortfolioCategory.PAID,
+        "percentage_unit": PortfolioCategoryUnit.AMOUNT,
+    },
+]
+
+
+def main() -> None:
+    """Compare evaluating portfolio filters on each portfolio against evaluating them on a batch."""
+    generator = random.Random(0)
+    payloads = [build_portfolio(generator) for _ in range(PORTFOLIOS)]
+    portfolios = [Portfolio.model_validate(payload) for payload in payloads]
+
+    def get_each() -> None:
+        # NOTE: Freshly validated portfolios, as the derived groups are cached after the first access
+        for portfolio in portfolios:
+            portfolio.__dict__.pop("total", None)
+            portfolio.__dict__.pop("outstanding", None)
+            portfolio.__dict__.pop("paid", None)
+            for arguments in FILTERS:
+                portfolio.get(**arguments)  # type: ignore[arg-type]
+
+    def get_batch() -> None:
+        batch = PortfolioBatch.from_portfolios(portfolios)
+        for arguments in FILTERS:
+            batch.get(**arguments)  # type: ignore[arg-type]
+
+    print(f"Portfolio filters: time per portfolio over {PORTFOLIOS} portfolios and {len(FILTERS)} filters")
+    kwargs = {"number": 1, "repeat": 5, "operations": PORTFOLIOS}
+    measure("Portfolio.get on each portfolio", get_each, **kwargs)
+    measure("PortfolioBatch.get", get_batch, **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import json
+import random
+from decimal import Decimal
+from functools import cached_property
+
+from pydantic import computed_field
+
+from cumplo_common.models import FundingRequest, Portfolio
+from cumplo_common.models.portfolio import PortfolioGroup
+from tests.benchmarks.utils import measure
+from tests.factories import build_funding_requests, build_portfolio
+
+FUNDING_REQUESTS = 2000
+PORTFOLIOS = 10_000
+
+
+class LegacyPortfolio(Portfolio):
+    """Portfolio deriving its groups as validated models, kept as a baseline."""
+
+    @computed_field  # type: ignore[misc]
+    @cached_property
+    def total(self) -> PortfolioGroup:  # type: ignore[override]
+        """Total is the sum of outstanding and paid."""
+        return PortfolioGroup(
+            amount=self.outstanding.amount + self.paid.amount,
+            count=self.outstanding.count + self.paid.count,
+        )
+
+    @computed_field  # type: ignore[misc]
+    @cached_property
+    def outstanding(self) -> PortfolioGroup:  # type: ignore[override]
+        """Outstanding is the sum of active, overdue and delinquent."""
+        return PortfolioGroup(
+            amount=self.active.amount + self.overdue.amount + self.delinquent.amount,
+            count=self.active.count + self.overdue.count + self.delinquent.count,
+        )
+
+    @computed_field  # type: ignore[misc]
+    @cached_property
+    def paid(self) -> PortfolioGroup:  # type: ignore[override]
+        """Paid is the sum of credits paid on time and cured."""
+        return PortfolioGroup(
+            amount=self.on_time.amount + self.cured.amount,
+            count=self.on_time.count + self.cured.count,
+        )
+
+
+def total_amount(funding_request: FundingRequest) -> Decimal:
+    """Access the derived groups of every portfolio of a funding request."""
+    portfolios = [funding_request.borrower.portfolio, *(debtor.portfolio for debtor in funding_request.debtors)]
+    return sum((portfolio.total.amount for portfolio in portfolios), Decimal(0))
+
+
+def main() -> None:
+    """Compare deriving the portfolio groups as validated models against the lightweight groups."""
+    generator = random.Random(0)
+    payloads = [build_portfolio(generator) for _ in range(PORTFOLIOS)]
+
+    print(f"Portfolio: time per portfolio to validate, derive every group and serialize over {PORTFOLIOS} portfolios")
+    kwargs = {"number": 1, "repeat": 5, "operations": PORTFOLIOS}
+    measure(
+        "Validated groups", lambda: [LegacyPortfolio.model_validate(p).model_dump_json() for p in payloads], **kwargs
+    )
+    measure("Derived groups", lambda: [Portfolio.model_validate(p).model_dump_json() for p in payloads], **kwargs)
+
+    data = [json.dumps(payload).encode() for payload in build_funding_requests(FUNDING_REQUESTS)]
+    print(f"FundingRequest: time per request over {FUNDING_REQUESTS} requests")
+    kwargs = {"number": 1, "repeat": 5, "operations": FUNDING_REQUESTS}
+    measure(
+        "Validate and access portfolios",
+        lambda: [total_amount(FundingRequest.model_validate_json(message)) for message in data],
+        **kwargs,
+    )
+    measure(
+        "Validate, access portfolios and serialize",
+        lambda: [FundingRequest.model_validate_json(message).model_dump_json() for message in data],
+        **kwargs,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import asyncio
+import json
+from base64 import b64decode
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Scope
+
+from cumplo_common.middlewares import PubSubMiddleware
+from cumplo_common.middlewares.pubsub import PubSubEvent
+from tests.asgi import call, endpoint
+from tests.benchmarks.utils import measure
+from tests.unit.middlewares.pubsub_test import build_push
+
+
+class LegacyPubSubMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` implementation, kept as a baseline."""
+
+    @staticmethod
+    async def dispatch(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        try:
+            body = await request.body()
+            event = PubSubEvent.model_validate(json.loads(body.decode("utf-8")))
+            request.state.event = event
+        except ValueError:
+            pass
+        else:
+            request._body = b64decode(event.message.data)  # noqa: SLF001
+        return await call_next(request)
+
+
+def _noop(_: Scope, __: bytes) -> None: ...
+
+
+def run(app: ASGIApp, body: bytes, content_type: str = "application/json", number: int = 500) -> Callable[[], None]:
+    """Build a function that sends a batch of requests to the app in a single event loop run."""
+
+    async def requests() -> None:
+        for _ in range(number):
+            await call(app, body, content_type=content_type)
+
+    return lambda: asyncio.run(requests())
+
+
+def main() -> None:
+    """Compare the ASGI middleware against the previous `BaseHTTPMiddleware` implementation."""
+    number = 500
+    push = build_push({"id": 1, "amount": 1_000_000, "irr": "12.5", "borrower": "x" * 500}, id_user="user")
+    other = json.dumps({"items": list(range(200))}).encode()
+    middlewares: dict[str, Callable[[ASGIApp], ASGIApp]] = {
+        "BaseHTTPMiddleware": LegacyPubSubMiddleware,
+        "ASGI": PubSubMiddleware,
+    }
+
+    print("PubSubMiddleware: time per request")
+    for name, middleware in middlewares.items():
+        app = middleware(endpoint(_noop))
+        measure(f"{name} Pub/Sub push", run(app, push, number=number), number=1, operations=number)
+        measure(f"{name} JSON request", run(app, other, number=number), number=1, operations=number)
+        measure(
+            f"{name} form request",
+            run(app, b"a=1", "application/x-www-form-urlencoded", number),
+            number=1,
+            operations=number,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import random
+from decimal import Decimal
+from itertools import starmap
+
+from cumplo_common.utils.rates import DAYS_PER_YEAR, compound_rate, compound_rates, exact_rates, round_rate
+from tests.benchmarks.utils import measure
+
+# NOTE: Roughly the amount of funding requests scraped in a day
+DAILY_FUNDING_REQUESTS = 5000
+
+
+def previous_profit_rate(irr: Decimal, duration: int) -> Decimal:
+    """Compute the profit rate with the previous formula, kept as a baseline."""
+    return round(Decimal((1 + irr / 100) ** Decimal(duration / 365) - 1), ndigits=4)
+
+
+def main() -> None:
+    """Compare the rate computations over a day's worth of funding requests."""
+    generator = random.Random(0)
+    irrs = [Decimal(generator.randint(500, 3000)) / 100 for _ in range(DAILY_FUNDING_REQUESTS)]
+    durations = [generator.randint(15, 720) for _ in range(DAILY_FUNDING_REQUESTS)]
+    pairs = list(zip(irrs, durations, strict=True))
+
+    print(f"Profit rates: time for {DAILY_FUNDING_REQUESTS} funding requests")
+    measure("Previous Decimal formula", lambda: list(starmap(previous_profit_rate, pairs)), number=3)
+    measure("compound_rate (float)", lambda: [compound_rate(*pair, DAYS_PER_YEAR) for pair in pairs], number=3)
+    measure("compound_rates (float)", lambda: compound_rates(irrs, durations, DAYS_PER_YEAR), number=3)
+    with exact_rates():
+        measure("compound_rate (exact)", lambda: [compound_rate(*pair, DAYS_PER_YEAR) for pair in pairs], number=3)
+        measure("compound_rates (exact)", lambda: compound_rates(irrs, durations, DAYS_PER_YEAR), number=3)
+
+    fees = [generator.randint(0, 20000) / 1_000_000 for _ in range(DAILY_FUNDING_REQUESTS)]
+    print(f"Fees: time for {DAILY_FUNDING_REQUESTS} funding requests")
+    measure("round(Decimal(fee), 4)", lambda: [round(Decimal(fee), 4) for fee in fees], number=3)
+    measure("round_rate", lambda: list(map(round_rate, fees)), number=3)
+
+
+if __name__ == "__main__":
+    main()
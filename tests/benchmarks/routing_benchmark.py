@@ -0,0 +1,42 @@
+import random
+
+from cumplo_common.models import ChannelRoutingIndex, PrivateEvent, PublicEvent, User
+from tests.benchmarks.utils import measure
+from tests.factories import build_user
+
+# NOTE: Every user of the platform with a few channels each
+USERS = 5000
+
+
+def scan(users: list[User], event: PublicEvent) -> list:
+    """Find the channels to notify by scanning every channel of every user, kept as a baseline."""
+    return [
+        (user, channel)
+        for user in users
+        for channel in user.channels.values()
+        if channel.enabled and channel.event_enabled(event)
+    ]
+
+
+def main() -> None:
+    """Compare scanning every user's channels against looking up the routing index."""
+    generator = random.Random(0)
+    users = [User.model_validate(build_user(generator)) for _ in range(USERS)]
+    index = ChannelRoutingIndex.from_users(users)
+    event = PublicEvent.FUNDING_REQUEST_PROMISING
+
+    print(f"Routing: time to find the channels of an event among {USERS} users")
+    measure("Scan every channel", lambda: scan(users, event), number=20)
+    measure("Build ChannelRoutingIndex", lambda: ChannelRoutingIndex.from_users(users), number=5)
+    measure("ChannelRoutingIndex.targets", lambda: index.targets(event), number=1000)
+
+    def update() -> list:
+        index.apply(PrivateEvent.USER_CHANNELS_UPDATED, users[42])
+        return index.targets(event)
+
+    print("Update: time to route an event after a user changes their channels")
+    measure("ChannelRoutingIndex.apply + targets", update, number=100)
+
+
+if __name__ == "__main__":
+    main()
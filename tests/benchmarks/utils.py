@@ -0,0 +1,30 @@
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+
+def measure(name: str, function: Callable[[], Any], number: int = 1000, repeat: int = 5, operations: int = 1) -> float:
+    """
+    Measure and print the best average time per operation of a function.
+
+    Args:
+        name (str): A label for the measurement
+        function (Callable[[], Any]): The function to be measured
+        number (int, optional): Calls per repetition. Defaults to 1000.
+        repeat (int, optional): Repetitions, only the fastest one is kept. Defaults to 5.
+        operations (int, optional): Operations performed by each call. Defaults to 1.
+
+    Returns:
+        float: The best average time per operation in seconds
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((perf_counter() - start) / number / operations)
+
+    best = min(timings)
+    print(f"{name:<60} {best * 1e6:>12.2f} us")
+    return best
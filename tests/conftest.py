@@ -0,0 +1,11 @@
+import os
+from unittest import mock
+
+from google.auth.credentials import AnonymousCredentials
+
+# NOTE: API keys can't be hashed without a pepper, which is checked on import
+os.environ.setdefault("API_KEYS_PEPPER", "test-pepper")
+
+# NOTE: The Firestore client is created on import, which needs credentials. Tests replace its collections with fakes
+with mock.patch("google.auth.default", return_value=(AnonymousCredentials(), "test")):
+    import cumplo_common.database  # noqa: F401
@@ -0,0 +1,154 @@
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import ulid
+
+from cumplo_common.models import ChannelType, CreditType, Currency, PublicEvent
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def build_portfolio(generator: random.Random) -> dict:
+    """Build the payload of a portfolio with random groups."""
+    return {
+        group: {"amount": str(generator.randint(0, 10**9)), "count": generator.randint(0, 500)}
+        for group in ("cured", "active", "overdue", "on_time", "delinquent")
+    }
+
+
+def build_simulation(generator: random.Random, installments: int) -> dict:
+    """Build the payload of a simulation with the given amount of installments."""
+    capital, upfront_fee, exit_fee = 1_000_000, generator.randint(0, 20_000), generator.randint(0, 10_000)
+    interests = [generator.randint(1_000, 20_000) for _ in range(installments)]
+    return {
+        "capital": capital,
+        "exit_fee": exit_fee,
+        "upfront_fee": upfront_fee,
+        "net_returns": sum(interests) - exit_fee,
+        "installments": [
+            {
+                "amount": capital // installments + interest,
+                "capital": capital // installments,
+                "exit_fee": exit_fee // installments,
+                "interest": interest,
+                "date": (START + timedelta(days=30 * (index + 1))).isoformat(),
+            }
+            for index, interest in enumerate(interests)
+        ],
+    }
+
+
+def build_funding_request(id_: int = 1, generator: random.Random | None = None, **overrides: Any) -> dict:
+    """
+    Build the payload of a funding request with random values.
+
+    Args:
+        id_ (int, optional): The funding request ID. Defaults to 1.
+        generator (random.Random | None, optional): The random generator to use. Defaults to one seeded with the ID.
+        **overrides (Any): Values replacing the generated ones
+
+    Returns:
+        dict: The funding request payload
+
+    """
+    generator = generator or random.Random(id_)  # noqa: S311
+    amount = generator.randint(1, 500) * 1_000_000
+    raised_percentage = generator.choice([1, generator.randint(0, 99) / 100])
+    payload = {
+        "id": id_,
+        "amount": amount,
+        "irr": str(generator.randint(500, 3000) / 100),
+        "score": str(generator.randint(0, 100) / 100),
+        "due_date": (START + timedelta(days=generator.randint(15, 720))).date().isoformat(),
+        "raised_amount": int(amount * raised_percentage),
+        "maximum_investment": amount // 10,
+        "investors": generator.randint(0, 300),
+        "raised_percentage": str(raised_percentage),
+        "supporting_documents": [f"https://example.com/{id_}/{index}.pdf" for index in range(2)],
+        "debtors": [
+            {
+                "share": str(generator.randint(1, 100) / 100),
+                "name": f"Debtor {id_}-{index}",
+                "economic_sector": "Retail",
+                "portfolio": build_portfolio(generator),
+                "first_appearance": START.isoformat(),
+                "dicom": generator.random() < 0.1,  # noqa: PLR2004
+            }
+            for index in range(generator.randint(1, 3))
+        ],
+        "credit_type": generator.choice(list(CreditType)).value,
+        "simulation": build_simulation(generator, generator.choice([1, 1, 3, 6])),
+        "duration": {"unit": "DAY", "value": generator.randint(15, 720)},
+        "borrower": {
+            "id": generator.randint(1, 10**6),
+            "name": f"Borrower {id_}",
+            "economic_sector": "Services",
+            "description": "A company",
+            "first_appearance": START.isoformat(),
+            "portfolio": build_portfolio(generator),
+            "dicom": False,
+        },
+        "currency": generator.choice(list(Currency)).value,
+    }
+    return payload | overrides
+
+
+def build_funding_requests(count: int, seed: int = 0) -> list[dict]:
+    """Build the payloads of many funding requests with consecutive IDs."""
+    generator = random.Random(seed)  # noqa: S311
+    return [build_funding_request(id_, generator) for id_ in range(1, count + 1)]
+
+
+def build_investment(id_: int, generator: random.Random, **overrides: Any) -> dict:
+    """Build the payload of an investment with random values."""
+    amount = generator.randint(1, 100) * 10_000
+    return {
+        "id": id_,
+        "id_funding_request": generator.randint(1, 50),
+        "credit_type": generator.choice(list(CreditType)).value,
+        "status": generator.choice(["ACTIVE", "PAID", "DELINQUENT"]),
+        "currency": generator.choice(["CLP", "USD"]),
+        "borrower": f"Borrower {generator.randint(1, 5)}",
+        "debtor": f"Debtor {generator.randint(1, 8)}",
+        "amount": amount,
+        "exit_fee": generator.randint(0, 1000),
+        "upfront_fee": generator.randint(0, 1000),
+        "interest": generator.randint(0, 10_000),
+        "paid_capital": generator.randint(0, amount),
+        "insolvent_capital": 0,
+        "days_delinquent": generator.choice([0, 0, 0, 15]),
+        "investment_date": START.isoformat(),
+        "due_date": "2024-03-01",
+        "duration": {"unit": "DAY", "value": 60},
+        **overrides,
+    }
+
+
+def build_channel(generator: random.Random, **overrides: Any) -> dict:
+    """Build the payload of a channel configuration of a random type."""
+    channel: dict[str, Any] = {"id": str(ulid.new()), "enabled": generator.random() < 0.9}  # noqa: PLR2004
+    match generator.choice(list(ChannelType)):
+        case ChannelType.WEBHOOK:
+            channel |= {"type_": "WEBHOOK", "url": f"https://hooks.example.com/{generator.randint(1, 10**6)}"}
+            channel["enabled_events"] = generator.choice([[], ["all"], [PublicEvent.FUNDING_REQUEST_PROMISING.value]])
+        case ChannelType.WHATSAPP:
+            channel |= {"type_": "WHATSAPP", "phone_number": f"+569{generator.randint(10**7, 10**8 - 1)}"}
+        case ChannelType.IFTTT:
+            channel |= {"type_": "IFTTT", "key": f"key-{generator.randint(1, 10**6)}", "event": "promising"}
+            if generator.random() < 0.2:  # noqa: PLR2004
+                channel["disabled_events"] = [PublicEvent.FUNDING_REQUEST_PROMISING.value]
+    return channel | overrides
+
+
+def build_user(generator: random.Random, channels: int = 3, **overrides: Any) -> dict:
+    """Build the payload of a user with random channels."""
+    id_user = str(ulid.new())
+    return {
+        "id": id_user,
+        "api_key": f"key-{id_user}",
+        "email": f"{id_user.lower()}@example.com",
+        "name": f"User {generator.randint(1, 1000)}",
+        "channels": {(channel := build_channel(generator))["id"]: channel for _ in range(channels)},
+        **overrides,
+    }
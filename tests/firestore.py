@@ -0,0 +1,91 @@
+from collections.abc import Generator
+
+from google.cloud.firestore_v1 import Increment
+
+
+class FakeSnapshot:
+    """A read of a document."""
+
+    def __init__(self, reference: "FakeDocument", data: dict | None) -> None:
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> dict | None:
+        return None if self._data is None else dict(self._data)
+
+
+class FakeDocument:
+    """A reference to a document, which counts its reads."""
+
+    def __init__(self, collection: "FakeCollection", id_: str) -> None:
+        self.collection = collection
+        self.id = id_
+
+    def get(self) -> FakeSnapshot:
+        self.collection.reads.append(self.id)
+        return FakeSnapshot(self, self.collection.documents.get(self.id))
+
+    def set(self, data: dict) -> None:
+        self.collection.documents[self.id] = dict(data)
+
+    def update(self, data: dict) -> None:
+        document = self.collection.documents[self.id]
+        for field, value in data.items():
+            document[field] = document.get(field, 0) + value.value if isinstance(value, Increment) else value
+
+    def delete(self) -> None:
+        self.collection.documents.pop(self.id, None)
+
+
+class FakeCollection:
+    """In-memory stand-in of a Firestore collection."""
+
+    def __init__(self) -> None:
+        self.documents: dict[str, dict] = {}
+        self.reads: list[str] = []
+
+    def document(self, id_: str) -> FakeDocument:
+        return FakeDocument(self, str(id_))
+
+    def stream(self) -> Generator[FakeSnapshot, None, None]:
+        for id_ in sorted(self.documents):
+            if id_ in self.documents:  # NOTE: Documents deleted while streaming are skipped, as in Firestore
+                yield FakeSnapshot(FakeDocument(self, id_), self.documents[id_])
+
+
+class FakeBatch:
+    """Writes applied together once committed."""
+
+    def __init__(self, client: "FakeFirestore") -> None:
+        self.client = client
+        self.writes: list[tuple[FakeDocument, dict | None]] = []
+
+    def set(self, reference: FakeDocument, data: dict) -> None:
+        self.writes.append((reference, data))
+
+    def delete(self, reference: FakeDocument) -> None:
+        self.writes.append((reference, None))
+
+    def commit(self) -> None:
+        for reference, data in self.writes:
+            if data is None:
+                reference.delete()
+            else:
+                reference.set(data)
+        self.client.commits.append(len(self.writes))
+
+
+class FakeFirestore:
+    """In-memory stand-in of the Firestore client, which records the size of each committed batch."""
+
+    def __init__(self) -> None:
+        self.collections: dict[str, FakeCollection] = {}
+        self.commits: list[int] = []
+
+    def collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection())
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
@@ -0,0 +1,74 @@
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep
+from types import TracebackType
+from typing import Self
+
+
+class LocalServer:
+    """
+    Local HTTP/1.1 server that records every request it receives.
+
+    Responses are 200 unless statuses are queued, which are used in order by the next requests. A status may be
+    queued along the headers of its response.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.statuses: deque[int | tuple[int, dict[str, str]]] = deque()
+        self.requests: list[tuple[str, bytes]] = []
+        self.connections: set[int] = set()
+        self.lock = Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self, type_: type[BaseException] | None, exception: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve requests in a background thread."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and close the listening socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                sleep(server.delay)
+                with server.lock:
+                    server.requests.append((self.path, body))
+                    server.connections.add(self.client_address[1])
+                    status = server.statuses.popleft() if server.statuses else 200
+                status, headers = status if isinstance(status, tuple) else (status, {})
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass
+
+        return Handler
@@ -0,0 +1,150 @@
+import random
+
+import pytest
+
+from cumplo_common.database.firestore import users as users_module
+from cumplo_common.database.firestore.users import UserCollection
+from cumplo_common.models import User
+from cumplo_common.utils.text import hash_key
+from tests.factories import build_user
+from tests.firestore import FakeFirestore
+
+
+class TestInvalidKeys:
+    def setup_method(self) -> None:
+        self.firestore = FakeFirestore()
+        self.users = UserCollection(self.firestore)  # type: ignore[arg-type]
+        self.keys = self.firestore.collection("keys")
+        self.user = User.model_validate(build_user(random.Random(0), channels=0))  # noqa: S311
+
+    def test_skips_reads_of_invalid_keys(self) -> None:
+        """Should only read an invalid API key from Firestore once while it's remembered."""
+        with pytest.raises(KeyError):
+            self.users.get(api_key="invalid")
+        reads = len(self.keys.reads)
+
+        with pytest.raises(KeyError):
+            self.users.get(api_key="invalid")
+        assert reads > 0
+        assert len(self.keys.reads) == reads
+        assert self.users.invalid_keys.metrics == {"hits": 1, "misses": 1}
+
+    def test_create_forgets_the_key(self) -> None:
+        """Should find a user created with a key that was remembered as invalid."""
+        with pytest.raises(KeyError):
+            self.users.get(api_key=self.user.api_key)
+
+        self.users.create(self.user)
+
+        assert self.users.get(api_key=self.user.api_key).id == self.user.id
+        assert self.user.api_key not in self.users.invalid_keys
+
+
+class TestRevoke:
+    def setup_method(self) -> None:
+        self.firestore = FakeFirestore()
+        self.users = UserCollection(self.firestore)  # type: ignore[arg-type]
+        self.user = User.model_validate(build_user(random.Random(0), channels=0))  # noqa: S311
+        self.users.create(self.user)
+        self.id_user = str(self.user.id)
+
+    def test_revoke(self) -> None:
+        """Should bump the stored key version and forget the cached one."""
+        assert self.users.get_key_version(self.id_user) == 0
+        self.users.revoke(self.id_user)
+        assert self.users.get_key_version(self.id_user) == 1
+        assert self.users.get(id_user=self.id_user).key_version == 1
+
+    def test_update(self) -> None:
+        """Should only revoke the tokens of a user when an attribute carried by them is updated."""
+        self.users.update(self.user.model_copy(update={"name": "Other"}), "name")
+        assert self.users.get_key_version(self.id_user) == 0
+
+        self.users.update(self.user.model_copy(update={"is_admin": True}), "is_admin")
+        assert self.users.get_key_version(self.id_user) == 1
+
+    def test_put(self) -> None:
+        """Should keep the stored key version on put, and bump it when the API key or the admin flag change."""
+        self.users.revoke(self.id_user)
+        self.users.put(self.user.model_copy(update={"name": "Other"}))
+        assert self.users.get_key_version(self.id_user) == 1
+
+        self.users.put(self.user.model_copy(update={"api_key": "other"}))
+        assert self.users.get_key_version(self.id_user) == 2  # noqa: PLR2004
+
+    def test_missing_user(self) -> None:
+        """Should raise KeyError for the key version of users that don't exist."""
+        self.users.delete(self.user)
+        with pytest.raises(KeyError):
+            self.users.get_key_version(self.id_user)
+
+
+class TestHashedKeys:
+    def setup_method(self) -> None:
+        self.firestore = FakeFirestore()
+        self.users = UserCollection(self.firestore)  # type: ignore[arg-type]
+        self.keys = self.firestore.collection("keys")
+        self.user = User.model_validate(build_user(random.Random(0), channels=0))  # noqa: S311
+        self.users.create(self.user)
+        self.digest = hash_key(self.user.api_key)
+
+    def test_hashed_lookup(self) -> None:
+        """Should store keys under their hash and find their users with a single read."""
+        assert self.keys.documents == {self.digest: {"id_user": str(self.user.id), "hashed": True}}
+        assert self.users.get(api_key=self.user.api_key).id == self.user.id
+        assert self.keys.reads == [self.digest]
+
+    def test_legacy_lookup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should fall back to keys stored as is only while the legacy lookup is enabled."""
+        self.keys.documents = {self.user.api_key: {"id_user": str(self.user.id)}}
+        assert self.users.get(api_key=self.user.api_key).id == self.user.id
+        assert self.keys.reads == [self.digest, self.user.api_key]
+
+        monkeypatch.setattr(users_module, "API_KEYS_LEGACY_LOOKUP", False)
+        self.users.invalid_keys.discard(self.user.api_key)
+        with pytest.raises(KeyError):
+            self.users.get(api_key=self.user.api_key)
+
+    def test_stale_key(self) -> None:
+        """Should reject keys whose document points to a user that has another key."""
+        self.keys.document(hash_key("stale")).set({"id_user": str(self.user.id), "hashed": True})
+        with pytest.raises(KeyError):
+            self.users.get(api_key="stale")
+
+
+class TestMigrateKeys:
+    def setup_method(self) -> None:
+        self.firestore = FakeFirestore()
+        self.users = UserCollection(self.firestore)  # type: ignore[arg-type]
+        self.keys = self.firestore.collection("keys")
+        self.api_keys = [f"key-{index}" for index in range(5)]
+        for index, api_key in enumerate(self.api_keys):
+            self.keys.document(api_key).set({"id_user": f"user-{index}"})
+        self.keys.document(hash_key("migrated")).set({"id_user": "user-migrated", "hashed": True})
+
+    def assert_migrated(self) -> None:
+        """Assert that every key is stored under its hash, and only there."""
+        expected = {
+            hash_key(api_key): {"id_user": f"user-{i}", "hashed": True} for i, api_key in enumerate(self.api_keys)
+        }
+        expected[hash_key("migrated")] = {"id_user": "user-migrated", "hashed": True}
+        assert self.keys.documents == expected
+
+    def test_batches(self) -> None:
+        """Should migrate the keys in batches, yielding the keys migrated after each of them."""
+        assert list(self.users.migrate_keys(batch_size=2)) == [2, 4, 5]
+        # NOTE: Each key is written under its hash and deleted in the same batch
+        assert self.firestore.commits == [4, 4, 2]
+        self.assert_migrated()
+
+    def test_resume(self) -> None:
+        """Should pick up where a stopped migration left off, skipping the keys already hashed."""
+        migration = self.users.migrate_keys(batch_size=2)
+        assert next(migration) == 2  # noqa: PLR2004
+        migration.close()
+
+        assert list(self.users.migrate_keys(batch_size=2)) == [2, 3]
+        self.assert_migrated()
+
+        assert list(self.users.migrate_keys(batch_size=2)) == []
+        assert self.firestore.commits == [4, 4, 2]
@@ -0,0 +1,111 @@
+import asyncio
+import random
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.requests import Request
+from starlette.types import Message
+
+from cumplo_common.database import firestore
+from cumplo_common.database.firestore.users import UserCollection
+from cumplo_common.dependencies import authenticate, is_admin
+from cumplo_common.dependencies import authentication as authentication_module
+from cumplo_common.models import User
+from cumplo_common.utils.tokens import TokenSigner
+from tests.asgi import call
+from tests.factories import build_user
+from tests.firestore import FakeFirestore
+
+SECRET = "secret"  # noqa: S105
+
+
+def status(messages: list[Message]) -> int:
+    """Get the status of the response sent back by an application."""
+    return messages[0]["status"]
+
+
+class TestAuthenticate:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.firestore = FakeFirestore()
+        self.users = UserCollection(self.firestore)  # type: ignore[arg-type]
+        self.signer = TokenSigner(secret=SECRET, version=1)
+        monkeypatch.setattr(firestore.client, "users", self.users)
+        monkeypatch.setattr(authentication_module, "TOKEN_SIGNER", self.signer)
+
+        self.user = User.model_validate(build_user(random.Random(0), channels=0, is_admin=True))  # noqa: S311
+        self.users.create(self.user)
+        self.reads = self.firestore.collection("users").reads
+        self.seen: list[tuple[object, object]] = []
+
+        self.app = FastAPI()
+
+        @self.app.post("/", dependencies=[Depends(authenticate), Depends(is_admin)])
+        async def endpoint(request: Request) -> dict:
+            await asyncio.sleep(0)
+            self.seen.append((request.state.user, getattr(request.state, "claims", None)))
+            return {"id": str(request.state.user.id)}
+
+    def request(self, x_api_key: str) -> list[Message]:
+        """Send an empty request to the application with the given credential."""
+        return asyncio.run(call(self.app, b"{}", headers={"X-API-KEY": x_api_key}))
+
+    def test_token(self) -> None:
+        """Should authenticate tokens with their claims, only reading the user once it's used."""
+        token = self.signer.issue(self.user)
+        for _ in range(2):
+            assert status(self.request(token)) == 200  # noqa: PLR2004
+
+        # NOTE: Only the key version of the first request is read, which is then cached
+        assert len(self.reads) == 1
+        user, claims = self.seen[-1]
+        assert claims == self.signer.verify(token)
+        assert user.id == self.user.id  # type: ignore[attr-defined]
+        assert user.is_admin  # type: ignore[attr-defined]
+        assert len(self.reads) == 1
+
+        assert user.name == self.user.name  # type: ignore[attr-defined]
+        assert user.channels == self.user.channels  # type: ignore[attr-defined]
+        assert len(self.reads) == 2  # noqa: PLR2004
+
+    def test_stale_token(self) -> None:
+        """Should fall back to reading the user of a token issued by another version of the signer."""
+        token = TokenSigner(secret=SECRET, version=0).issue(self.user)
+        assert status(self.request(token)) == 200  # noqa: PLR2004
+
+        user, claims = self.seen[-1]
+        assert isinstance(user, User)
+        assert user.id == self.user.id
+        assert claims is not None
+
+    def test_invalid_token(self) -> None:
+        """Should reject tokens that are wrongly signed or malformed without reading Firestore."""
+        for token in (TokenSigner(secret="other").issue(self.user), "cpt.invalid"):  # noqa: S106
+            assert status(self.request(token)) == 401  # noqa: PLR2004
+        assert not self.reads
+
+    def test_revoked_token(self) -> None:
+        """Should reject the tokens of a user once they are revoked, even while its key version is cached."""
+        token = self.signer.issue(self.user)
+        assert status(self.request(token)) == 200  # noqa: PLR2004
+
+        self.users.revoke(str(self.user.id))
+        assert status(self.request(token)) == 401  # noqa: PLR2004
+
+        user = self.users.get(id_user=str(self.user.id))
+        assert status(self.request(self.signer.issue(user))) == 200  # noqa: PLR2004
+
+    def test_deleted_user(self) -> None:
+        """Should reject the tokens of users that don't exist anymore."""
+        token = self.signer.issue(self.user)
+        self.users.delete(self.user)
+        assert status(self.request(token)) == 401  # noqa: PLR2004
+
+    def test_api_key(self) -> None:
+        """Should keep authenticating API keys with the user they belong to."""
+        assert status(self.request(self.user.api_key)) == 200  # noqa: PLR2004
+        user, claims = self.seen[-1]
+        assert isinstance(user, User)
+        assert user.id == self.user.id
+        assert claims is None
+        assert status(self.request("invalid")) == 401  # noqa: PLR2004
@@ -0,0 +1,146 @@
+import asyncio
+import random
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.requests import Request
+from starlette.types import Message
+
+from cumplo_common.database import firestore
+from cumplo_common.database.firestore.users import UserCollection
+from cumplo_common.dependencies import authenticate, rate_limit
+from cumplo_common.dependencies.rate_limit import get_rate_limit_key
+from cumplo_common.models import User
+from cumplo_common.utils.rate_limit import RateLimiter
+from cumplo_common.utils.text import hash_key
+from cumplo_common.utils.tokens import TokenSigner
+from tests.asgi import call
+from tests.factories import build_user
+from tests.firestore import FakeFirestore
+
+CAPACITY = 2
+CLIENT = ("10.0.0.1", 1234)
+SECRET = "secret"  # noqa: S105
+
+
+def build_request(headers: dict[str, str] | None = None, event: object = None) -> Request:
+    """Build a request with the given headers and Pub/Sub event."""
+    scope = {
+        "type": "http",
+        "headers": [(name.encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": CLIENT,
+        "state": {"event": event} if event else {},
+    }
+    return Request(scope)
+
+
+def response_headers(messages: list[Message]) -> dict[str, str]:
+    """Get the headers of the response sent back by an application."""
+    return {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+
+
+class TestRateLimit:
+    def setup_method(self) -> None:
+        self.app = FastAPI()
+        dependency = rate_limit(RateLimiter(rate=0.001, capacity=CAPACITY))
+
+        @self.app.post("/", dependencies=[Depends(dependency)])
+        async def endpoint() -> dict:
+            await asyncio.sleep(0)
+            return {}
+
+    def request(self, **kwargs: object) -> list[Message]:
+        """Send an empty request to the application."""
+        return asyncio.run(call(self.app, b"{}", **kwargs))  # type: ignore[arg-type]
+
+    def test_allowed(self) -> None:
+        """Should let requests through with the rate limit headers until the bucket is empty."""
+        for remaining in reversed(range(CAPACITY)):
+            messages = self.request(headers={"X-API-KEY": "key"})
+            assert messages[0]["status"] == 200  # noqa: PLR2004
+            headers = response_headers(messages)
+            assert headers["x-ratelimit-limit"] == str(CAPACITY)
+            assert headers["x-ratelimit-remaining"] == str(remaining)
+            assert "retry-after" not in headers
+
+    def test_limited(self) -> None:
+        """Should answer 429 with Retry-After once the bucket is empty, without limiting other keys."""
+        for _ in range(CAPACITY):
+            self.request(headers={"X-API-KEY": "key"})
+
+        messages = self.request(headers={"X-API-KEY": "key"})
+        assert messages[0]["status"] == 429  # noqa: PLR2004
+        headers = response_headers(messages)
+        assert int(headers["retry-after"]) > 0
+        assert headers["x-ratelimit-remaining"] == "0"
+
+        assert self.request(headers={"X-API-KEY": "other"})[0]["status"] == 200  # noqa: PLR2004
+
+
+class TestRateLimitBeforeAuthenticate:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.firestore = FakeFirestore()
+        monkeypatch.setattr(firestore.client, "users", UserCollection(self.firestore))  # type: ignore[arg-type]
+        self.user = User.model_validate(build_user(random.Random(0), channels=0))  # noqa: S311
+        firestore.client.users.create(self.user)
+
+        self.app = FastAPI()
+        dependency = rate_limit(RateLimiter(rate=0.001, capacity=CAPACITY))
+
+        @self.app.post("/", dependencies=[Depends(dependency), Depends(authenticate)])
+        async def endpoint() -> dict:
+            await asyncio.sleep(0)
+            return {}
+
+    def reads(self) -> int:
+        """Count the documents read from Firestore."""
+        return sum(len(collection.reads) for collection in self.firestore.collections.values())
+
+    def test_limited_without_reads(self) -> None:
+        """Should reject requests over the limit before their user is read from Firestore."""
+        for _ in range(CAPACITY):
+            assert asyncio.run(call(self.app, b"{}", headers={"X-API-KEY": self.user.api_key}))[0]["status"] == 200  # noqa: PLR2004
+        reads = self.reads()
+        assert reads > 0
+
+        messages = asyncio.run(call(self.app, b"{}", headers={"X-API-KEY": self.user.api_key}))
+        assert messages[0]["status"] == 429  # noqa: PLR2004
+        assert self.reads() == reads
+
+
+class TestGetRateLimitKey:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.signer = TokenSigner(secret=SECRET, version=1)
+        # NOTE: The package exports the rate_limit function under the name of its module
+        monkeypatch.setattr(sys.modules["cumplo_common.dependencies.rate_limit"], "TOKEN_SIGNER", self.signer)
+        self.user = User.model_validate(build_user(random.Random(0), channels=0))  # noqa: S311
+
+    def test_token(self) -> None:
+        """Should limit requests with a signed token by its user, even when the token is stale."""
+        for signer in (self.signer, TokenSigner(secret=SECRET, version=0)):
+            request = build_request({"x-api-key": signer.issue(self.user)})
+            assert get_rate_limit_key(request) == f"user:{self.user.id}"
+
+    def test_invalid_token(self) -> None:
+        """Should limit requests with a wrongly signed token by its hash, like an API key."""
+        token = TokenSigner(secret="other").issue(self.user)  # noqa: S106
+        assert get_rate_limit_key(build_request({"x-api-key": token})) == f"api_key:{hash_key(token)}"
+
+    def test_event(self) -> None:
+        """Should limit Pub/Sub events by the user who triggered them."""
+        request = build_request(event=SimpleNamespace(id_user="user"))
+        assert get_rate_limit_key(request) == "user:user"
+
+    def test_api_key(self) -> None:
+        """Should limit requests with an API key by its hash."""
+        key = get_rate_limit_key(build_request({"x-api-key": "key"}))
+        assert key == f"api_key:{hash_key('key')}"
+        assert "key" not in key.removeprefix("api_key:")
+
+    def test_client(self) -> None:
+        """Should limit anonymous requests by their client address."""
+        assert get_rate_limit_key(build_request()) == f"client:{CLIENT[0]}"
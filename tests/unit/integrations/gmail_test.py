@@ -0,0 +1,169 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cumplo_common.integrations.gmail import Attachment, Email, Gmail
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeRequest:
+    def __init__(self, response: dict) -> None:
+        self.response = response
+
+    def execute(self) -> dict:
+        return self.response
+
+
+class FakeService:
+    """Minimal stand-in of the Gmail service returning paginated history."""
+
+    def __init__(self, pages: dict[str | None, dict]) -> None:
+        self.pages = pages
+        self.listed: list[dict] = []
+
+    def users(self) -> "FakeService":
+        return self
+
+    def history(self) -> "FakeService":
+        return self
+
+    def messages(self) -> "FakeService":
+        return self
+
+    def send(self, **kwargs: Any) -> FakeRequest:
+        return FakeRequest({"id": f"sent-{len(self.listed)}", "upload": "media_body" in kwargs})
+
+    def new_batch_http_request(self, callback: Any) -> "FakeBatch":
+        return FakeBatch(self, callback)
+
+    def list(self, **kwargs: Any) -> FakeRequest:
+        self.listed.append(kwargs)
+        return FakeRequest(self.pages[kwargs["pageToken"]])
+
+    def get(self, **kwargs: Any) -> FakeRequest:
+        return FakeRequest({"id": kwargs["id"]})
+
+
+class FakeBatch:
+    def __init__(self, service: FakeService, callback: Any) -> None:
+        self.service = service
+        self.callback = callback
+        self.requests: list[tuple[str, FakeRequest]] = []
+
+    def add(self, request: FakeRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.service.listed.append({"batch": len(self.requests)})
+        for request_id, request in self.requests:
+            self.callback(request_id, request.execute(), None)
+
+
+class MemoryCursorStore:
+    def __init__(self, cursor: str | None = None) -> None:
+        self.cursor = cursor
+
+    def get(self) -> str | None:
+        return self.cursor
+
+    def put(self, history_id: str) -> None:
+        self.cursor = history_id
+
+
+def _added(*message_ids: str) -> dict:
+    return {"messagesAdded": [{"message": {"id": id_}} for id_ in message_ids]}
+
+
+class TestGmailSync:
+    @pytest.fixture(autouse=True)
+    def _service(self, monkeypatch: pytest.MonkeyPatch) -> FakeService:
+        self.service = FakeService({
+            None: {"history": [_added("a", "b")], "nextPageToken": "page-2", "historyId": "15"},
+            "page-2": {"history": [_added("b", "c")], "historyId": "20"},
+        })
+        monkeypatch.setattr(Gmail, "_authenticate", classmethod(lambda _: self.service))
+        Gmail._synced_messages.clear()  # noqa: SLF001
+        return self.service
+
+    def test_pages_and_persists_cursor(self) -> None:
+        """Should yield the messages of every page in order, without duplicates, and then advance the cursor."""
+        store = MemoryCursorStore("10")
+        messages = [message["id"] for message in Gmail.sync(history_id="12", store=store)]
+
+        assert messages == ["a", "b", "c"]
+        assert store.cursor == "20"
+        assert self.service.listed[0]["startHistoryId"] == "10"
+
+    def test_skips_already_synced_history(self) -> None:
+        """Should not list the history when the notified history ID is behind the stored cursor."""
+        store = MemoryCursorStore("20")
+        assert not list(Gmail.sync(history_id="18", store=store))
+        assert not self.service.listed
+
+    def test_skips_recently_synced_messages(self) -> None:
+        """Should not yield a message twice when two syncs overlap."""
+        first = [message["id"] for message in Gmail.sync(store=MemoryCursorStore("10"))]
+        second = [message["id"] for message in Gmail.sync(store=MemoryCursorStore("10"))]
+        assert first == ["a", "b", "c"]
+        assert not second
+
+    def test_interrupted_sync_keeps_cursor(self) -> None:
+        """Should not advance the cursor when the messages were not fully consumed."""
+        store = MemoryCursorStore("10")
+        next(Gmail.sync(store=store))
+        assert store.cursor == "10"
+
+    def test_requires_starting_point(self) -> None:
+        """Should fail when there is neither a stored cursor nor a history ID."""
+        with pytest.raises(ValueError):
+            list(Gmail.sync(store=MemoryCursorStore()))
+
+
+class TestGmailSend:
+    @pytest.fixture(autouse=True)
+    def _service(self, monkeypatch: pytest.MonkeyPatch) -> FakeService:
+        self.service = FakeService({})
+        monkeypatch.setattr(Gmail, "_authenticate", classmethod(lambda _: self.service))
+        return self.service
+
+    def test_attachment_cache(self, tmp_path: Path) -> None:
+        """Should reuse the encoded attachment until the file is modified."""
+        path = tmp_path / "logo.png"
+        path.write_bytes(PNG)
+        attachment = Attachment(path=str(path), content_id="logo")
+
+        assert attachment.to_mime() is attachment.to_mime()
+
+        first = attachment.to_mime()
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert attachment.to_mime() is not first
+
+    def test_send_emails_in_batches(self, tmp_path: Path) -> None:
+        """Should send every email in batches of the given size, keeping the responses in order."""
+        path = tmp_path / "logo.png"
+        path.write_bytes(PNG)
+        attachment = Attachment(path=str(path), content_id="logo")
+        emails = [
+            Email(to=f"user{i}@example.com", subject="Hi", content="<p>Hi</p>", attachments=[attachment])
+            for i in range(5)
+        ]
+
+        responses = Gmail.send_emails(*emails, batch_size=2)
+
+        assert len(responses) == len(emails)
+        assert all(response is not None and not response["upload"] for response in responses)
+        assert [call["batch"] for call in self.service.listed] == [2, 2, 1]
+
+    def test_large_emails_are_uploaded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should send messages over the upload threshold through the media upload endpoint."""
+        monkeypatch.setattr("cumplo_common.integrations.gmail.GMAIL_UPLOAD_THRESHOLD", 100)
+        email = Email(to="user@example.com", subject="Hi", content="<p>" + "a" * 200 + "</p>")
+
+        (response,) = Gmail.send_emails(email)
+
+        assert response is not None
+        assert response["upload"]
+        assert not self.service.listed
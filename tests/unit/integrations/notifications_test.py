@@ -0,0 +1,182 @@
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from time import perf_counter
+from typing import Any
+
+import ulid
+
+from cumplo_common.integrations import DeliveryRequest, DeliveryResponse, NotificationDispatcher
+from cumplo_common.integrations.notifications import build_ifttt_request, build_webhook_request
+from cumplo_common.models.channel import (
+    ChannelConfigurationType,
+    ChannelType,
+    IFTTTConfiguration,
+    WebhookConfiguration,
+    WhatsappConfiguration,
+)
+from cumplo_common.utils.dns import HostResolver
+from tests.server import LocalServer
+
+CONCURRENCY = 2
+RETRIES = 3
+RETRY_AFTER = 1
+
+
+def build_webhook(id_: int) -> WebhookConfiguration:
+    """Build a webhook channel."""
+    return WebhookConfiguration.model_validate({"id": ulid.from_int(id_), "url": f"https://example.com/{id_}"})
+
+
+class TestNotificationDispatcher:
+    def setup_method(self) -> None:
+        self.server = LocalServer()
+        self.server.start()
+
+    def teardown_method(self) -> None:
+        self.server.stop()
+
+    def build_dispatcher(self, **kwargs: Any) -> NotificationDispatcher:
+        """Build a dispatcher that delivers webhooks to the local server."""
+
+        def build_request(channel: WebhookConfiguration, body: bytes) -> DeliveryRequest:
+            return DeliveryRequest(url=f"{self.server.url}/{channel.id}", body=body)
+
+        kwargs.setdefault("resolver", None)
+        return NotificationDispatcher(builders={ChannelType.WEBHOOK: build_request}, backoff=0.001, **kwargs)
+
+    def dispatch(self, jobs: list[tuple[ChannelConfigurationType, dict]], **kwargs: Any) -> list:
+        """Dispatch the jobs with a new dispatcher."""
+
+        async def run() -> list:
+            async with self.build_dispatcher(**kwargs) as dispatcher:
+                return await dispatcher.dispatch(jobs)
+
+        return asyncio.run(run())
+
+    def test_dispatch(self) -> None:
+        """Should deliver each payload to its channel over a few reused connections."""
+        channels = [build_webhook(id_) for id_ in range(30)]
+        deliveries = self.dispatch([(channel, {"id": 1}) for channel in channels], concurrency=CONCURRENCY)
+
+        assert [delivery.id_channel for delivery in deliveries] == [channel.id for channel in channels]
+        assert all(delivery.delivered and delivery.attempts == 1 for delivery in deliveries)
+        assert all(delivery.latency > 0 for delivery in deliveries)
+        assert sorted(path for path, _ in self.server.requests) == sorted(f"/{channel.id}" for channel in channels)
+        assert {json.loads(body)["id"] for _, body in self.server.requests} == {1}
+        assert len(self.server.connections) <= CONCURRENCY
+
+    def test_retries(self) -> None:
+        """Should retry the requests that fail temporarily."""
+        self.server.statuses.extend([503, 429])
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES)
+
+        assert delivery.delivered
+        assert delivery.attempts == RETRIES
+
+    def test_gives_up(self) -> None:
+        """Should stop retrying once the retries are exhausted."""
+        self.server.statuses.extend([500] * (RETRIES + 1))
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES)
+
+        assert (delivery.delivered, delivery.status, delivery.attempts) == (False, 500, RETRIES + 1)
+
+    def test_retry_after(self) -> None:
+        """Should wait at least what the Retry-After header asks for before retrying a 429."""
+        self.server.statuses.append((429, {"Retry-After": str(RETRY_AFTER)}))
+        start = perf_counter()
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES, backoff_cap=RETRY_AFTER * 10)
+
+        assert (delivery.delivered, delivery.attempts) == (True, 2)
+        assert perf_counter() - start >= RETRY_AFTER
+
+    def test_retry_after_too_long(self) -> None:
+        """Should give up on a 429 whose Retry-After is longer than the backoff cap."""
+        self.server.statuses.append((429, {"Retry-After": "120"}))
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES)
+
+        assert (delivery.delivered, delivery.status, delivery.attempts) == (False, 429, 1)
+
+    def test_permanent_errors(self) -> None:
+        """Should not retry the requests rejected by the channel."""
+        self.server.statuses.append(404)
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES)
+
+        assert (delivery.delivered, delivery.status, delivery.attempts) == (False, 404, 1)
+
+    def test_connection_errors(self) -> None:
+        """Should report the channels whose host can't be reached."""
+        self.server.stop()
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], retries=RETRIES)
+
+        assert not delivery.delivered
+        assert delivery.status is None
+        assert delivery.error
+        assert delivery.attempts == RETRIES + 1
+
+    def test_private_hosts(self) -> None:
+        """Should refuse to deliver to hosts that resolve to private addresses."""
+        (delivery,) = self.dispatch([(build_webhook(1), {"id": 1})], resolver=HostResolver())
+
+        assert delivery.attempts == 0
+        assert not delivery.delivered
+        assert "private" in str(delivery.error)
+        assert not self.server.requests
+
+    def test_rebound_hosts(self) -> None:
+        """Should refuse connections that reach a private address even though the host was checked as public."""
+
+        async def lookup(_: str) -> list[str]:
+            await asyncio.sleep(0)
+            return ["93.184.216.34"]  # NOTE: The connection resolves localhost on its own, which is 127.0.0.1
+
+        channel = build_webhook(1)
+        port = self.server.url.rsplit(":", 1)[1]
+        dispatcher = NotificationDispatcher(
+            builders={ChannelType.WEBHOOK: lambda _, body: DeliveryRequest(f"http://localhost:{port}/", body)},
+            resolver=HostResolver(lookup),
+        )
+
+        async def run() -> list:
+            async with dispatcher:
+                return await dispatcher.dispatch([(channel, {"id": 1})])
+
+        (delivery,) = asyncio.run(run())
+
+        assert not delivery.delivered
+        assert "private address" in str(delivery.error)
+        assert not self.server.requests
+
+    def test_missing_builder(self) -> None:
+        """Should skip the channels whose requests can't be built."""
+        channel = WhatsappConfiguration.model_validate({"id": ulid.from_int(1), "phone_number": "+56912345678"})
+        (delivery,) = self.dispatch([(channel, {"id": 1})])
+
+        assert delivery.attempts == 0
+        assert not delivery.delivered
+        assert not self.server.requests
+
+
+class TestDeliveryResponse:
+    def test_retry_after(self) -> None:
+        """Should read the Retry-After header either in seconds or as an HTTP date."""
+        later = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+
+        assert DeliveryResponse(429, {"retry-after": "5"}).retry_after == 5  # noqa: PLR2004
+        assert 0 < (DeliveryResponse(429, {"retry-after": later}).retry_after or 0) <= 30  # noqa: PLR2004
+        assert DeliveryResponse(429, {"retry-after": "soon"}).retry_after is None
+        assert DeliveryResponse(429).retry_after is None
+
+
+class TestRequestBuilders:
+    def test_webhook(self) -> None:
+        """Should post the payload to the URL of the webhook."""
+        request = build_webhook_request(build_webhook(1), b"{}")
+        assert (request.method, request.url, request.body) == ("POST", "https://example.com/1", b"{}")
+
+    def test_ifttt(self) -> None:
+        """Should trigger the IFTTT event of the channel."""
+        channel = IFTTTConfiguration.model_validate({"id": ulid.from_int(1), "key": "secret", "event": "promising"})
+        request = build_ifttt_request(channel, b"{}")
+        assert request.url == "https://maker.ifttt.com/trigger/promising/json/with/key/secret"
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from typing import Any
+
+from google.api_core.exceptions import DeadlineExceeded, ServiceUnavailable
+from google.pubsub_v1 import PubsubMessage, PullResponse, ReceivedMessage
+
+from cumplo_common.middlewares import PubSubConsumer
+from cumplo_common.middlewares.pubsub import PubSubEvent
+
+BATCH_SIZE = 8
+CONCURRENCY = 4
+MESSAGES = 20
+
+
+class FakeSubscriber:
+    """In-memory stand-in of the subscriber client."""
+
+    def __init__(self, messages: list[ReceivedMessage], errors: list[Exception] | None = None) -> None:
+        self.messages = messages
+        self.errors = errors or []
+        self.acknowledged: list[str] = []
+        self.rejected: list[str] = []
+
+    def pull(self, request: dict) -> PullResponse:
+        if self.errors:
+            raise self.errors.pop(0)
+        batch, self.messages = self.messages[: request["max_messages"]], self.messages[request["max_messages"] :]
+        return PullResponse(received_messages=batch)
+
+    def acknowledge(self, request: dict) -> None:
+        self.acknowledged.extend(request["ack_ids"])
+
+    def modify_ack_deadline(self, request: dict) -> None:
+        assert request["ack_deadline_seconds"] == 0
+        self.rejected.extend(request["ack_ids"])
+
+
+def build_message(index: int) -> ReceivedMessage:
+    """Build a pulled message whose content is its index."""
+    data = json.dumps({"id": index}).encode()
+    message = PubsubMessage(data=data, attributes={"id_user": "user"}, message_id=str(index))
+    return ReceivedMessage(ack_id=f"ack-{index}", message=message)
+
+
+class TestPubSubConsumer:
+    def test_acknowledges_individually(self) -> None:
+        """Should ack the handled messages and nack the ones whose handler failed."""
+        subscriber = FakeSubscriber([build_message(index) for index in range(BATCH_SIZE + 2)])
+        handled: list[dict] = []
+
+        async def handler(event: PubSubEvent) -> None:
+            await asyncio.sleep(0)
+            content = json.loads(event.message.decoded_data)
+            if content["id"] % 3 == 0:
+                raise RuntimeError("Boom")
+            assert event.id_user == "user"
+            handled.append(content)
+
+        consumer = PubSubConsumer("projects/test/subscriptions/test", handler, batch_size=BATCH_SIZE, client=subscriber)  # type: ignore[arg-type]
+        result = asyncio.run(consumer.pull())
+
+        assert result.acknowledged == ["1", "2", "4", "5", "7"]
+        assert result.rejected == ["0", "3", "6"]
+        assert subscriber.acknowledged == [f"ack-{index}" for index in (1, 2, 4, 5, 7)]
+        assert subscriber.rejected == [f"ack-{index}" for index in (0, 3, 6)]
+        assert [message.ack_id for message in subscriber.messages] == ["ack-8", "ack-9"]
+
+    def test_bounded_concurrency(self) -> None:
+        """Should never run more handlers at once than the given concurrency."""
+        subscriber = FakeSubscriber([build_message(index) for index in range(MESSAGES)])
+        running, peak = 0, 0
+
+        async def handler(_: PubSubEvent) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+        consumer = PubSubConsumer("test", handler, batch_size=MESSAGES, concurrency=CONCURRENCY, client=subscriber)  # type: ignore[arg-type]
+        result = asyncio.run(consumer.pull())
+
+        assert len(result.acknowledged) == MESSAGES
+        assert peak == CONCURRENCY
+
+    def test_sync_handlers(self) -> None:
+        """Should run synchronous handlers in worker threads."""
+        subscriber = FakeSubscriber([build_message(index) for index in range(3)])
+        handled: list[str] = []
+
+        def handler(event: PubSubEvent) -> Any:
+            handled.append(event.message.message_id)
+
+        result = asyncio.run(PubSubConsumer("test", handler, client=subscriber).pull())  # type: ignore[arg-type]
+
+        assert sorted(handled) == ["0", "1", "2"]
+        assert result.acknowledged == ["0", "1", "2"]
+
+    def test_raw_data(self) -> None:
+        """Should expose the data of pulled messages as is, without decoding it back from base64."""
+        subscriber = FakeSubscriber([build_message(0)])
+        events: list[PubSubEvent] = []
+
+        result = asyncio.run(PubSubConsumer("test", events.append, client=subscriber).pull())  # type: ignore[arg-type]
+
+        assert result.acknowledged == ["0"]
+        assert events[0].message.__dict__["decoded_data"] == b'{"id": 0}'
+        assert json.loads(events[0].message.decoded_data) == {"id": 0}
+        assert events[0].message.data == "eyJpZCI6IDB9"
+        assert events[0].id_user == "user"
+
+    def test_survives_transient_errors(self) -> None:
+        """Should back off and keep pulling when calling Pub/Sub fails."""
+        errors: list[Exception] = [ServiceUnavailable("Unavailable"), DeadlineExceeded("Deadline")]
+        subscriber = FakeSubscriber([build_message(index) for index in range(3)], errors)
+        stop = asyncio.Event()
+        handled: list[str] = []
+
+        async def handler(event: PubSubEvent) -> None:
+            await asyncio.sleep(0)
+            handled.append(event.message.message_id)
+            stop.set()
+
+        consumer = PubSubConsumer("test", handler, client=subscriber, backoff=0.001)  # type: ignore[arg-type]
+        asyncio.run(asyncio.wait_for(consumer.run(stop), timeout=5))
+
+        assert not subscriber.errors
+        assert sorted(handled) == ["0", "1", "2"]
+        assert subscriber.acknowledged == ["ack-0", "ack-1", "ack-2"]
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from base64 import b64encode
+
+from starlette.types import Scope
+
+from cumplo_common.middlewares import PubSubMiddleware
+from cumplo_common.middlewares.pubsub import PubSubEvent
+from cumplo_common.models.utils import Event, EventModel
+from tests.asgi import call, endpoint
+
+
+class Sample(EventModel):
+    name: str
+
+
+class SampleEvent(Event):
+    SAMPLE_CREATED = "sample.created", Sample
+
+
+def build_push(content: dict, **attributes: str) -> bytes:
+    """Build the body of a Pub/Sub push request."""
+    return json.dumps({
+        "message": {
+            "messageId": "1",
+            "data": b64encode(json.dumps(content).encode()).decode(),
+            "attributes": attributes,
+        },
+        "subscription": "projects/test/subscriptions/test",
+    }).encode()
+
+
+class TestPubSubMiddleware:
+    def setup_method(self) -> None:
+        self.received: list[tuple[Scope, bytes]] = []
+
+        def callback(scope: Scope, body: bytes) -> None:
+            self.received.append((scope, body))
+
+        self.app = PubSubMiddleware(endpoint(callback), events=[SampleEvent])
+
+    def test_unwraps_push_messages(self) -> None:
+        """Should replace the body with the decoded data and expose the event in the request state."""
+        asyncio.run(call(self.app, build_push({"id": 1}, id_user="user")))
+
+        ((scope, body),) = self.received
+        assert json.loads(body) == {"id": 1}
+        assert dict(scope["headers"])[b"content-length"] == str(len(body)).encode()
+        event = scope["state"]["event"]
+        assert isinstance(event, PubSubEvent)
+        assert event.id_user == "user"
+
+    def test_passes_through_other_json(self) -> None:
+        """Should forward JSON bodies that aren't Pub/Sub events untouched."""
+        asyncio.run(call(self.app, b'{"hello": "world"}'))
+
+        ((scope, body),) = self.received
+        assert body == b'{"hello": "world"}'
+        assert "event" not in scope.get("state", {})
+
+    def test_skips_non_json_requests(self) -> None:
+        """Should not parse bodies of requests that aren't JSON POST requests."""
+        push = build_push({"id": 1})
+        asyncio.run(call(self.app, push, content_type="text/plain"))
+        asyncio.run(call(self.app, push, method="PUT"))
+
+        assert [body for _, body in self.received] == [push, push]
+        assert all("event" not in scope.get("state", {}) for scope, _ in self.received)
+
+    def test_decodes_registered_events(self) -> None:
+        """Should decode the content of registered events into their model."""
+        asyncio.run(call(self.app, build_push({"id": 1, "name": "sample"}, event="sample.created")))
+
+        ((scope, body),) = self.received
+        assert scope["state"]["content"] == Sample(id=1, name="sample")
+        assert json.loads(body) == {"id": 1, "name": "sample"}
+
+    def test_ignores_unknown_or_invalid_events(self) -> None:
+        """Should not expose any content for unregistered events or payloads that don't match the model."""
+        asyncio.run(call(self.app, build_push({"id": 1, "name": "sample"}, event="sample.deleted")))
+        asyncio.run(call(self.app, build_push({"id": "one"}, event="sample.created")))
+
+        assert all("content" not in scope["state"] for scope, _ in self.received)
+        assert all("event" in scope["state"] for scope, _ in self.received)
@@ -0,0 +1,58 @@
+import pytest
+from pydantic import ValidationError
+
+from cumplo_common.models import FundingRequest
+from tests.factories import build_funding_request
+
+
+class TestFrozenBaseModel:
+    def setup_method(self) -> None:
+        self.payload = build_funding_request(3)
+        self.funding_request = FundingRequest.model_validate(self.payload)
+
+    def test_immutable(self) -> None:
+        """Should not allow changing the fields of the model or its nested models."""
+        with pytest.raises(ValidationError, match="frozen"):
+            self.funding_request.amount = 1  # type: ignore[misc]
+        with pytest.raises(ValidationError, match="frozen"):
+            self.funding_request.simulation.installments[0].capital = 1  # type: ignore[misc]
+
+    def test_nested_models_mutable(self) -> None:
+        """Should only freeze the snapshot models, leaving the models nested in them as they were."""
+        self.funding_request.borrower.portfolio.active.count = 1
+        self.funding_request.duration.value = 1
+        assert self.funding_request.borrower.portfolio.active.count == 1
+        assert self.funding_request.duration.value == 1
+
+    def test_isolated_fields_set(self) -> None:
+        """Should give each instance its own fields set, even when every field was given."""
+        other = FundingRequest.model_validate(build_funding_request(4))
+        assert self.funding_request.model_fields_set is not other.model_fields_set
+
+        self.funding_request.model_fields_set.discard("id")
+        assert "id" in other.model_fields_set
+        assert "id" in other.model_dump(exclude_unset=True)
+        assert "id" in FundingRequest.model_validate(self.payload).model_fields_set
+
+    def test_partial_fields_set(self) -> None:
+        """Should keep its own fields set when some fields were left to their defaults."""
+        payload = self.payload.copy()
+        del payload["supporting_documents"]
+        funding_request = FundingRequest.model_validate(payload)
+        assert funding_request.model_fields_set == set(FundingRequest.model_fields) - {"supporting_documents"}
+        assert "supporting_documents" not in funding_request.model_dump(exclude_unset=True)
+
+    def test_copy_with_update(self) -> None:
+        """Should copy with updated values, leaving the original untouched."""
+        simulation = self.funding_request.simulation
+        copied = self.funding_request.model_copy(update={"simulation": simulation.model_copy(update={"capital": 0})})
+
+        assert copied.simulation.capital == 0
+        assert self.funding_request.simulation.capital == simulation.capital
+        assert self.funding_request.model_copy(deep=True) == self.funding_request
+
+    def test_hash(self) -> None:
+        """Should keep hashing and comparing by content."""
+        other = FundingRequest.model_validate(self.payload)
+        assert hash(other) == hash(self.funding_request)
+        assert other == self.funding_request
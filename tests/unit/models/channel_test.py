@@ -0,0 +1,61 @@
+import random
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from cumplo_common.models import User
+from cumplo_common.models.channel import (
+    ChannelConfiguration,
+    ChannelConfigurationType,
+    IFTTTConfiguration,
+    TaggedChannelConfigurationType,
+    WebhookConfiguration,
+    WhatsappConfiguration,
+)
+from tests.factories import build_channel, build_user
+
+ID = "01J00000000000000000000000"
+
+
+class TestTaggedChannelConfiguration:
+    def setup_method(self) -> None:
+        self.union: TypeAdapter = TypeAdapter(ChannelConfigurationType)
+        self.tagged: TypeAdapter = TypeAdapter(TaggedChannelConfigurationType)
+
+    def test_same_as_union(self) -> None:
+        """Should validate every channel into the same model as the plain union."""
+        generator = random.Random(0)  # noqa: S311
+        for _ in range(100):
+            channel = build_channel(generator)
+            assert self.tagged.validate_python(channel) == self.union.validate_python(channel)
+
+    @pytest.mark.parametrize(
+        ("channel", "model"),
+        [
+            ({"type_": "ifttt", "key": "key", "event": "event"}, IFTTTConfiguration),
+            ({"type_": "WhatsApp", "phone_number": "+56912345678"}, WhatsappConfiguration),
+            ({"type_": "webhook", "url": "https://example.com"}, WebhookConfiguration),
+        ],
+    )
+    def test_case_insensitive(self, channel: dict, model: type[ChannelConfiguration]) -> None:
+        """Should pick the model of the channel type case insensitively."""
+        configuration = self.tagged.validate_python({"id": ID, **channel})
+        assert type(configuration) is model
+        assert isinstance(configuration, ChannelConfiguration)
+        assert configuration.type_ == channel["type_"].upper()
+
+    def test_without_type(self) -> None:
+        """Should fall back to trying every model when the channel has no type."""
+        configuration = self.tagged.validate_python({"id": ID, "phone_number": "+56912345678"})
+        assert isinstance(configuration, WhatsappConfiguration)
+
+    @pytest.mark.parametrize("type_", ["IFTTT", "unknown"])
+    def test_invalid(self, type_: str) -> None:
+        """Should reject channels that don't match the model of their type."""
+        with pytest.raises(ValidationError):
+            self.tagged.validate_python({"id": ID, "type_": type_, "url": "https://example.com"})
+
+    def test_user_round_trip(self) -> None:
+        """Should load the channels of a user from its own serialization."""
+        user = User.model_validate(build_user(random.Random(0), channels=10))  # noqa: S311
+        assert User.model_validate_json(user.model_dump_json()) == user
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from threading import get_ident
+
+import pytest
+
+from cumplo_common.models import EventDispatcher
+from cumplo_common.models.utils import Event, EventModel
+
+
+class Sample(EventModel):
+    name: str
+
+
+class Other(EventModel):
+    amount: int
+
+
+class SampleEvent(Event):
+    SAMPLE_CREATED = "sample.created", Sample
+    SAMPLE_DELETED = "sample.deleted", Sample
+    OTHER_CREATED = "other.created", Other
+
+
+class TestEventDispatcher:
+    def setup_method(self) -> None:
+        self.dispatcher = EventDispatcher()
+        self.handled: list[tuple[str, EventModel]] = []
+
+        @self.dispatcher.on(SampleEvent.SAMPLE_CREATED, SampleEvent.SAMPLE_DELETED)
+        async def handle_sample(content: Sample) -> None:
+            await asyncio.sleep(0)
+            if content.name == "boom":
+                raise RuntimeError("Boom")
+            self.handled.append(("sample", content))
+
+        @self.dispatcher.on(SampleEvent.OTHER_CREATED)
+        def handle_other(content: Other) -> None:
+            assert get_ident() != self.loop_thread
+            self.handled.append(("other", content))
+
+        self.loop_thread = get_ident()
+
+    def test_dispatch(self) -> None:
+        """Should validate the content with the model of the event and call its handlers."""
+        content = asyncio.run(self.dispatcher.dispatch("sample.created", b'{"id": 1, "name": "first"}'))
+
+        assert content == Sample(id=1, name="first")
+        assert self.handled == [("sample", content)]
+        assert self.dispatcher.stats["sample.created"].count == 1
+
+    def test_content_types(self) -> None:
+        """Should accept JSON, data and already validated models."""
+        other = Other(id=3, amount=10)
+        for content in ('{"id": 3, "amount": 10}', {"id": 3, "amount": "10"}, other):
+            assert asyncio.run(self.dispatcher.dispatch("other.created", content)) == other
+        assert [content for _, content in self.handled] == [other] * 3
+
+    def test_multiple_handlers(self) -> None:
+        """Should call every handler of an event."""
+        self.dispatcher.register(SampleEvent.SAMPLE_CREATED, lambda content: self.handled.append(("lambda", content)))
+        asyncio.run(self.dispatcher.dispatch("sample.created", {"id": 1, "name": "first"}))
+
+        assert sorted(name for name, _ in self.handled) == ["lambda", "sample"]
+
+    def test_errors(self) -> None:
+        """Should reject unknown events and invalid content, and propagate handler errors."""
+        with pytest.raises(ValueError, match="has no handlers"):
+            asyncio.run(self.dispatcher.dispatch("unknown", b"{}"))
+        with pytest.raises(ValueError, match="validation error"):
+            asyncio.run(self.dispatcher.dispatch("sample.created", b'{"id": 1}'))
+        with pytest.raises(RuntimeError, match="Boom"):
+            asyncio.run(self.dispatcher.dispatch("sample.created", {"id": 1, "name": "boom"}))
+
+        stats = self.dispatcher.stats["sample.created"]
+        assert (stats.count, stats.failures) == (2, 2)
+        assert "unknown" not in self.dispatcher.stats
+
+    def test_dispatch_many(self) -> None:
+        """Should handle a batch of mixed events, reporting the error of each message in order."""
+        messages: list[tuple[str, bytes | dict]] = [
+            ("sample.created", json.dumps({"id": index, "name": f"sample-{index}"}).encode()) for index in range(5)
+        ]
+        messages.extend([
+            ("other.created", b'{"id": 10, "amount": 1}'),
+            ("sample.deleted", {"id": 11, "name": "boom"}),
+            ("sample.created", b'{"id": 12}'),
+            ("unknown", b"{}"),
+        ])
+        errors = asyncio.run(self.dispatcher.dispatch_many(messages))
+
+        assert errors[:6] == [None] * 6
+        failed, invalid, unknown = errors[6:]
+        assert isinstance(failed, RuntimeError)
+        assert isinstance(invalid, ValueError)
+        assert isinstance(unknown, ValueError)
+        assert sorted(content.id for _, content in self.handled) == [0, 1, 2, 3, 4, 10]
+
+        stats = self.dispatcher.stats
+        assert (stats["sample.created"].count, stats["sample.created"].failures) == (6, 1)
+        assert (stats["sample.deleted"].count, stats["sample.deleted"].failures) == (1, 1)
+        assert stats["other.created"].mean > 0
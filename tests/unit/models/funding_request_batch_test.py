@@ -0,0 +1,55 @@
+from cumplo_common.models import CreditType, FundingRequest, FundingRequestBatch
+from tests.factories import build_funding_requests
+
+MINIMUM_IRR = 15
+
+
+class TestFundingRequestBatch:
+    def setup_method(self) -> None:
+        self.models = [FundingRequest.model_validate(payload) for payload in build_funding_requests(50)]
+        self.batch = FundingRequestBatch.from_models(self.models)
+
+    def test_columns(self) -> None:
+        """Should store the scalar fields of every funding request."""
+        assert len(self.batch) == len(self.models)
+        assert list(self.batch.column("id")) == [model.id for model in self.models]
+        assert list(self.batch.column("irr")) == [float(model.irr) for model in self.models]
+        assert list(self.batch.column("profit_rate")) == [float(model.profit_rate) for model in self.models]
+        assert self.batch.values("credit_type") == [model.credit_type for model in self.models]
+        assert self.batch.values("currency") == [model.currency for model in self.models]
+
+    def test_views(self) -> None:
+        """Should expose the columns of a row and lazily validate the full model."""
+        view = self.batch[3]
+        assert view.id == self.models[3].id
+        assert view.credit_type == self.models[3].credit_type
+        assert view.model == self.models[3]
+        assert view.model is view.model
+        assert [view.id for view in self.batch] == [model.id for model in self.models]
+
+    def test_slicing_shares_data(self) -> None:
+        """Should slice without copying the columns or rows."""
+        sliced = self.batch[10:20:2]
+        assert sliced.columns is self.batch.columns
+        assert sliced.rows is self.batch.rows
+        assert [view.id for view in sliced] == [model.id for model in self.models[10:20:2]]
+        assert self.batch.column("amount") is self.batch.columns["amount"]
+
+    def test_filter_and_sort(self) -> None:
+        """Should filter and order the rows by their columns."""
+        filtered = self.batch.filter(irr >= MINIMUM_IRR for irr in self.batch.column("irr"))
+        assert [view.id for view in filtered] == [model.id for model in self.models if model.irr >= MINIMUM_IRR]
+
+        factoring = filtered.where("credit_type", lambda credit_type: credit_type == CreditType.FACTORING)
+        expected = [
+            model for model in self.models if model.irr >= MINIMUM_IRR and model.credit_type == CreditType.FACTORING
+        ]
+        assert factoring.models() == expected
+
+        ranked = filtered.sort("profit_rate", reverse=True)[:5]
+        expected = sorted(
+            (model for model in self.models if model.irr >= MINIMUM_IRR),
+            key=lambda model: model.profit_rate,
+            reverse=True,
+        )
+        assert [float(view.profit_rate) for view in ranked] == [float(model.profit_rate) for model in expected[:5]]
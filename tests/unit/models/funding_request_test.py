@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from cumplo_common.models import FundingRequest, FundingRequestBatch, FundingRequestDelta, PrivateEvent
+from cumplo_common.models.utils import EventModel
+from tests.factories import build_funding_request, build_funding_requests
+
+
+class TestValidateMany:
+    def setup_method(self) -> None:
+        self.payloads = build_funding_requests(20)
+        self.models = [FundingRequest.model_validate(payload) for payload in self.payloads]
+
+    def test_validate_from_bytes(self) -> None:
+        """Should validate the same funding requests as validating them one by one."""
+        assert FundingRequest.validate_many(json.dumps(self.payloads).encode()) == self.models
+
+    def test_invalid_payloads(self) -> None:
+        """Should fail when any of the funding requests is invalid."""
+        self.payloads[3]["irr"] = "not a number"
+        with pytest.raises(ValidationError):
+            FundingRequest.validate_many(json.dumps(self.payloads))
+
+    def test_batch_from_json(self) -> None:
+        """Should build a batch straight from the raw JSON."""
+        batch = FundingRequestBatch.from_json(json.dumps(self.payloads))
+        assert batch.models() == self.models
+
+
+class TestDelta:
+    def setup_method(self) -> None:
+        self.payload = build_funding_request(7, raised_amount=0, raised_percentage="0.5", investors=10)
+        self.snapshot = FundingRequest.model_validate(self.payload)
+        self.update = {"raised_amount": self.payload["amount"], "raised_percentage": "1", "investors": 25}
+        self.newer = FundingRequest.model_validate(self.payload | self.update)
+
+    def test_diff(self) -> None:
+        """Should only carry the changed funding fields."""
+        delta = self.snapshot.diff(self.newer)
+        assert delta == FundingRequestDelta.model_validate({"id": 7, **self.update})
+
+        newer = FundingRequest.model_validate(self.payload | {"investors": 11})
+        assert self.snapshot.diff(newer) == FundingRequestDelta.model_validate({"id": 7, "investors": 11})
+
+    def test_diff_without_changes(self) -> None:
+        """Should return None when no funding field changed."""
+        assert self.snapshot.diff(FundingRequest.model_validate(self.payload)) is None
+
+    def test_diff_other_funding_request(self) -> None:
+        """Should refuse to diff snapshots of different funding requests."""
+        other = FundingRequest.model_validate(self.payload | {"id": 8})
+        with pytest.raises(ValueError, match="Can't diff"):
+            self.snapshot.diff(other)
+
+    def test_apply(self) -> None:
+        """Should match the newer snapshot, recomputing only the dependent cached fields."""
+        assert not self.snapshot.is_completed
+        profit_rate = self.snapshot.profit_rate
+
+        delta = self.snapshot.diff(self.newer)
+        assert delta is not None
+        updated = self.snapshot.apply(delta)
+
+        assert updated.is_completed
+        assert updated.__dict__["profit_rate"] is profit_rate
+        assert updated.model_dump_json() == self.newer.model_dump_json()
+        assert not self.snapshot.is_completed
+
+    def test_apply_other_funding_request(self) -> None:
+        """Should refuse deltas of other funding requests."""
+        with pytest.raises(ValueError, match="Can't apply"):
+            self.snapshot.apply(FundingRequestDelta.model_validate({"id": 8, "investors": 1}))
+
+    def test_event_round_trip(self) -> None:
+        """Should publish and decode the delta through its event model."""
+        delta = self.snapshot.diff(self.newer)
+        assert delta is not None
+        assert PrivateEvent.FUNDING_REQUEST_UPDATED.model is FundingRequestDelta
+        content = FundingRequestDelta.model_validate_json(json.dumps(delta.json()))
+        assert self.snapshot.apply(content) == self.newer
+
+    def test_event_model(self) -> None:
+        """Should be an event model whose dumps only carry the changed fields."""
+        delta = FundingRequestDelta.model_validate({"id": 7, "investors": 11})
+
+        assert issubclass(FundingRequestDelta, EventModel)
+        assert delta.json() == {"id": 7, "investors": 11}
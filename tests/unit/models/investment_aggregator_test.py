@@ -0,0 +1,92 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from cumplo_common.models import (
+    Investment,
+    InvestmentAggregator,
+    InvestmentDimension,
+    InvestmentPortfolio,
+    PrivateEvent,
+)
+from tests.factories import build_investment
+
+NEW_INVESTMENT = 500
+
+
+def expected_summaries(investments: list[Investment], dimension: InvestmentDimension) -> dict[str, dict]:
+    """Compute the totals of each group by looping over the investments."""
+    groups: dict[str, dict] = defaultdict(lambda: defaultdict(int))
+    for investment in investments:
+        totals = groups[str(getattr(investment, dimension.value))]
+        totals["count"] += 1
+        totals["delinquent"] += investment.days_delinquent > 0
+        for metric in ("amount", "paid_capital", "insolvent_capital", "interest", "upfront_fee", "exit_fee"):
+            totals[metric] += getattr(investment, metric)
+        totals["exposure"] += investment.amount - investment.paid_capital
+    return {key: dict(totals) for key, totals in groups.items()}
+
+
+class TestInvestmentAggregator:
+    def setup_method(self) -> None:
+        self.generator = random.Random(0)  # noqa: S311
+        self.investments = {id_: Investment.model_validate(build_investment(id_, self.generator)) for id_ in range(100)}
+        portfolio = InvestmentPortfolio.model_validate({"investments": self.investments})
+        self.aggregator = InvestmentAggregator.from_portfolio(portfolio)
+
+    def assert_summaries(self) -> None:
+        """Assert every summary matches the totals computed from scratch."""
+        investments = list(self.investments.values())
+        for dimension in InvestmentDimension:
+            summaries = {key: summary.model_dump() for key, summary in self.aggregator.summarize(dimension).items()}
+            assert summaries == expected_summaries(investments, dimension)
+
+        total = self.aggregator.total()
+        assert total.count == len(investments)
+        assert total.amount == sum(investment.amount for investment in investments)
+
+    def test_summaries(self) -> None:
+        """Should compute the totals of every group of every dimension."""
+        assert len(self.aggregator) == len(self.investments)
+        self.assert_summaries()
+
+    def test_upsert(self) -> None:
+        """Should move a changed investment between groups and add new ones."""
+        changed = self.investments[7].model_copy(update={"status": "REFUNDED", "paid_capital": 0})
+        self.investments[7] = changed
+        self.investments[NEW_INVESTMENT] = Investment.model_validate(build_investment(NEW_INVESTMENT, self.generator))
+        self.aggregator.upsert(changed)
+        self.aggregator.upsert(self.investments[NEW_INVESTMENT])
+
+        assert NEW_INVESTMENT in self.aggregator
+        self.assert_summaries()
+
+    def test_remove(self) -> None:
+        """Should drop removed investments and empty groups, reusing their rows."""
+        for id_ in range(0, 100, 3):
+            assert self.aggregator.remove(self.investments.pop(id_).id)
+        assert not self.aggregator.remove(1000)
+        self.assert_summaries()
+
+        rows = len(self.aggregator.metrics["count"])
+        self.investments[1000] = Investment.model_validate(build_investment(1000, self.generator))
+        self.aggregator.upsert(self.investments[1000])
+        assert len(self.aggregator.metrics["count"]) == rows
+        self.assert_summaries()
+
+    def test_empty(self) -> None:
+        """Should summarize an empty portfolio."""
+        aggregator = InvestmentAggregator()
+        assert aggregator.total().count == 0
+        assert aggregator.summarize(InvestmentDimension.STATUS) == {}
+
+    def test_apply_events(self) -> None:
+        """Should update the aggregation from investment events only."""
+        repaid = self.investments[3].model_copy(update={"status": "PAID"})
+        self.investments[3] = repaid
+        self.aggregator.apply(PrivateEvent.INVESTMENT_REPAID, repaid)
+        self.assert_summaries()
+
+        with pytest.raises(ValueError, match="doesn't carry an investment"):
+            self.aggregator.apply(PrivateEvent.USER_DELETED, repaid)
@@ -1,4 +1,8 @@
-from cumplo_common.models import StrEnum
+import pytest
+from pydantic import TypeAdapter
+
+from cumplo_common.models import ChannelType, PrivateEvent, PublicEvent, StrEnum
+from cumplo_common.models.utils import Event, EventModel
 
 
 class TestStrEnum:
@@ -23,3 +27,36 @@ class TestStrEnum:
         for verb in ("GET", "POST", "PATCH"):
             for verb_case in (verb.upper(), verb.lower(), verb.title()):
                 assert self.HTTPVerb(verb_case) == getattr(self.HTTPVerb, verb.upper())
+
+    def test_invalid_values(self) -> None:
+        """Should reject values that don't match any member, and lookup names only through `has_member`."""
+        with pytest.raises(ValueError, match="is not a valid"):
+            self.HTTPVerb("RUN")
+        with pytest.raises(ValueError, match="is not a valid"):
+            self.HTTPVerb(1)  # type: ignore[arg-type]
+        assert ChannelType("webhook") is ChannelType.WEBHOOK
+        assert PrivateEvent.has_member("user_deleted")
+        assert not PrivateEvent.has_member("user.deleted")
+
+
+class Sample(EventModel):
+    name: str
+
+
+class SampleEvent(Event):
+    SAMPLE_CREATED = "sample.created", EventModel
+    SAMPLE_RENAMED = "sample.renamed", Sample, True
+
+
+class TestEvent:
+    def test_models(self) -> None:
+        """Should map the value of every event to the model it carries."""
+        assert SampleEvent.models() == {"sample.created": EventModel, "sample.renamed": Sample}
+        assert PrivateEvent.models()["user.deleted"] is PrivateEvent.USER_DELETED.model
+        assert set(PublicEvent.models()) == {event.value for event in PublicEvent}
+
+    def test_lookup(self) -> None:
+        """Should find events case insensitively, keeping their model."""
+        event = TypeAdapter(SampleEvent).validate_python("Sample.Renamed")
+        assert event is SampleEvent.SAMPLE_RENAMED
+        assert event.is_recurring
@@ -19,6 +19,12 @@ class TestNotification:
             assert notification.content_id == int(id_.split("-")[1])
             assert notification.event == event
 
+    def test_dismiss(self) -> None:
+        """Should allow dismissing a notification."""
+        notification = Notification.new(PublicEvent.FUNDING_REQUEST_PROMISING, 1)
+        notification.dismissed = True
+        assert notification.dismissed
+
     @pytest.mark.parametrize(
         "invalid_id",
         [
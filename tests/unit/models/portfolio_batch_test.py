@@ -0,0 +1,61 @@
+import random
+from itertools import product
+
+import pytest
+
+from cumplo_common.models import Portfolio, PortfolioBatch, PortfolioCategory
+from cumplo_common.models.portfolio import PortfolioCategoryUnit
+from tests.factories import build_portfolio
+
+UNITS = [PortfolioCategoryUnit.AMOUNT, PortfolioCategoryUnit.COUNT]
+
+
+def build_portfolios(count: int) -> list[Portfolio]:
+    """Build random portfolios, including empty ones and fractional amounts."""
+    generator = random.Random(0)  # noqa: S311
+    groups = list(build_portfolio(generator))
+    portfolios = [Portfolio.model_validate(build_portfolio(generator)) for _ in range(count)]
+    portfolios.extend([
+        Portfolio.model_validate({group: {"amount": 0, "count": 0} for group in groups}),
+        Portfolio.model_validate({
+            group: {"amount": f"{generator.randint(0, 10**6)}.{generator.randint(0, 99)}", "count": 1}
+            for group in groups
+        }),
+    ])
+    return portfolios
+
+
+class TestPortfolioBatch:
+    def setup_method(self) -> None:
+        self.portfolios = build_portfolios(200)
+        self.batch = PortfolioBatch.from_portfolios(self.portfolios)
+
+    def test_length(self) -> None:
+        """Should contain every portfolio."""
+        assert len(self.batch) == len(self.portfolios)
+
+    def test_amounts_and_counts(self) -> None:
+        """Should match every category and unit of the portfolios, including the derived categories."""
+        for unit, category in product(UNITS, PortfolioCategory):
+            expected = [portfolio.get(unit=unit, category=category) for portfolio in self.portfolios]
+            assert self.batch.get(unit=unit, category=category) == expected
+
+    def test_percentages(self) -> None:
+        """Should match the percentages of the portfolios exactly, including their exponent."""
+        for category, base, unit in product(PortfolioCategory, PortfolioCategory, UNITS):
+            percentage = PortfolioCategoryUnit.PERCENTAGE
+            expected = [
+                portfolio.get(unit=percentage, category=category, percentage_base=base, percentage_unit=unit)
+                for portfolio in self.portfolios
+            ]
+            values = self.batch.get(unit=percentage, category=category, percentage_base=base, percentage_unit=unit)
+            assert list(map(str, values)) == list(map(str, expected))
+
+    def test_percentage_of_percentages(self) -> None:
+        """Should refuse to compute percentages over percentages."""
+        with pytest.raises(ValueError, match="percentage"):
+            self.batch.get(
+                unit=PortfolioCategoryUnit.PERCENTAGE,
+                category=PortfolioCategory.PAID,
+                percentage_unit=PortfolioCategoryUnit.PERCENTAGE,
+            )
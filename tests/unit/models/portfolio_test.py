@@ -0,0 +1,45 @@
+import dataclasses
+import random
+
+import pytest
+
+from cumplo_common.models import Portfolio, PortfolioCategory
+from cumplo_common.models.portfolio import PortfolioCategoryUnit, PortfolioGroup
+from tests.factories import build_portfolio
+
+
+class TestDerivedGroups:
+    def setup_method(self) -> None:
+        self.payload = build_portfolio(random.Random(0))  # noqa: S311
+        self.portfolio = Portfolio.model_validate(self.payload)
+
+    def test_sums(self) -> None:
+        """Should derive the groups from the stored ones."""
+        groups = {name: PortfolioGroup.model_validate(group) for name, group in self.payload.items()}
+        outstanding = groups["active"].amount + groups["overdue"].amount + groups["delinquent"].amount
+        paid = groups["on_time"].amount + groups["cured"].amount
+
+        assert self.portfolio.outstanding.amount == outstanding
+        assert self.portfolio.paid.amount == paid
+        assert self.portfolio.total.amount == outstanding + paid
+        assert self.portfolio.total.count == sum(group.count for group in groups.values())
+
+    def test_serialization(self) -> None:
+        """Should serialize the derived groups just like stored groups."""
+        dump = self.portfolio.model_dump()
+        json_dump = self.portfolio.json()
+        for name in ("total", "outstanding", "paid"):
+            group = PortfolioGroup.model_validate(dataclasses.asdict(getattr(self.portfolio, name)))
+            assert dump[name] == group.model_dump()
+            assert json_dump[name] == group.json()
+
+    def test_immutable(self) -> None:
+        """Should not allow changing a derived group."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            self.portfolio.total.count = 0  # type: ignore[misc]
+
+    def test_get(self) -> None:
+        """Should get the derived groups in any unit."""
+        total = self.portfolio.total
+        assert self.portfolio.get(unit=PortfolioCategoryUnit.AMOUNT, category=PortfolioCategory.TOTAL) == total.amount
+        assert self.portfolio.get(unit=PortfolioCategoryUnit.COUNT, category=PortfolioCategory.TOTAL) == total.count
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from cumplo_common.models import ChannelRoutingIndex, PrivateEvent, PublicEvent, User
+from tests.factories import build_channel, build_user
+
+
+def scan(users: list[User], event: PublicEvent) -> set[tuple[str, str]]:
+    """Find the enabled routes of an event by scanning every channel of every user."""
+    return {
+        (str(user.id), id_channel)
+        for user in users
+        for id_channel, channel in user.channels.items()
+        if channel.enabled and channel.event_enabled(event)
+    }
+
+
+def routes(index: ChannelRoutingIndex, event: PublicEvent) -> set[tuple[str, str]]:
+    """Get the routes of an event from the index."""
+    return {
+        (str(user.id), next(key for key, value in user.channels.items() if value is channel))
+        for user, channel in index.targets(event)
+    }
+
+
+class TestChannelRoutingIndex:
+    def setup_method(self) -> None:
+        self.generator = random.Random(0)  # noqa: S311
+        self.users = [User.model_validate(build_user(self.generator)) for _ in range(50)]
+        self.index = ChannelRoutingIndex.from_users(self.users)
+
+    def assert_routes(self) -> None:
+        """Assert the index routes match a full scan."""
+        for event in PublicEvent:
+            assert routes(self.index, event) == scan(self.users, event)
+
+    def test_targets(self) -> None:
+        """Should route each event to the enabled channels that have it enabled."""
+        assert len(self.index) == len(self.users)
+        assert self.index.targets(PublicEvent.FUNDING_REQUEST_PROMISING)
+        self.assert_routes()
+
+    def test_channels_updated(self) -> None:
+        """Should replace the routes of a user whose channels changed."""
+        payload = build_user(self.generator, channels=0)
+        payload["channels"] = {
+            "webhook": build_channel(self.generator, type_="WEBHOOK", url="https://example.com", enabled_events=["all"])
+        }
+        payload["channels"]["webhook"].update(enabled=True)
+        user = User.model_validate(payload | {"id": str(self.users[4].id)})
+        self.users[4] = user
+
+        targets = self.index.targets(PublicEvent.FUNDING_REQUEST_PROMISING)
+        self.index.apply(PrivateEvent.USER_CHANNELS_UPDATED, user)
+
+        assert self.index.targets(PublicEvent.FUNDING_REQUEST_PROMISING) is not targets
+        self.assert_routes()
+
+    def test_user_deleted(self) -> None:
+        """Should drop every route of a deleted user."""
+        user = self.users.pop(7)
+        self.index.apply(PrivateEvent.USER_DELETED, user)
+
+        assert user.id not in self.index
+        assert not self.index.remove(user.id)
+        self.assert_routes()
+
+    def test_cached_targets(self) -> None:
+        """Should reuse the targets of an event until its routes change."""
+        targets = self.index.targets(PublicEvent.FUNDING_REQUEST_PROMISING)
+        assert self.index.targets(PublicEvent.FUNDING_REQUEST_PROMISING) is targets
+
+    def test_other_events(self) -> None:
+        """Should refuse events that don't carry a user."""
+        with pytest.raises(ValueError, match="doesn't carry a user"):
+            self.index.apply(PrivateEvent.INVESTMENT_REPAID, self.users[0])
@@ -0,0 +1,88 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from cumplo_common.models import Simulation
+from cumplo_common.utils.rates import DAYS_PER_YEAR
+from tests.factories import START, build_simulation
+
+TOLERANCE = Decimal("0.0002")
+AMOUNT = 250_000
+
+
+class TestCashFlows:
+    def setup_method(self) -> None:
+        generator = random.Random(0)  # noqa: S311
+        self.single = Simulation.model_validate(build_simulation(generator, 1))
+        self.simulations = [Simulation.model_validate(build_simulation(generator, count)) for count in (1, 3, 6, 12)]
+
+    def test_cash_flows(self) -> None:
+        """Should pay the investment at the start and then receive the capital and net returns."""
+        for simulation in self.simulations:
+            amounts, days = simulation.cash_flows(START)
+            assert amounts[0] == -simulation.investment
+            # NOTE: The factory splits the capital and exit fee in whole installments, so they may be off by a unit each
+            rounding = 2 * len(simulation.installments)
+            assert abs(sum(amounts[1:]) - simulation.capital - simulation.net_returns) <= rounding
+            assert days == [0, *((installment.date - START).days for installment in simulation.installments)]
+
+    def test_scaled_cash_flows(self) -> None:
+        """Should scale the cash flows to the invested capital."""
+        amounts, _ = self.single.cash_flows(START, AMOUNT)
+        factor = AMOUNT / self.single.capital
+        assert amounts == [-self.single.investment * factor, self.single.installments[0].received * factor]
+
+    def test_xirr_of_single_installment(self) -> None:
+        """Should annualize the profit rate over the days until the installment is paid."""
+        days = (self.single.installments[0].date - START).days
+        growth = (self.single.capital + self.single.net_returns) / self.single.investment
+        expected = Decimal(growth ** (DAYS_PER_YEAR / days) - 1)
+        rate = self.single.xirr(START)
+        assert rate is not None
+        assert abs(rate - expected) <= TOLERANCE
+
+    def test_later_start(self) -> None:
+        """Should get a higher rate when investing closer to the payments."""
+        for simulation in self.simulations:
+            earlier, later = simulation.xirr(START), simulation.xirr(START + timedelta(days=10))
+            assert earlier is not None
+            assert later is not None
+            assert later > earlier
+
+    def test_batch(self) -> None:
+        """Should compute the same rates for many simulations as one by one."""
+        assert Simulation.xirrs(self.simulations, START) == [simulation.xirr(START) for simulation in self.simulations]
+
+    def test_scale(self) -> None:
+        """Should scale every amount of the simulation to the invested capital."""
+        for simulation in self.simulations:
+            scaled = simulation.scale(AMOUNT)
+            factor = AMOUNT / simulation.capital
+            assert scaled.capital == AMOUNT
+            assert scaled.investment == AMOUNT + round(simulation.upfront_fee * factor)
+            assert [installment.interest for installment in scaled.installments] == [
+                round(installment.interest * factor) for installment in simulation.installments
+            ]
+            assert [installment.date for installment in scaled.installments] == [
+                installment.date for installment in simulation.installments
+            ]
+            assert abs(scaled.profit_rate - simulation.profit_rate) <= TOLERANCE
+
+    def test_weighted_duration(self) -> None:
+        """Should weight the days until each installment by its capital."""
+        single_days = (self.single.installments[0].date - START).days
+        assert self.single.weighted_duration(START) == single_days
+
+        for simulation in self.simulations:
+            days = [(installment.date - START).days for installment in simulation.installments]
+            assert days[0] <= simulation.weighted_duration(START) <= days[-1]
+            assert simulation.weighted_duration(START + timedelta(days=5)) == simulation.weighted_duration(START) - 5
+
+    def test_duration_weighted_return(self) -> None:
+        """Should annualize the profit rate over the weighted duration."""
+        duration = self.single.weighted_duration(START)
+        profit_rate = (self.single.capital + self.single.net_returns) / self.single.investment - 1
+        assert self.single.duration_weighted_return(START) == round(Decimal(profit_rate * DAYS_PER_YEAR / duration), 4)
+
+        last_date = max(installment.date for installment in self.single.installments)
+        assert self.single.duration_weighted_return(last_date) is None
@@ -0,0 +1,53 @@
+from cumplo_common.utils.cache import NegativeCache
+from cumplo_common.utils.text import hash_key
+
+MAXSIZE = 3
+
+
+class TestNegativeCache:
+    def test_remembers_invalid_keys(self) -> None:
+        """Should remember the added keys and count the lookups."""
+        cache = NegativeCache()
+        cache.add("invalid")
+
+        assert "invalid" in cache
+        assert "valid" not in cache
+        assert cache.metrics == {"hits": 1, "misses": 1}
+
+    def test_never_stores_keys(self) -> None:
+        """Should only store the hashes of the keys."""
+        cache = NegativeCache()
+        cache.add("secret-api-key")
+
+        assert list(cache.cache) == [hash_key("secret-api-key")]
+
+    def test_discard(self) -> None:
+        """Should forget keys that became valid."""
+        cache = NegativeCache()
+        cache.add("new-key")
+        cache.discard("new-key")
+        cache.discard("unknown-key")
+
+        assert "new-key" not in cache
+
+    def test_bounds(self) -> None:
+        """Should keep a bounded number of keys and forget them once they expire."""
+        cache = NegativeCache(maxsize=MAXSIZE)
+        for index in range(MAXSIZE * 2):
+            cache.add(f"key-{index}")
+        assert len(cache) == MAXSIZE
+
+        expired = NegativeCache(ttl=0)
+        expired.add("key")
+        assert "key" not in expired
+
+    def test_known_hashes(self) -> None:
+        """Should look up and store keys by a hash that was already computed."""
+        cache = NegativeCache()
+        digest = hash_key("invalid")
+        cache.add("invalid", digest)
+
+        assert cache.contains_hash(digest)
+        assert "invalid" in cache
+        cache.discard("invalid", digest)
+        assert not cache.contains_hash(digest)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from cumplo_common.utils.dns import HostResolver, PrivateAddressError
+
+ADDRESSES = {
+    "public.example.com": ["93.184.216.34", "2606:2800:220:1:248:1893:25c8:1946"],
+    "private.example.com": ["93.184.216.34", "10.0.0.1"],
+    "loopback.example.com": ["::1"],
+}
+
+
+class TestHostResolver:
+    def setup_method(self) -> None:
+        self.lookups: list[str] = []
+
+        async def lookup(host: str) -> list[str]:
+            self.lookups.append(host)
+            await asyncio.sleep(0)
+            if host not in ADDRESSES:
+                raise OSError(f"Unknown host {host}")
+            return ADDRESSES[host]
+
+        self.resolver = HostResolver(lookup=lookup)
+
+    def test_public_hosts(self) -> None:
+        """Should accept hosts whose every address is public."""
+        asyncio.run(self.resolver.check_url("https://public.example.com/hook"))
+        asyncio.run(self.resolver.check_host("93.184.216.34"))
+
+    @pytest.mark.parametrize(
+        "url", ["https://private.example.com/hook", "https://loopback.example.com", "https://10.1.2.3"]
+    )
+    def test_private_hosts(self, url: str) -> None:
+        """Should refuse hosts that resolve to any private address, and private IP addresses."""
+        with pytest.raises(PrivateAddressError):
+            asyncio.run(self.resolver.check_url(url))
+
+    def test_unknown_hosts(self) -> None:
+        """Should propagate resolution errors without caching them."""
+        for _ in range(2):
+            with pytest.raises(OSError, match="Unknown host"):
+                asyncio.run(self.resolver.check_url("https://unknown.example.com"))
+        assert self.lookups == ["unknown.example.com"] * 2
+
+    def test_cache(self) -> None:
+        """Should resolve each host once, even when it's checked concurrently."""
+
+        async def check() -> None:
+            await asyncio.gather(*(self.resolver.check_url("https://public.example.com") for _ in range(10)))
+
+        asyncio.run(check())
+        asyncio.run(check())
+        assert self.lookups == ["public.example.com"]
+
+    def test_expiration(self) -> None:
+        """Should resolve hosts again once their addresses expire."""
+        resolver = HostResolver(lookup=self.resolver.lookup, ttl=0)
+        asyncio.run(resolver.check_url("https://public.example.com"))
+        asyncio.run(resolver.check_url("https://public.example.com"))
+        assert self.lookups == ["public.example.com"] * 2
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from fakeredis.commands_mixins import server_mixin
+
+from cumplo_common.utils.rate_limit import RateLimiter, RateLimitResult, RedisRateLimitStore, TokenBucket
+
+
+class TestTokenBucket:
+    def test_burst(self) -> None:
+        """Should allow bursts of up to its capacity and then ask to wait for the next token."""
+        bucket = TokenBucket(rate=2, capacity=3)
+        now = bucket.updated_at
+
+        assert [bucket.consume(now=now) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.consume(now=now) == pytest.approx(0.5)
+
+    def test_refill(self) -> None:
+        """Should refill tokens over time without exceeding its capacity."""
+        bucket = TokenBucket(rate=2, capacity=3)
+        now = bucket.updated_at
+        for _ in range(3):
+            bucket.consume(now=now)
+
+        assert bucket.consume(now=now + 0.5) == 0.0
+        assert bucket.consume(now=now + 100) == 0.0
+        assert bucket.tokens == pytest.approx(2)
+
+    def test_invalid_rate(self) -> None:
+        """Should refuse rates that would never refill the bucket."""
+        with pytest.raises(ValueError, match="positive"):
+            TokenBucket(rate=0)
+
+
+class Clock:
+    """Stand-in of the time module for the TIME command of the fake Redis server."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class FailingRedis:
+    """Redis client whose server is down."""
+
+    async def eval(self, *args: object) -> list[str]:  # noqa: ARG002
+        raise ConnectionError("Redis is down")
+
+
+class TestRedisRateLimitStore:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.clock = Clock()
+        monkeypatch.setattr(server_mixin, "time", self.clock)
+
+    def test_script(self) -> None:
+        """Should spend, refill and expire the buckets in the Lua script, with the clock of the Redis server."""
+
+        async def run() -> None:
+            redis = FakeAsyncRedis()
+            store = RedisRateLimitStore(redis)
+
+            async def consume(tokens: float = 1) -> tuple[float, float]:
+                return await store.consume("user", rate=2, capacity=3, tokens=tokens)
+
+            assert [await consume() for _ in range(3)] == [(2, 0), (1, 0), (0, 0)]
+            assert await consume() == (0, 0.5)
+            # NOTE: The bucket expires once it would be full again, plus a second
+            assert 2400 < await redis.pttl("rate_limit:user") <= 2500  # noqa: PLR2004
+
+            self.clock.now += 0.5
+            assert await consume() == (0, 0)
+
+            self.clock.now += 100
+            assert await consume() == (2, 0)
+            assert 1400 < await redis.pttl("rate_limit:user") <= 1500  # noqa: PLR2004
+            bucket = await redis.hgetall("rate_limit:user")
+            assert float(bucket[b"tokens"]) == 2  # noqa: PLR2004
+            assert float(bucket[b"updated_at"]) == self.clock.now
+
+            assert await consume(tokens=3) == (2, 0.5)
+
+        asyncio.run(run())
+
+    def test_shared_buckets(self) -> None:
+        """Should keep the buckets in Redis, so they are shared by every limiter using it."""
+
+        async def run() -> None:
+            redis = FakeAsyncRedis()
+            limiters = [RateLimiter(rate=1, capacity=2, store=RedisRateLimitStore(redis)) for _ in range(2)]
+
+            assert [(await limiter.check("user")).allowed for limiter in limiters * 2] == [True, True, False, False]
+            assert await redis.keys() == [b"rate_limit:user"]
+
+            self.clock.now += 1
+            assert (await limiters[0].check("user")).allowed
+
+        asyncio.run(run())
+
+
+class TestRateLimiter:
+    def test_memory_store(self) -> None:
+        """Should limit each key on its own once its burst is spent."""
+        limiter = RateLimiter(rate=1, capacity=2)
+
+        async def check() -> list[RateLimitResult]:
+            return [await limiter.check(key) for key in ("first", "first", "first", "second")]
+
+        first, second, third, other = asyncio.run(check())
+
+        assert (first.allowed, first.remaining, second.allowed, second.remaining) == (True, 1, True, 0)
+        assert not third.allowed
+        assert third.retry_after == pytest.approx(1, abs=0.01)
+        assert other.allowed
+        assert limiter.metrics == {"allowed": 3, "limited": 1, "errors": 0}
+
+    def test_headers(self) -> None:
+        """Should report the limit, the remaining requests and when to retry."""
+        allowed = RateLimitResult(allowed=True, limit=20, remaining=7)
+        limited = RateLimitResult(allowed=False, limit=20, remaining=0, retry_after=0.2)
+
+        assert allowed.headers == {"X-RateLimit-Limit": "20", "X-RateLimit-Remaining": "7"}
+        assert limited.headers == {"X-RateLimit-Limit": "20", "X-RateLimit-Remaining": "0", "Retry-After": "1"}
+
+    def test_store_errors(self) -> None:
+        """Should allow the requests when the store fails."""
+        limiter = RateLimiter(rate=1, capacity=2, store=RedisRateLimitStore(FailingRedis()))
+
+        assert asyncio.run(limiter.check("user")).allowed
+        assert limiter.metrics == {"allowed": 0, "limited": 0, "errors": 1}
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from itertools import starmap
+
+from cumplo_common.utils.rates import (
+    DAYS_PER_YEAR,
+    MONTHS_PER_YEAR,
+    compound_rate,
+    compound_rates,
+    exact_rates,
+    round_rate,
+    xirr,
+    xirrs,
+)
+
+IRRS = [Decimal(irr) / 100 for irr in range(0, 6000, 97)]
+DURATIONS = list(range(1, 1100, 29))
+TOLERANCE = Decimal("0.0001")
+
+
+class TestCompoundRate:
+    def test_float_path_error_is_bounded(self) -> None:
+        """Should differ from the exact path by at most one unit in the last rounded digit."""
+        for irr in IRRS:
+            float_rates = [compound_rate(irr, duration, DAYS_PER_YEAR) for duration in DURATIONS]
+            with exact_rates():
+                exact = [compound_rate(irr, duration, DAYS_PER_YEAR) for duration in DURATIONS]
+            assert all(abs(value - expected) <= TOLERANCE for value, expected in zip(float_rates, exact, strict=True))
+
+    def test_matches_previous_formula(self) -> None:
+        """Should match the previous Decimal formula within the rounding tolerance."""
+        for irr in IRRS:
+            previous = round((1 + irr / 100) ** Decimal(1 / 12) - 1, ndigits=4)
+            assert abs(compound_rate(irr, 1, MONTHS_PER_YEAR) - previous) <= TOLERANCE
+            with exact_rates():
+                assert abs(compound_rate(irr, 1, MONTHS_PER_YEAR) - previous) <= TOLERANCE
+
+    def test_known_values(self) -> None:
+        """Should compound the IRR over the given fraction of a year."""
+        assert compound_rate(Decimal(12), 365, DAYS_PER_YEAR) == Decimal("0.1200")
+        assert compound_rate(Decimal(0), 30, DAYS_PER_YEAR) == Decimal("0.0000")
+        with exact_rates():
+            assert compound_rate(Decimal("12.6825"), 1, MONTHS_PER_YEAR) == Decimal("0.0100")
+
+    def test_context_is_restored(self) -> None:
+        """Should go back to the float path when leaving the context."""
+        with exact_rates(), exact_rates(enabled=False):
+            assert compound_rate(Decimal(10), 30, DAYS_PER_YEAR) == Decimal("0.0079")
+        assert compound_rate(Decimal(10), 30, DAYS_PER_YEAR) == Decimal("0.0079")
+
+    def test_batch_matches_single(self) -> None:
+        """Should compute the same values as the single version in both paths."""
+        irrs = [irr for irr in IRRS for _ in DURATIONS]
+        durations = DURATIONS * len(IRRS)
+
+        expected = [compound_rate(irr, duration, DAYS_PER_YEAR) for irr, duration in zip(irrs, durations, strict=True)]
+        assert compound_rates(irrs, durations, DAYS_PER_YEAR) == expected
+
+        with exact_rates():
+            expected = [
+                compound_rate(irr, duration, DAYS_PER_YEAR) for irr, duration in zip(irrs, durations, strict=True)
+            ]
+            assert compound_rates(irrs, durations, DAYS_PER_YEAR) == expected
+
+
+class TestRoundRate:
+    def test_matches_decimal_rounding(self) -> None:
+        """Should round exactly like rounding the Decimal of the float, including its exponent."""
+        values = [fee / 100_000 for fee in range(-2000, 2000, 7)] + [0.00005, 0.00015, 0.00025, -0.00005, 1 / 3]
+        for value in values:
+            for digits in (3, 4):
+                expected = round(Decimal(value), digits)
+                assert round_rate(value, digits) == expected
+                assert str(round_rate(value, digits)) == str(expected)
+
+
+class TestXIRR:
+    def test_known_values(self) -> None:
+        """Should compound the receipts back to the payments."""
+        assert xirr([-1000, 1100], [0, 365]) == Decimal("0.1000")
+        assert xirr([-1000, 1210], [0, 730]) == Decimal("0.1000")
+        assert xirr([-1000, 550, 605], [0, 365, 730]) == Decimal("0.1000")
+        assert xirr([-1000, 900], [0, 365]) == Decimal("-0.1000")
+
+    def test_bisection_fallback(self) -> None:
+        """Should find the rate by bisection when Newton's method leaves the bounds."""
+        assert xirr([-1000, 1100], [0, 365], guess=-0.99) == Decimal("0.1000")
+
+    def test_without_rate(self) -> None:
+        """Should return None when no rate makes the present value zero within the bounds."""
+        assert xirr([1000, 1100], [0, 365]) is None
+        assert xirr([-1000, 10**9], [0, 1]) is None
+
+    def test_batch_matches_single(self) -> None:
+        """Should compute the same rates as computing them one by one."""
+        schedules = [([-1000, 1000 + fee], [0, days]) for fee in range(0, 300, 7) for days in (30, 90, 365)]
+        assert xirrs(schedules) == list(starmap(xirr, schedules))
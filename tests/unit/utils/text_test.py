@@ -0,0 +1,34 @@
+import pytest
+
+from cumplo_common.utils.text import PEPPER_MAX_LENGTH, hash_key, validate_pepper
+
+DIGEST_LENGTH = 64
+
+
+class TestHashKey:
+    def test_deterministic(self) -> None:
+        """Should hash each key to the same hexadecimal digest."""
+        digest = hash_key("api-key", pepper="pepper")
+
+        assert digest == hash_key("api-key", pepper="pepper")
+        assert len(digest) == DIGEST_LENGTH
+        assert int(digest, 16) >= 0
+        assert digest != hash_key("other-key", pepper="pepper")
+
+    def test_pepper(self) -> None:
+        """Should depend on the pepper, so hashes can't be computed without it."""
+        assert hash_key("api-key", pepper="pepper") != hash_key("api-key", pepper="other")
+        assert hash_key("api-key", pepper="pepper") != hash_key("api-key", pepper="")
+
+
+class TestValidatePepper:
+    def test_valid(self) -> None:
+        """Should accept peppers of up to 64 bytes."""
+        pepper = "p" * PEPPER_MAX_LENGTH
+        assert validate_pepper(pepper) == pepper
+
+    def test_invalid(self) -> None:
+        """Should reject empty peppers, and peppers longer than 64 bytes once encoded."""
+        for pepper in ("", "p" * (PEPPER_MAX_LENGTH + 1), "ñ" * (PEPPER_MAX_LENGTH // 2 + 1)):
+            with pytest.raises(ValueError, match="API_KEYS_PEPPER"):
+                validate_pepper(pepper)
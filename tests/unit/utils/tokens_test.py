@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from cumplo_common.models import User
+from cumplo_common.utils.tokens import InvalidTokenError, StaleTokenError, TokenSigner, is_token
+from tests.factories import build_user
+
+NOW = 1_700_000_000
+TTL = 60
+
+
+class TestTokenSigner:
+    def setup_method(self) -> None:
+        self.signer = TokenSigner(secret="secret", version=1, ttl=TTL)  # noqa: S106
+        self.user = User.model_validate(build_user(random.Random(0), channels=0, is_admin=True))  # noqa: S311
+
+    def test_round_trip(self) -> None:
+        """Should verify the tokens it issues and get back the identity of their user."""
+        token = self.signer.issue(self.user, now=NOW)
+        claims = self.signer.verify(token, now=NOW)
+
+        assert is_token(token)
+        assert not is_token(self.user.api_key)
+        assert claims.id == self.user.id
+        assert claims.is_admin
+        assert claims.key_version == self.user.key_version
+        assert claims.expires_at == NOW + TTL
+        assert claims.version == 1
+
+    def test_expired(self) -> None:
+        """Should reject tokens once they expire."""
+        token = self.signer.issue(self.user, now=NOW)
+        with pytest.raises(InvalidTokenError, match="expired"):
+            self.signer.verify(token, now=NOW + TTL)
+
+    def test_invalid_signature(self) -> None:
+        """Should reject tokens signed with another secret."""
+        token = TokenSigner(secret="other", version=1).issue(self.user, now=NOW)  # noqa: S106
+        with pytest.raises(InvalidTokenError, match="signature"):
+            self.signer.verify(token, now=NOW)
+
+    def test_disabled(self) -> None:
+        """Should neither issue nor verify tokens without a secret."""
+        token = self.signer.issue(self.user, now=NOW)
+        signer = TokenSigner(secret="")
+        assert not signer.enabled
+        with pytest.raises(InvalidTokenError):
+            signer.verify(token, now=NOW)
+        with pytest.raises(ValueError, match="secret"):
+            signer.issue(self.user)
+
+    def test_tampered(self) -> None:
+        """Should reject tokens whose payload was changed or that are malformed."""
+        token = self.signer.issue(self.user.model_copy(update={"is_admin": False}), now=NOW)
+        payload, signature = token.rsplit(".", 1)
+        forged = self.signer.issue(self.user, now=NOW).rsplit(".", 1)[0]
+
+        for value in (f"{forged}.{signature}", f"{payload}.", "cpt.", "cpt.%%%.", f"{payload}.ñ", payload):
+            with pytest.raises(InvalidTokenError):
+                self.signer.verify(value, now=NOW)
+
+    def test_version_mismatch(self) -> None:
+        """Should flag tokens of other versions as stale, along with their claims."""
+        token = TokenSigner(secret="secret", version=0).issue(self.user, now=NOW)  # noqa: S106
+        with pytest.raises(StaleTokenError) as error:
+            self.signer.verify(token, now=NOW)
+        assert error.value.claims.id == self.user.id